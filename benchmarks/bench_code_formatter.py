@@ -0,0 +1,64 @@
+"""
+Benchmark do code_formatter em trechos de 1 KB a 1 MB.
+
+Uso: python benchmarks/bench_code_formatter.py
+
+Para cada tamanho mostra o tempo de _normalize_code (caminho C/Java) e de
+_normalize_html + _indent_html, e o custo por KB: com escalonamento linear
+a coluna µs/KB fica aproximadamente constante.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_formatter import _indent_code, _indent_html, _normalize_code, _normalize_html  # noqa: E402
+
+TAMANHOS = [1024, 4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024]
+
+TRECHO_C = (
+    'public class Conta { private double saldo;public void depositar(double v){ if(v>0){saldo+=v;} }'
+    'public double getSaldo(){return saldo;} } for(int i=0;i<10;i++){ total += i; }'
+)
+TRECHO_HTML = (
+    '<table class="dados"> <tr><td>Fruta</td><td>Preço</td></tr> <tr> <td>Maçã</td> '
+    '<td><b>R$ 3,00</b></td></tr></table><div><p>Texto livre</p><br/><img src="x.png"></div>'
+)
+
+
+def _gerar(trecho, tamanho):
+    return (trecho * (tamanho // len(trecho) + 1))[:tamanho]
+
+
+def _medir(funcao, entrada, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(entrada)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _c(code):
+    return _indent_code(_normalize_code(code))
+
+
+def _html(code):
+    return _indent_html(_normalize_html(code))
+
+
+def main():
+    print(f"{'tamanho':>10} {'C (ms)':>10} {'C µs/KB':>9} {'HTML (ms)':>10} {'HTML µs/KB':>11}")
+    for tamanho in TAMANHOS:
+        repeticoes = 5 if tamanho <= 64 * 1024 else 2
+        t_c = _medir(_c, _gerar(TRECHO_C, tamanho), repeticoes)
+        t_html = _medir(_html, _gerar(TRECHO_HTML, tamanho), repeticoes)
+        kb = tamanho / 1024
+        print(f"{tamanho:>10} {t_c * 1e3:>10.2f} {t_c * 1e6 / kb:>9.1f} "
+              f"{t_html * 1e3:>10.2f} {t_html * 1e6 / kb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
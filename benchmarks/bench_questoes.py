@@ -0,0 +1,162 @@
+"""
+Registro ``Questao`` (slots) contra a montagem anterior com dicts.
+
+Uso: python benchmarks/bench_questoes.py [n_questoes ...]
+
+Gera um texto normalizado sintético (o que ``armazenar_questoes`` recebe,
+com Assunto e Enunciado) e mede, para cada tamanho:
+
+- montagem: ``armazenar_questoes`` atual contra a versão com dicts,
+  ``re.match`` com padrão literal e fatias da lista de linhas;
+- memória retida pela lista de questões (tracemalloc, medida à parte);
+- pontuação: ``indexar_gabarito`` sobre cada representação.
+"""
+
+import gc
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extrator_questoes import _GABARITO_LINHA, armazenar_questoes  # noqa: E402
+from simulado.banco_compilado import LETRAS, indexar_gabarito  # noqa: E402
+
+TAMANHOS = [10_000, 30_000, 100_000]
+
+
+def _montar_dict(bloco, gabarito, com_assunto):
+    """A montagem anterior, com dicts, copiada como referência."""
+    linhas = bloco.splitlines()
+    assunto = ""
+    if com_assunto:
+        for j, linha in enumerate(linhas):
+            if linha.strip().startswith('Assunto: '):
+                assunto = linha.strip().replace('Assunto: ', '', 1).rstrip('.')
+                linhas = linhas[:j] + linhas[j+1:]
+                break
+        for j, linha in enumerate(linhas):
+            if linha.strip().startswith('Enunciado: '):
+                linhas[j] = linha.replace('Enunciado: ', '', 1)
+                break
+    idx_alt = None
+    for j, linha in enumerate(linhas):
+        if re.match(r'^\$?[aA]\)', linha.strip()):
+            idx_alt = j
+            break
+    if idx_alt is None:
+        return None
+    enunciado = "\n".join(linhas[:idx_alt]).strip()
+    alternativas = []
+    esperada = ord('a')
+    for linha in linhas[idx_alt:]:
+        linha = linha.strip()
+        if re.match(r'^Gabarito:', linha, re.IGNORECASE):
+            break
+        m = re.match(r'^\$?([a-e])\)\s*(.*)$', linha, re.IGNORECASE)
+        if m:
+            if ord(m.group(1).lower()) != esperada:
+                return None
+            alternativas.append(m.group(2).strip())
+            esperada += 1
+        elif alternativas:
+            alternativas[-1] += ' ' + linha
+    if not alternativas:
+        return None
+    idx_gabarito = ord(gabarito.lower()) - ord('a')
+    texto_gabarito = alternativas[idx_gabarito] if idx_gabarito < len(alternativas) else gabarito
+    questao = {"enunciado": enunciado, "alternativas": alternativas, "gabarito": texto_gabarito}
+    if com_assunto:
+        questao["assunto"] = assunto
+    return questao
+
+
+def _armazenar_dict(texto, com_assunto):
+    questoes = []
+    inicio = 0
+    for match in _GABARITO_LINHA.finditer(texto):
+        bloco = texto[inicio:match.end()].strip()
+        inicio = match.end()
+        questao = _montar_dict(bloco, match.group(1).upper(), com_assunto)
+        if questao is not None:
+            questoes.append({"id": len(questoes) + 1, **questao})
+    return questoes
+
+
+def _indexar_dict(questoes):
+    ids, corretas = [], []
+    for q in questoes:
+        ids.append(q["id"])
+        corretas.append("".join(
+            LETRAS[j] for j, alt in enumerate(q["alternativas"][:len(LETRAS)]) if alt == q["gabarito"]
+        ))
+    return ids, corretas
+
+
+def _texto(n_questoes, seed=1):
+    rng = random.Random(seed)
+    partes = []
+    for q in range(1, n_questoes + 1):
+        partes.append(f"Assunto: Direito Administrativo - Tema {q % 13}.\n"
+                      f"Enunciado: Considere o ato {rng.randint(100, 999)} praticado pela autoridade "
+                      f"competente na questão {q}.\nAssinale a alternativa correta.\n")
+        for letra in "abcde":
+            partes.append(f"{letra}) alternativa {letra} da questão {q}.\n")
+            if q % 5 == 0 and letra == "c":
+                partes.append("continuação da alternativa em outra linha.\n")
+        partes.append(f"Gabarito: {rng.choice('ABCDE')}.\n")
+    return "".join(partes)
+
+
+def _medir(funcao, *args, repeticoes=3):
+    # Como o timeit: sem o coletor de ciclos, que dispara conforme o que
+    # já está alocado e não conforme a função medida.
+    melhor = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = funcao(*args)
+            melhor = min(melhor, time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return melhor, resultado
+
+
+def _memoria(funcao, *args):
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao(*args)
+    retida = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del resultado
+    return retida
+
+
+def main(tamanhos):
+    versoes = [
+        ("dict", lambda texto: _armazenar_dict(texto, True), _indexar_dict),
+        ("Questao", lambda texto: armazenar_questoes(texto, True), indexar_gabarito),
+    ]
+    print(f"{'questões':>9} {'registro':>8} {'montagem (ms)':>13} {'µs/questão':>10} "
+          f"{'memória (MB)':>12} {'B/questão':>9} {'pontuação (ms)':>14}")
+    for tamanho in tamanhos:
+        texto = _texto(tamanho)
+        referencia = None
+        for nome, armazenar, indexar in versoes:
+            tempo, questoes = _medir(armazenar, texto)
+            tempo_indice, indice = _medir(indexar, questoes)
+            assert referencia is None or indice == referencia, "as versões divergem"
+            referencia = indice
+            del questoes
+            memoria = _memoria(armazenar, texto)
+            print(f"{tamanho:>9} {nome:>8} {tempo * 1e3:>13.1f} {tempo / tamanho * 1e6:>10.2f} "
+                  f"{memoria / 2**20:>12.1f} {memoria / tamanho:>9.0f} {tempo_indice * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,180 @@
+"""
+Custo de cada regra dos conjuntos de regras_paginas num corpus de referência.
+
+Uso: python benchmarks/bench_regras.py [n_questoes] [conjunto ...]
+
+O corpus é sintético e fixo (semente 1), com ``n_questoes`` questões
+(padrão 40; as regexes quadráticas já levam segundos aí): um caderno do TEC
+colado (alternativas e Certo/Errado), o texto já extraído de um PDF do
+Estratégia, uma aula da Gran e um edital. Cada conjunto recebe a entrada na
+forma em que a página a entrega (o texto inteiro, os blocos de questão ou
+os cards).
+
+Para cada passo compilado (trocas literais vizinhas juntas num passo) mostra
+o tempo sobre o texto que chega a ele e o das mesmas regras aplicadas uma a
+uma como eram escritas nas páginas (``regras_texto.aplicar_regra``: ``re.sub``
+com o padrão em texto, ``str.replace``, e a regex original das regras que
+a trocam por um algoritmo linear). As duas saídas são conferidas no fim.
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import regras_paginas as rp  # noqa: E402
+from regras_texto import CONJUNTOS, aplicar_regra  # noqa: E402
+
+N_QUESTOES = 40
+# Uma medição que passa disso não é repetida (as regexes quadráticas)
+LIMITE_SEGUNDOS = 1.0
+
+_PALAVRAS = ("administração pública ato vinculado discricionário servidor órgão lei decreto "
+             "competência finalidade forma motivo objeto princípio legalidade moralidade").split()
+
+
+def _frase(rng, n):
+    return " ".join(rng.choice(_PALAVRAS) for _ in range(n))
+
+
+def _caderno_tec(n, rng):
+    partes = ["www.tecconcursos.com.br/caderno/Q1234\nCaderno de Questões - Direito Administrativo\n"
+              "Ordenação: por data (Assuntos)\n"]
+    for q in range(1, n + 1):
+        partes.append(f"{q}) {_frase(rng, 40).capitalize()}.\n{_frase(rng, 25)}\n")
+        if q % 3 == 0:
+            partes.append(f"Certo\nErrado\nGabarito: {rng.choice(['Certo', 'Errado'])}\n")
+        else:
+            partes.extend(f"{letra}) {_frase(rng, 12)}\n" for letra in "abcde")
+            partes.append(f"Gabarito: {rng.choice('ABCDE')}\n")
+        if q % 10 == 0:
+            partes.append(f"www.tecconcursos.com.br/caderno/Q1234 {q // 10}\nCaderno de Questões\n")
+    return "".join(partes)
+
+
+def _estrategia(n, rng):
+    partes = []
+    for q in range(1, n + 1):
+        partes.append(f"{q}. (FGV – TJ-SP — {rng.randint(2015, 2024)}) {_frase(rng, 30)}.\n")
+        partes.extend(f"{letra}) {_frase(rng, 10)};\n" for letra in "abcde")
+        partes.append(f"Comentários:\n{_frase(rng, 60)}.\n{_frase(rng, 20)} ==a1b2c3==.\n"
+                      f"Gabarito: Letra {rng.choice('ABCDE')}\n")
+        if q % 4 == 0:
+            partes.append(f"Prof. Fulano\nAula 0{q % 9}\n{q // 4} 7\n")
+    return "".join(partes)
+
+
+def _gran(n, rng):
+    partes = []
+    for q in range(1, n + 1):
+        partes.append(f"{rng.randint(1, 59)}m\n{_frase(rng, 12)}\n{_frase(rng, 15)}.\n")
+        if q % 5 == 0:
+            partes.append(f"www.grancursosonline.com.br {q // 5}\nViu algum erro neste material? "
+                          "Contate-nos em: degravacoes@grancursosonline.com.br\n")
+    return "".join(partes)
+
+
+def _edital(n, rng):
+    partes = ["CONHECIMENTOS BÁSICOS:\n"]
+    for q in range(1, n + 1):
+        partes.append(f"{q} {_frase(rng, 6).capitalize()}. {q}.1 {_frase(rng, 5).capitalize()}; "
+                      f"{q}.1.1 {_frase(rng, 4).capitalize()} (EXCETO {_frase(rng, 2)}\n{_frase(rng, 2)}).\n")
+        if q % 8 == 0:
+            partes.append(f"\n{q % 90 + 10}\n")
+    return "".join(partes)
+
+
+def _entradas(n):
+    """Entrada de cada conjunto, como a página a entrega."""
+    rng = random.Random(1)
+    tec, estrategia = _caderno_tec(n, rng), _estrategia(n, rng)
+    tec_inicio = rp.TRANSFORMADOR_INICIO(tec)
+    cards = [c.strip() for c in rp.TRANSFORMADOR_FIM(tec_inicio).split("\n") if c.strip()]
+    tracos = rp.ESTRATEGIA_TRACOS(estrategia)
+    blocos = [b for b in rp.ESTRATEGIA_MARCAR(tracos).split(";;;") if b.strip()]
+    return {
+        "tratar_texto.texto": _gran(n, rng),
+        "tratar_texto.questao": tec,
+        "transformador_anki.inicio": tec,
+        "transformador_anki.fim": tec_inicio,
+        "transformador_anki.cebraspe": cards,
+        "tec_todas_alternativas.texto": tec,
+        "organizar_edital.texto": _edital(n, rng),
+        "estrategia.tracos": estrategia,
+        "estrategia.marcar": tracos,
+        "estrategia.questao": blocos,
+        "estrategia.pos": "\n".join(rp.ESTRATEGIA_QUESTAO(b) for b in blocos),
+        "estrategia_sem_ano.questao": blocos,
+        "estrategia_sem_ano.pos": "\n".join(rp.ESTRATEGIA_SEM_ANO_QUESTAO(b) for b in blocos),
+    }
+
+
+def _aplicar(funcao, entrada):
+    if isinstance(entrada, str):
+        return funcao(entrada)
+    return [funcao(texto) for texto in entrada]
+
+
+def _em_ordem(regras, entrada):
+    for regra in regras:
+        entrada = _aplicar(lambda texto: aplicar_regra(regra, texto), entrada)
+    return entrada
+
+
+def _medir(funcao, *args, repeticoes=3):
+    # Como o timeit: sem o coletor de ciclos durante a medição.
+    melhor = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = funcao(*args)
+            decorrido = time.perf_counter() - inicio
+            melhor = min(melhor, decorrido)
+            if decorrido > LIMITE_SEGUNDOS:
+                break
+    finally:
+        gc.enable()
+    return melhor, resultado
+
+
+def _tamanho(entrada):
+    return len(entrada) if isinstance(entrada, str) else sum(map(len, entrada))
+
+
+def main(n_questoes, nomes):
+    entradas = _entradas(n_questoes)
+    nomes = nomes or list(entradas)
+    soma_compilado = soma_em_ordem = 0.0
+    for nome in nomes:
+        conjunto, entrada = CONJUNTOS[nome], entradas[nome]
+        print(f"\n{conjunto.chave}: {len(conjunto.regras)} regras em {len(conjunto.passos)} passos, "
+              f"{_tamanho(entrada) / 1024:.0f} KB"
+              + ("" if isinstance(entrada, str) else f" em {len(entrada)} textos"))
+        print(f"  {'passo':<48} {'regras':>6} {'compilado (ms)':>14} {'uma a uma (ms)':>14}")
+        total_compilado = total_em_ordem = 0.0
+        atual = entrada
+        for passo in conjunto.passos:
+            tempo, saida = _medir(_aplicar, passo.executar, atual)
+            tempo_em_ordem, saida_em_ordem = _medir(_em_ordem, passo.regras, atual)
+            assert saida == saida_em_ordem, f"{nome}: o passo {passo.nome!r} diverge"
+            total_compilado += tempo
+            total_em_ordem += tempo_em_ordem
+            rotulo = passo.nome.replace("\n", "\\n")
+            rotulo = rotulo if len(rotulo) <= 48 else rotulo[:45] + "..."
+            print(f"  {rotulo:<48} {len(passo.regras):>6} {tempo * 1e3:>14.2f} {tempo_em_ordem * 1e3:>14.2f}")
+            atual = saida
+        print(f"  {'total':<48} {len(conjunto.regras):>6} {total_compilado * 1e3:>14.2f} {total_em_ordem * 1e3:>14.2f}")
+        soma_compilado += total_compilado
+        soma_em_ordem += total_em_ordem
+    print(f"\ntodos os conjuntos: compilado {soma_compilado * 1e3:.1f} ms, uma a uma {soma_em_ordem * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    n = int(argumentos.pop(0)) if argumentos and argumentos[0].isdigit() else N_QUESTOES
+    main(n, argumentos)
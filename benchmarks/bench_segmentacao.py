@@ -0,0 +1,171 @@
+"""
+Segmentação por layout (segmentacao_layout) contra o pipeline de regex.
+
+Uso: python benchmarks/bench_segmentacao.py [arquivo.pdf ...]
+
+Sem argumentos, gera cadernos sintéticos no estilo TEC com casos difíceis
+(alínea "b)" e inciso "3)" no meio do enunciado, alternativas quebradas em
+duas linhas, questões Certo/Errado, questões atravessando a página,
+cabeçalho com número de página e rodapé) e mede, com assunto:
+
+- páginas/s de cada pipeline, em série (um processo);
+- acurácia: fração das questões do gabarito sintético reproduzidas
+  exatamente (enunciado, alternativas, gabarito e assunto; espaços
+  normalizados).
+
+Com PDFs reais não há gabarito: a coluna passa a ser a concordância com
+o pipeline de regex atual (pdfplumber).
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extrator_questoes import (  # noqa: E402
+    _contar_paginas, _paginas_fitz, armazenar_questoes_em_fluxo, fitz, normalizar_paginas, processar_pdf,
+)
+import selecao_backend  # noqa: E402
+from modelo_questao import Questao  # noqa: E402
+from segmentacao_layout import processar_pdf_layout  # noqa: E402
+
+TAMANHOS = [50, 200, 800]
+LINHAS_POR_PAGINA = 40
+
+
+def _regex_pdfplumber(caminho):
+    return processar_pdf(caminho, com_assunto=True, workers=1, backend="pdfplumber")
+
+
+def _regex_fitz(caminho):
+    paginas = _paginas_fitz(caminho, 0, _contar_paginas(caminho))
+    return list(armazenar_questoes_em_fluxo(normalizar_paginas(paginas, com_assunto=True), com_assunto=True))
+
+
+def _layout(caminho):
+    return processar_pdf_layout(caminho, com_assunto=True, workers=1)
+
+
+PIPELINES = [
+    ("regex (pdfplumber)", _regex_pdfplumber),
+    ("regex (fitz)", _regex_fitz),
+    ("layout (fitz)", _layout),
+]
+
+
+def _gerar(caminho, n_questoes, seed=1):
+    """Caderno sintético; devolve as questões esperadas."""
+    rng = random.Random(seed)
+    linhas = ["Caderno de Questões", "Gerado em 01/01/2026", "Filtros: Direito Administrativo"]
+    esperadas = []
+    for q in range(1, n_questoes + 1):
+        assunto = f"Direito Administrativo - Tema {q % 7}"
+        if q % 4 == 0:
+            enunciado = [f"{q}) Segundo a alínea b) do inciso 3) do art. {rng.randint(1, 99)}, julgue o caso",
+                         f"apresentado no processo administrativo {rng.randint(100, 999)}."]
+        else:
+            enunciado = [f"{q}) Considere o ato administrativo {rng.randint(100, 999)} praticado pela",
+                         "autoridade competente e assinale a alternativa correta."]
+        linhas.append(assunto)
+        linhas += enunciado
+        texto_enunciado = " ".join(enunciado)[len(f"{q}) "):]
+        if q % 11 == 0:
+            alternativas = ["Certo.", "Errado."]
+            letra = rng.choice("AB")
+            linhas += ["Certo", "Errado", f"Gabarito: {'Certo' if letra == 'A' else 'Errado'}"]
+        else:
+            alternativas = []
+            for l in "abcde":
+                if q % 5 == 0 and l == "c":
+                    linhas += [f"{l}) a alternativa {l} da questão {q} é longa e continua na", "linha seguinte."]
+                    alternativas.append(f"a alternativa {l} da questão {q} é longa e continua na linha seguinte.")
+                else:
+                    linhas.append(f"{l}) alternativa {l} da questão {q}.")
+                    alternativas.append(f"alternativa {l} da questão {q}.")
+            letra = rng.choice("ABCDE")
+            linhas.append(f"Gabarito: {letra}")
+        esperadas.append(Questao(q, texto_enunciado, tuple(alternativas),
+                                 alternativas["ABCDE".index(letra)], assunto))
+
+    doc = fitz.open()
+    for n, inicio in enumerate(range(0, len(linhas), LINHAS_POR_PAGINA), 1):
+        pagina = doc.new_page()
+        pagina.insert_text((40, 30), f"Caderno de Questões - página {n}", fontsize=8)
+        y = 60
+        for linha in linhas[inicio:inicio + LINHAS_POR_PAGINA]:
+            pagina.insert_text((40, y), linha, fontsize=9)
+            y += 17
+        pagina.insert_text((40, 800), "www.tecconcursos.com.br/questoes", fontsize=8)
+    doc.save(caminho)
+    doc.close()
+    return esperadas
+
+
+def _chave(questao):
+    def limpo(texto):
+        return " ".join(texto.split())
+    return (limpo(questao.enunciado), tuple(limpo(a) for a in questao.alternativas),
+            limpo(questao.gabarito), limpo(questao.assunto or ""))
+
+
+def _acuracia(obtidas, esperadas):
+    if not esperadas:
+        return 0.0
+    comuns = Counter(map(_chave, obtidas)) & Counter(map(_chave, esperadas))
+    return sum(comuns.values()) / len(esperadas)
+
+
+def _medir(funcao, caminho, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        questoes = funcao(caminho)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, questoes
+
+
+def _linha(nome, pipeline, paginas, tempo, questoes, acuracia):
+    print(f"{nome:>16} {pipeline:>20} {paginas:>7} {tempo * 1e3:>10.1f} {paginas / tempo:>9.1f} "
+          f"{len(questoes):>9} {acuracia:>9.1%}")
+
+
+def main(arquivos):
+    # O backend vai forçado, mas a decisão ainda é registrada: longe do .cache de verdade
+    with tempfile.TemporaryDirectory() as pasta:
+        selecao_backend.ARQUIVO_ESCOLHAS = os.path.join(pasta, "backends.json")
+        selecao_backend.ARQUIVO_DECISOES = os.path.join(pasta, "backends.jsonl")
+        _main(arquivos)
+
+
+def _main(arquivos):
+    coluna = "concord." if arquivos else "acurácia"
+    print(f"{'pdf':>16} {'pipeline':>20} {'páginas':>7} {'tempo (ms)':>10} {'pág/s':>9} "
+          f"{'questões':>9} {coluna:>9}")
+    if arquivos:
+        for caminho in arquivos:
+            paginas = _contar_paginas(caminho)
+            referencia = None
+            for pipeline, funcao in PIPELINES:
+                tempo, questoes = _medir(funcao, caminho, 1)
+                referencia = questoes if referencia is None else referencia
+                _linha(os.path.basename(caminho)[-16:], pipeline, paginas, tempo, questoes,
+                       _acuracia(questoes, referencia))
+        return
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in TAMANHOS:
+            caminho = os.path.join(pasta, f"sintetico-{tamanho}.pdf")
+            esperadas = _gerar(caminho, tamanho)
+            paginas = _contar_paginas(caminho)
+            repeticoes = 3 if tamanho <= 200 else 1
+            for pipeline, funcao in PIPELINES:
+                tempo, questoes = _medir(funcao, caminho, repeticoes)
+                _linha(f"{tamanho} questões", pipeline, paginas, tempo, questoes, _acuracia(questoes, esperadas))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,178 @@
+"""
+Detector de cabeçalhos e rodapés repetidos, comum a todas as editoras.
+
+Cada linha não vazia nas ``LINHAS_BORDA`` primeiras e últimas posições de
+uma página é normalizada (minúsculas, espaços colapsados, dígitos viram
+``#`` — número de página e de aula não importam) e contada na sua posição
+("topo", i) ou ("base", j). Uma linha que aparece na mesma posição em pelo
+menos ``FRACAO_PAGINAS`` das páginas é boilerplate e sai de todas elas.
+
+As páginas passam uma única vez: as ``JANELA`` primeiras ficam retidas até
+haver estatística, as seguintes saem limpas assim que chegam. Cada posição
+guarda no máximo ``CAPACIDADE`` contadores (algoritmo de Misra-Gries), então
+a memória não cresce com o tamanho do documento.
+
+Linhas conhecidas de cada editora (``CONHECIDAS``) saem em qualquer posição,
+mesmo num PDF de uma página só. Com menos de ``MIN_PAGINAS`` páginas não há
+frequência que valha: sai ainda a linha com a marca da editora (``MARCAS``)
+e as ``RAIO_MARCA`` linhas antes e depois dela, contadas através das páginas.
+
+Texto colado na tela, sem páginas, não passa por aqui: sem posição na página,
+a frequência confunde o boilerplate com o que se repete de propósito (o
+"Questão N. Julgue o item a seguir." de cada questão).
+"""
+
+import re
+
+LINHAS_BORDA = 6
+FRACAO_PAGINAS = 0.6
+MIN_PAGINAS = 3
+JANELA = 6
+CAPACIDADE = 16
+RAIO_MARCA = 3
+
+_ESPACOS = re.compile(r'\s+')
+_DIGITOS = re.compile(r'\d+')
+
+
+def normalizar(linha):
+    return _DIGITOS.sub('#', _ESPACOS.sub(' ', linha.strip().casefold()))
+
+
+CONHECIDAS = {
+    "estrategia": ("www.estrategiaconcursos.com.br",),
+    "gran": (
+        "www.grancursosonline.com.br",
+        "www.grancursosonline.com.br #",
+        "viu algum erro neste material? contate-nos em: degravacoes@grancursosonline.com.br",
+    ),
+    "tec": (),
+}
+
+# Rodapé que fica em volta do link (nome da aula, professor, página)
+MARCAS = {
+    "estrategia": "www.estrategiaconcursos.com.br",
+}
+
+
+class _Contadores:
+    """Misra-Gries: quem aparece em mais de n/(capacidade+1) páginas sobrevive."""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.contagens = {}
+        self.descontado = 0
+
+    def contar(self, chave):
+        if chave in self.contagens:
+            self.contagens[chave] += 1
+        elif len(self.contagens) < self.capacidade:
+            self.contagens[chave] = 1
+        else:
+            self.descontado += 1
+            for outra in list(self.contagens):
+                self.contagens[outra] -= 1
+                if not self.contagens[outra]:
+                    del self.contagens[outra]
+
+    def frequentes(self, minimo):
+        # contagem + descontado é um limite superior da frequência real
+        return {c for c, n in self.contagens.items() if n + self.descontado >= minimo}
+
+
+def _posicoes(linhas):
+    """(posição, índice na página) das linhas de borda não vazias."""
+    indices = [i for i, linha in enumerate(linhas) if linha.strip()]
+    topo = [(("topo", n), i) for n, i in enumerate(indices[:LINHAS_BORDA])]
+    base = [(("base", n), i) for n, i in enumerate(reversed(indices[-LINHAS_BORDA:]))]
+    return topo + base
+
+
+class DetectorBoilerplate:
+    """
+    ``limpar(paginas)`` gera o texto de cada página sem boilerplate;
+    ``filtrar`` faz o mesmo com páginas já divididas em linhas.
+    ``preservar(linha)`` protege linhas estruturais (ex.: "Gabarito: A").
+    """
+
+    def __init__(self, editora=None, preservar=None):
+        self.conhecidas = {normalizar(l) for l in CONHECIDAS.get(editora, ())}
+        self.marca = MARCAS.get(editora)
+        self.preservar = preservar
+        self.paginas = 0
+        self._contadores = {}
+        self._repetidas = {}
+
+    def _contar(self, textos):
+        self.paginas += 1
+        for posicao, i in _posicoes(textos):
+            contadores = self._contadores.get(posicao)
+            if contadores is None:
+                contadores = self._contadores[posicao] = _Contadores(CAPACIDADE)
+            contadores.contar(normalizar(textos[i]))
+
+    def _atualizar(self):
+        if self.paginas < MIN_PAGINAS:
+            self._repetidas = {}
+            return
+        minimo = max(MIN_PAGINAS, FRACAO_PAGINAS * self.paginas)
+        self._repetidas = {p: c.frequentes(minimo) for p, c in self._contadores.items()}
+
+    def _em_volta_da_marca(self, retidas):
+        """Por página, as linhas a até ``RAIO_MARCA`` de uma linha com a marca."""
+        remover = [set() for _ in retidas]
+        if not self.marca:
+            return remover
+        linhas = [(p, i) for p, (_, textos) in enumerate(retidas) for i in range(len(textos))]
+        for k, (p, i) in enumerate(linhas):
+            if self.marca in retidas[p][1][i]:
+                for q, j in linhas[max(0, k - RAIO_MARCA):k + RAIO_MARCA + 1]:
+                    remover[q].add(j)
+        return remover
+
+    def _filtrar_pagina(self, itens, textos, remover=()):
+        remover = set(remover)
+        for posicao, i in _posicoes(textos):
+            if normalizar(textos[i]) in self._repetidas.get(posicao, ()):
+                remover.add(i)
+        if self.conhecidas:
+            remover.update(i for i, texto in enumerate(textos) if normalizar(texto) in self.conhecidas)
+        if self.preservar:
+            remover = {i for i in remover if not self.preservar(textos[i])}
+        if not remover:
+            return itens
+        return [item for i, item in enumerate(itens) if i not in remover]
+
+    def filtrar(self, paginas, texto=None):
+        """
+        ``paginas`` é uma sequência de listas de linhas (qualquer objeto;
+        ``texto(item)`` dá o texto dele). Gera cada página sem boilerplate.
+        """
+        retidas = []
+        for itens in paginas:
+            textos = [texto(item) for item in itens] if texto else itens
+            self._contar(textos)
+            if self.paginas <= JANELA:
+                retidas.append((itens, textos))
+                continue
+            if retidas:
+                self._atualizar()
+                for anteriores in retidas:
+                    yield self._filtrar_pagina(*anteriores)
+                retidas = []
+            self._atualizar()
+            yield self._filtrar_pagina(itens, textos)
+        self._atualizar()
+        poucas = self.paginas < MIN_PAGINAS
+        em_volta = self._em_volta_da_marca(retidas) if poucas else [()] * len(retidas)
+        for anteriores, remover in zip(retidas, em_volta):
+            yield self._filtrar_pagina(*anteriores, remover)
+
+    def limpar(self, paginas):
+        for linhas in self.filtrar(texto.split('\n') for texto in paginas):
+            yield '\n'.join(linhas)
+
+
+def limpar_paginas(paginas, editora=None, preservar=None):
+    return DetectorBoilerplate(editora, preservar).limpar(paginas)
+
@@ -0,0 +1,57 @@
+"""
+Cache em memória do texto extraído de cada página de PDF.
+
+Chave: (hash do documento, índice da página, backend, modo). É um LRU
+compartilhado pelo processo e limitado a ``LIMITE_BYTES`` de texto; trocar
+o intervalo de páginas de um PDF já enviado só extrai as páginas novas.
+"""
+
+import threading
+from collections import OrderedDict
+
+LIMITE_BYTES = 64 * 1024 * 1024
+
+_trava = threading.Lock()
+_paginas = OrderedDict()
+_uso = {"bytes": 0, "acertos": 0, "faltas": 0}
+
+
+def _tamanho(texto):
+    # Aproximação: um caractere por byte é suficiente para limitar a memória.
+    return len(texto) + 64
+
+
+def obter(digest, pagina, backend, modo="text"):
+    """Texto guardado ou None. Um acerto renova a página no LRU."""
+    chave = (digest, pagina, backend, modo)
+    with _trava:
+        texto = _paginas.get(chave)
+        if texto is None:
+            _uso["faltas"] += 1
+            return None
+        _paginas.move_to_end(chave)
+        _uso["acertos"] += 1
+        return texto
+
+
+def contem(digest, pagina, backend, modo="text"):
+    with _trava:
+        return (digest, pagina, backend, modo) in _paginas
+
+
+def guardar(digest, pagina, backend, modo, texto):
+    chave = (digest, pagina, backend, modo)
+    with _trava:
+        antigo = _paginas.pop(chave, None)
+        if antigo is not None:
+            _uso["bytes"] -= _tamanho(antigo)
+        _paginas[chave] = texto
+        _uso["bytes"] += _tamanho(texto)
+        while _uso["bytes"] > LIMITE_BYTES and len(_paginas) > 1:
+            _, removido = _paginas.popitem(last=False)
+            _uso["bytes"] -= _tamanho(removido)
+
+
+def estatisticas():
+    with _trava:
+        return {"paginas": len(_paginas), "limite": LIMITE_BYTES, **_uso}
@@ -1,5 +1,9 @@
 import re
 
+# Incrementar quando a saída de format_enunciado mudar: invalida os
+# fragmentos já renderizados em cache pelo simulado.
+VERSAO_FORMATADOR = "1"
+
 _CSS = """
 <style>
 .code-block {
@@ -26,6 +30,15 @@ _HTML_VOID = frozenset([
     'link','meta','param','source','track','wbr'
 ])
 
+_CODE_TOKEN = re.compile(r'[{};]')
+
+_HTML_ABERTURA = re.compile(r'<[a-zA-Z]')
+_HTML_NOME_ABERTURA = re.compile(r'<([a-zA-Z0-9]+)')
+_HTML_FECHAMENTO = re.compile(r'</([a-zA-Z0-9]+)>')
+_HTML_FECHA_LINHA = re.compile(r'^</([a-zA-Z0-9]+)')
+_HTML_PAR_LINHA = re.compile(r'^<([a-zA-Z0-9]+)[^>]*>.*?</\1>$')
+_HTML_ABRE_LINHA = re.compile(r'^<([a-zA-Z0-9]+)([^>]*)>')
+
 _HTML_INLINE = frozenset([
     'a','abbr','acronym','b','bdo','big','br','button','cite',
     'code','dfn','em','i','img','input','kbd','label','map',
@@ -38,45 +51,58 @@ def _normalize_code(code: str) -> str:
     - { seguido de char visível que não seja fechamento: insere \n
     - ; seguido de char visível (sem espaço intermediário): insere \n
     - } sempre fica sozinho: insere \n antes e depois se necessário
+
+    Passada única: só os caracteres { ; } são visitados, e o último caractere
+    não-espaço já emitido é mantido incrementalmente (sem rejuntar o resultado).
     """
     result = []
-    i = 0
+    ultimo = ''
+    pos = 0
     n = len(code)
-    while i < n:
+    for m in _CODE_TOKEN.finditer(code):
+        i = m.start()
+        trecho = code[pos:i]
+        if trecho:
+            result.append(trecho)
+            visivel = trecho.rstrip(' ')
+            if visivel:
+                ultimo = visivel[-1]
         ch = code[i]
+        pos = i + 1
 
         if ch == '}':
             # Garante \n antes de } (sem duplicar)
-            trailing = ''.join(result).rstrip(' ')
-            if trailing and trailing[-1] != '\n':
+            if ultimo and ultimo != '\n':
                 result.append('\n')
             result.append('}')
+            ultimo = '}'
             # Garante \n depois de } (sem duplicar)
-            rest_after = code[i+1:].lstrip(' ')
-            if rest_after and rest_after[0] != '\n':
+            j = pos
+            while j < n and code[j] == ' ':
+                j += 1
+            if j < n and code[j] != '\n':
                 result.append('\n')
-            i += 1
-            continue
+                ultimo = '\n'
 
-        result.append(ch)
-
-        if ch == '{':
+        elif ch == '{':
+            result.append('{')
+            ultimo = '{'
             lookahead = code[i+1:i+3]
             next_visible = lookahead.lstrip(' ')
             if '\n' not in lookahead and (not next_visible or next_visible[0] not in _NO_BREAK_AFTER):
                 result.append('\n')
+                ultimo = '\n'
+
+        else:
+            result.append(';')
+            ultimo = ';'
+            # Só quebra se o próximo char for visível e colado ao ;
+            after = code[i+1:i+2]
+            if after and after not in ' \n' and after not in _NO_BREAK_AFTER:
+                result.append('\n')
+                ultimo = '\n'
 
-        elif ch == ';':
-            # Só quebra se o próximo char (sem espaço) for visível
-            rest = code[i+1:]
-            next_visible = rest.lstrip(' ')
-            if next_visible and next_visible[0] != '\n' and next_visible[0] not in _NO_BREAK_AFTER:
-                # Mas não quebra se houver espaço seguido de char visível (já está separado)
-                after = code[i+1:i+2]
-                if after != ' ':
-                    result.append('\n')
-
-        i += 1
+    result.append(code[pos:])
     return ''.join(result)
 
 
@@ -133,21 +159,82 @@ def _unescape_block(code: str) -> str:
 
 
 def _is_html(code: str) -> bool:
-    return bool(re.search(r'<[a-zA-Z][^>]*>', code))
+    # Equivale a re.search(r'<[a-zA-Z][^>]*>'): basta um '>' depois do primeiro '<letra'.
+    m = _HTML_ABERTURA.search(code)
+    return bool(m) and code.find('>', m.end()) != -1
+
+
+def _tokenize_html(code: str) -> list:
+    """
+    Separa o código em [texto, tag, texto, tag, ..., texto], com o mesmo
+    critério de tag de ``<[^>]+>`` e já sem os espaços colados às tags.
+    """
+    partes = []
+    n = len(code)
+    pos = 0
+    busca = 0
+    while True:
+        lt = code.find('<', busca)
+        if lt == -1:
+            break
+        gt = code.find('>', lt + 1)
+        if gt == -1:
+            break
+        if gt == lt + 1:
+            busca = lt + 1
+            continue
+        inicio = lt
+        while inicio > pos and code[inicio - 1].isspace():
+            inicio -= 1
+        fim = gt + 1
+        while fim < n and code[fim].isspace():
+            fim += 1
+        partes.append(code[pos:inicio])
+        partes.append(code[lt:gt + 1])
+        pos = busca = fim
+    partes.append(code[pos:])
+    return partes
+
+
+def _fecha_par(abertura: str, texto: str, fechamento: str) -> bool:
+    """
+    True quando <abertura>texto<fechamento> formam um par que fica na mesma linha:
+    texto numa linha só, sem '<', e fechamento </nome> com nome prefixo do nome
+    da abertura (ou de uma tag que comece após uma quebra dentro da abertura).
+    """
+    if not texto or '\n' in texto or '<' in texto:
+        return False
+    m = _HTML_FECHAMENTO.fullmatch(fechamento)
+    if not m:
+        return False
+    nome = m.group(1)
+    for linha in abertura.split('\n'):
+        nome_abertura = _HTML_NOME_ABERTURA.match(linha)
+        if nome_abertura and nome_abertura.group(1).startswith(nome):
+            return True
+    return False
 
 
 def _normalize_html(code: str) -> str:
     """Quebra tags em linhas próprias, mas mantém pares <tag>conteúdo</tag> na mesma linha."""
-    # 1. Garante que toda tag HTML (<...>) tenha uma quebra de linha antes e depois
-    code = re.sub(r'\s*(<[^>]+>)\s*', r'\n\1\n', code)
-    
+    # 1. Toda tag HTML (<...>) ganha uma quebra de linha antes e depois
+    partes = _tokenize_html(code)
+
     # 2. Junta novamente os pares: <tag> + texto/conteúdo + </tag>
-    # Exemplo: \n<td>\nFruta\n</td>\n  ->  \n<td>Fruta</td>\n
-    pattern = r'\n(<([a-zA-Z0-9]+)[^>]*>)\n([^\n<]+)\n(</\2>)\n'
-    code = re.sub(pattern, r'\n\1\3\4\n', code)
+    # Exemplo: <td>, Fruta, </td>  ->  <td>Fruta</td>
+    saida = [partes[0]]
+    i = 1
+    while i < len(partes):
+        tag, texto = partes[i], partes[i + 1]
+        if i + 2 < len(partes) and _fecha_par(tag, texto, partes[i + 2]):
+            saida += ['\n', tag, texto, partes[i + 2], '\n', partes[i + 3]]
+            i += 4
+        else:
+            saida += ['\n', tag, '\n', texto]
+            i += 2
 
     # 3. Remove linhas vazias consecutivas
-    lines = [line.strip() for line in code.split('\n') if line.strip()]
+    lines = [line.strip() for line in ''.join(saida).split('\n') if line.strip()]
     return '\n'.join(lines)
 
 
@@ -163,10 +250,10 @@ def _indent_html(code: str) -> str:
             continue
 
         # Verifica se é tag de fechamento de bloco no início da linha
-        close_match = re.match(r'^</([a-zA-Z0-9]+)', stripped)
+        close_match = _HTML_FECHA_LINHA.match(stripped)
         
         # Se for um par completo na mesma linha (ex: <td>Fruta</td>), não deve alterar o nível de indentação
-        is_inline_pair = bool(re.match(r'^<([a-zA-Z0-9]+)[^>]*>.*?</\1>$', stripped))
+        is_inline_pair = bool(_HTML_PAR_LINHA.match(stripped))
 
         if close_match and not is_inline_pair:
             tag = close_match.group(1).lower()
@@ -175,7 +262,7 @@ def _indent_html(code: str) -> str:
 
         result.append(' ' * indent + stripped)
 
-        open_match = re.match(r'^<([a-zA-Z0-9]+)([^>]*)>', stripped)
+        open_match = _HTML_ABRE_LINHA.match(stripped)
         if open_match and not is_inline_pair:
             tag = open_match.group(1).lower()
             attrs = open_match.group(2)
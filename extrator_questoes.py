@@ -1,4 +1,15 @@
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import cache_paginas
+import fonte_pdf
+import perfil
+import selecao_backend
+from boilerplate import limpar_paginas
+from modelo_questao import Questao
 
 try:
     import pdfplumber
@@ -10,45 +21,264 @@ try:
 except ImportError:
     fitz = None
 
+# Incrementar sempre que uma mudança na extração alterar as questões geradas:
+# invalida os resultados guardados em cache.
+VERSAO_EXTRATOR = "4"
+
+# Extração paralela: documentos menores que MIN_PAGINAS_PARALELO são lidos em
+# série (abrir um pool custa mais que ganha). WORKERS_EXTRACAO = None usa
+# todos os núcleos; pode ser fixado pela variável de ambiente EXTRATOR_WORKERS.
+MIN_PAGINAS_PARALELO = 24
+PAGINAS_POR_LOTE_MIN = 8
+WORKERS_EXTRACAO = int(os.environ.get("EXTRATOR_WORKERS", "0")) or None
+# Com um pool compartilhado (tarefas_pdf), cada documento mantém no máximo
+# LOTES_EM_VOO lotes enviados, para que um PDF enorme não monopolize a fila:
+# um por processo e mais um, para nenhum processo ficar parado enquanto o
+# lote mais antigo volta (com menos, um documento sozinho não usa todos os núcleos).
+LOTES_EM_VOO = max(4, (WORKERS_EXTRACAO or os.cpu_count() or 1) + 1)
+
+
+def _paginas_pdfplumber(fonte, inicio, fim):
+    with fonte_pdf.abrir_pdfplumber(fonte) as pdf:
+        for i in range(inicio, fim):
+            yield pdf.pages[i].extract_text() or ""
+
+
+def _paginas_fitz(fonte, inicio, fim):
+    with fonte_pdf.abrir_fitz(fonte) as pdf:
+        for i in range(inicio, fim):
+            yield pdf[i].get_text()
+
+
+# Backends de texto disponíveis, na ordem de preferência sem amostra.
+BACKENDS = [(nome, funcao) for nome, funcao, modulo in (
+    ("pdfplumber", _paginas_pdfplumber, pdfplumber), ("fitz", _paginas_fitz, fitz)) if modulo]
+
+
+def _extrair_lote(paginas_backend, fonte, inicio, fim):
+    return list(paginas_backend(fonte, inicio, fim))
 
-def _extrair_texto_pdfplumber(caminho_pdf):
-    texto = ""
-    with pdfplumber.open(caminho_pdf) as pdf:
-        for pagina in pdf.pages:
-            texto += (pagina.extract_text() or "") + "\n"
-    return texto
 
+def _contar_paginas(fonte):
+    if fitz:
+        with fonte_pdf.abrir_fitz(fonte) as pdf:
+            return pdf.page_count
+    with fonte_pdf.abrir_pdfplumber(fonte) as pdf:
+        return len(pdf.pages)
 
-def _extrair_texto_fitz(caminho_pdf):
-    texto = ""
-    pdf = fitz.open(caminho_pdf)
-    for pagina in pdf:
-        texto += pagina.get_text() + "\n"
-    pdf.close()
-    return texto
 
+def _lotes(total_paginas, workers, inicio=0):
+    tamanho = max(PAGINAS_POR_LOTE_MIN, -(-(total_paginas - inicio) // (workers * 2)))
+    return [(i, min(i + tamanho, total_paginas)) for i in range(inicio, total_paginas, tamanho)]
 
-def extrair_questoes_pdf(caminho_pdf, com_assunto=False):
-    texto_completo = None
-    if pdfplumber:
+
+def _iterar_paginas_no_pool(pool, paginas_backend, fonte, inicio, total):
+    lotes = iter([(i, min(i + PAGINAS_POR_LOTE_MIN, total)) for i in range(inicio, total, PAGINAS_POR_LOTE_MIN)])
+    em_voo = deque()
+    for lote in lotes:
+        em_voo.append(pool.submit(_extrair_lote, paginas_backend, fonte, *lote))
+        if len(em_voo) >= LOTES_EM_VOO:
+            break
+    while em_voo:
+        paginas = em_voo.popleft().result()
+        lote = next(lotes, None)
+        if lote is not None:
+            em_voo.append(pool.submit(_extrair_lote, paginas_backend, fonte, *lote))
+        yield from paginas
+
+
+def _iterar_paginas(paginas_backend, fonte, workers=None, inicio=0, total=None, pool=None):
+    """
+    Texto de cada página a partir de ``inicio``, em ordem, entregue assim que
+    fica pronto. Com ``pool`` (um executor já aberto), os lotes vão para ele.
+    Sem, documentos com ``MIN_PAGINAS_PARALELO`` páginas ou mais são
+    divididos em lotes contíguos processados num pool de processos próprio;
+    os lotes voltam na ordem em que foram enviados. Um PDF em memória vai
+    para os processos por ``fonte_pdf.para_pool``.
+    """
+    total = _contar_paginas(fonte) if total is None else total
+    if pool is not None:
+        with fonte_pdf.para_pool(fonte) as fonte:
+            yield from _iterar_paginas_no_pool(pool, paginas_backend, fonte, inicio, total)
+        return
+
+    workers = workers or WORKERS_EXTRACAO or os.cpu_count() or 1
+    if workers <= 1 or total - inicio < MIN_PAGINAS_PARALELO:
+        yield from paginas_backend(fonte, inicio, total)
+        return
+
+    lotes = _lotes(total, workers, inicio)
+    with fonte_pdf.para_pool(fonte) as fonte, ProcessPoolExecutor(max_workers=min(workers, len(lotes))) as pool:
+        resultados = pool.map(
+            _extrair_lote, [paginas_backend] * len(lotes), [fonte] * len(lotes),
+            [i for i, _ in lotes], [f for _, f in lotes],
+        )
+        for lote in resultados:
+            yield from lote
+
+
+def _ordem_backends(fonte, total, backend, pool=None):
+    with perfil.etapa("paginas.escolha"):
+        ordem = selecao_backend.escolher(fonte, BACKENDS, total, backend=backend, pool=pool)
+    funcoes = dict(BACKENDS)
+    return [(nome, funcoes[nome]) for nome in ordem]
+
+
+def _paginas_pdf(fonte, workers=None, backend=None):
+    """
+    Texto de cada página, com o backend de ``selecao_backend.escolher`` (ou
+    ``backend``, se dado); se ele falhar ou não der texto, tenta os outros.
+    """
+    fonte = fonte_pdf.em_memoria(fonte)
+    total = _contar_paginas(fonte)
+    backends = _ordem_backends(fonte, total, backend)
+    paginas = None
+    for n, (nome, funcao) in enumerate(backends):
         try:
-            texto_completo = _extrair_texto_pdfplumber(caminho_pdf)
+            with perfil.etapa(f"paginas.{nome}"):
+                paginas = list(_iterar_paginas(funcao, fonte, workers, total=total))
         except Exception:
-            texto_completo = None
-    if not texto_completo and fitz:
-        texto_completo = _extrair_texto_fitz(caminho_pdf)
-    if not texto_completo:
+            if n == len(backends) - 1:
+                raise
+        if paginas:
+            break
+    if not paginas:
         raise RuntimeError("Não foi possível extrair texto do PDF.")
+    return paginas
+
+
+def iterar_paginas_pdf(fonte, workers=None, progresso=None, pool=None, backend=None):
+    """
+    Como ``_paginas_pdf``, mas entrega cada página assim que é extraída e
+    chama ``progresso(paginas_lidas, total_paginas)`` a cada uma. Se o
+    backend escolhido falhar no meio do documento, o próximo continua de
+    onde ele parou.
+    """
+    fonte = fonte_pdf.em_memoria(fonte)
+    total = _contar_paginas(fonte)
+    lidas = 0
+    backends = _ordem_backends(fonte, total, backend, pool)
+    for n, (nome, backend) in enumerate(backends):
+        try:
+            paginas = _iterar_paginas(backend, fonte, workers, inicio=lidas, total=total, pool=pool)
+            for texto in perfil.medir_fluxo(f"paginas.{nome}", paginas):
+                lidas += 1
+                if progresso:
+                    progresso(lidas, total)
+                yield texto
+            break
+        except Exception:
+            if n == len(backends) - 1:
+                raise
+    if not total:
+        raise RuntimeError("Não foi possível extrair texto do PDF.")
+
+
+def _com_cache_de_paginas(paginas_backend, nome_backend, fonte, digest, inicio, fim, pool, workers=None):
+    """
+    Páginas ``inicio``..``fim - 1`` consultando ``cache_paginas``: cada
+    sequência de páginas ausentes é extraída de uma vez e guardada.
+    """
+    i = inicio
+    while i < fim:
+        texto = cache_paginas.obter(digest, i, nome_backend)
+        if texto is not None:
+            yield texto
+            i += 1
+            continue
+        j = i + 1
+        while j < fim and not cache_paginas.contem(digest, j, nome_backend):
+            j += 1
+        for k, texto in enumerate(_iterar_paginas(paginas_backend, fonte, workers, inicio=i, total=j, pool=pool), i):
+            cache_paginas.guardar(digest, k, nome_backend, "text", texto)
+            yield texto
+        i = j
+
+
+def iterar_paginas_fitz(fonte, inicio=0, fim=None, progresso=None, pool=None, digest=None, workers=None):
+    """
+    Texto (fitz) das páginas ``inicio``..``fim - 1``, com ``progresso(lidas, total)``.
+    Com ``digest`` (hash do conteúdo), páginas já extraídas vêm do cache.
+    ``workers`` limita o pool próprio quando não há ``pool`` (1: em série).
+    """
+    fonte = fonte_pdf.em_memoria(fonte)
+    fim = _contar_paginas(fonte) if fim is None else fim
+    if digest is None:
+        paginas = _iterar_paginas(_paginas_fitz, fonte, workers, inicio=inicio, total=fim, pool=pool)
+    else:
+        paginas = _com_cache_de_paginas(_paginas_fitz, "fitz", fonte, digest, inicio, fim, pool, workers)
+    for n, texto in enumerate(perfil.medir_fluxo("paginas.fitz", paginas), 1):
+        if progresso:
+            progresso(n, fim - inicio)
+        yield texto
+
+
+# Normalização em fluxo. As páginas passam uma única vez pelos geradores
+# encadeados (boilerplate, espaços, linhas); as substituições (Certo/Errado em
+# diante) não: cada segmento de ~TAMANHO_SEGMENTO caracteres, cortado só onde
+# nenhuma delas atravessa o corte (ver _corte_seguro), passa por elas uma a
+# uma, cerca de nove passadas. Uma regex só, por alternância, daria outro
+# texto: cada regra lê a saída da anterior (a 6 vê o ponto posto pela 5, a 9
+# as quebras das 7 e 8). O resultado é idêntico ao de aplicar cada regra ao
+# documento inteiro, com a memória limitada ao segmento em vez das dez cópias
+# do texto completo.
+TAMANHO_SEGMENTO = 64 * 1024
+
+_ESPACOS_EXTRAS = re.compile(r'\s{2,}')
+_CERTO_ERRADO_CERTO = re.compile(r'Certo\s+Errado\s+Gabarito:\s*Certo')
+_CERTO_ERRADO_ERRADO = re.compile(r'Certo\s+Errado\s+Gabarito:\s*Errado')
+_NUMERACAO = re.compile(r'(?<!\()\d+\)\s*')
+_GABARITO_SEM_PONTO = re.compile(r'(Gabarito:\s[A-E])', re.MULTILINE)
+_QUEBRA_SEM_PONTO = re.compile(r'(?<!\.|\:|\;)\n')
+_ALTERNATIVA_NO_MEIO = re.compile(r'(?<!\n)\s+([a-e]\))')
+_GABARITO_NO_MEIO = re.compile(r'(?<!\n)(Gabarito:\s[A-E]\.)')
+_ALTERNATIVA_SEM_PONTO = re.compile(r'^([a-e]\).*)(?<![.;])$', re.MULTILINE)
+# Segmentos depois do primeiro são processados com este prefixo, que faz as
+# regras com lookbehind enxergarem o fim (sempre ".\n" ou ";\n") do anterior.
+_PREFIXO_SEGMENTO = ".\n"
+# Linhas que o detector de boilerplate nunca remove, mesmo repetidas na borda da página
+_LINHA_ESTRUTURAL = re.compile(r'\s*(?:Gabarito:|\$?[a-eA-E]\)|\d+\)|Certo\s*$|Errado\s*$)')
+
+
+def _colapsar_espacos(blocos):
+    """1 - remover espaços extras, sem perder sequências que cruzam páginas."""
+    pendente = ""
+    for bloco in blocos:
+        texto = pendente + bloco
+        corte = len(texto.rstrip())
+        pendente = texto[corte:]
+        if corte:
+            yield _ESPACOS_EXTRAS.sub(' ', texto[:corte])
+    yield _ESPACOS_EXTRAS.sub(' ', pendente)
+
+
+def _linhas(blocos):
+    """Mesmas linhas de ``"".join(blocos).split('\\n')``, sem montar o texto."""
+    partes = []
+    for bloco in blocos:
+        pedacos = bloco.split('\n')
+        if len(pedacos) == 1:
+            partes.append(bloco)
+            continue
+        partes.append(pedacos[0])
+        yield ''.join(partes)
+        yield from pedacos[1:-1]
+        partes = [pedacos[-1]]
+    yield ''.join(partes)
+
 
-    # 1 - remover espaços extras
-    texto_completo = re.sub(r'\s{2,}', ' ', texto_completo)
-    # 2 - remover as 3 primeiras linhas
-    texto_completo = '\n'.join(texto_completo.split('\n')[3:])
-    # 3 - remover as linhas que começam com www (e a linha seguinte se com_assunto)
-    linhas = texto_completo.split('\n')
-    linhas_filtradas = []
+def _filtrar_linhas(linhas, com_assunto):
+    """
+    2 - remover as 3 primeiras linhas
+    3 - remover as linhas que começam com www (e a linha seguinte se com_assunto)
+
+    O rodapé do TEC leva o link da questão, diferente em cada página: o
+    detector de boilerplate só o tira quando há páginas para contar.
+    """
     pular_proxima = False
-    for linha in linhas:
+    for n, linha in enumerate(linhas):
+        if n < 3:
+            continue
         if pular_proxima:
             pular_proxima = False
             continue
@@ -56,141 +286,232 @@ def extrair_questoes_pdf(caminho_pdf, com_assunto=False):
             if com_assunto:
                 pular_proxima = True
             continue
-        linhas_filtradas.append(linha)
-    texto_completo = '\n'.join(linhas_filtradas)
+        yield linha
 
-    texto_completo = re.sub(
-        r'Certo\s+Errado\s+Gabarito:\s*Certo',
-        'a) Certo\nb) Errado\nGabarito: A',
-        texto_completo
-    )
-    texto_completo = re.sub(
-        r'Certo\s+Errado\s+Gabarito:\s*Errado',
-        'a) Certo\nb) Errado\nGabarito: B',
-        texto_completo
+
+def _corte_seguro(anterior, linha):
+    """
+    Se dá para cortar o texto entre ``anterior`` e ``linha``. A quebra precisa
+    sobreviver à regra 6 (linha anterior termina em "." ou ";") e nenhuma
+    regra pode consumi-la: Certo/Errado e "Gabarito:" terminam em letra ou
+    ":", a numeração não pode começar a linha seguinte (e nem mexer na
+    anterior, no modo com_assunto) e espaços não podem emendar na quebra.
+    """
+    return (
+        anterior and anterior[-1] in '.;'
+        and linha != '' and not linha[0].isspace()
+        and _NUMERACAO.match(linha) is None
     )
 
-    # 3.5 - se com_assunto, marcar linha acima da numeração como assunto
+
+def _segmentos(linhas, tamanho_segmento=TAMANHO_SEGMENTO):
+    atual, tamanho, anterior = [], 0, None
+    for linha in linhas:
+        if tamanho >= tamanho_segmento and _corte_seguro(anterior, linha):
+            yield '\n'.join(atual) + '\n'
+            atual, tamanho = [], 0
+        atual.append(linha)
+        tamanho += len(linha) + 1
+        anterior = linha
+    yield '\n'.join(atual)
+
+
+def _normalizar_segmento(texto, com_assunto):
+    """As substituições em ordem, uma passada por regra sobre o segmento."""
+    with perfil.etapa("normalizar.certo_errado"):
+        texto = _CERTO_ERRADO_CERTO.sub('a) Certo\nb) Errado\nGabarito: A', texto)
+        texto = _CERTO_ERRADO_ERRADO.sub('a) Certo\nb) Errado\nGabarito: B', texto)
+
+    with perfil.etapa("normalizar.numeracao"):
+        # 3.5 - se com_assunto, marcar linha acima da numeração como assunto
+        if com_assunto:
+            novas_linhas = []
+            for linha in texto.split('\n'):
+                if _NUMERACAO.match(linha):
+                    if novas_linhas:
+                        prev = novas_linhas[-1].rstrip('.')
+                        novas_linhas[-1] = 'Assunto: ' + prev + '.'
+                    novas_linhas.append('Enunciado: ' + _NUMERACAO.sub('', linha))
+                else:
+                    novas_linhas.append(linha)
+            texto = '\n'.join(novas_linhas)
+        else:
+            # 4 - remover numeração tipo "1) ", "23) "
+            texto = _NUMERACAO.sub('', texto)
+
+    with perfil.etapa("normalizar.gabarito_ponto"):
+        # 5 - adicionar ponto final após "Gabarito: X"
+        texto = _GABARITO_SEM_PONTO.sub(r'\1.', texto)
+    with perfil.etapa("normalizar.quebras"):
+        # 6 - remover quebras de linha não terminadas com ponto
+        texto = _QUEBRA_SEM_PONTO.sub(' ', texto)
+    with perfil.etapa("normalizar.alternativas"):
+        # 7 - adiciona quebra de linha em casos a-e)
+        texto = _ALTERNATIVA_NO_MEIO.sub(r'\n\1', texto)
+        # 8 - adicionar quebra de linha quando houver "Gabarito: A-E" no meio do texto
+        texto = _GABARITO_NO_MEIO.sub(r'\n\1', texto)
+        # 9 - adicionar ponto no final de texto que começa com a-e) e não termina com ponto ou ponto e vírgula
+        texto = _ALTERNATIVA_SEM_PONTO.sub(r'\1.', texto)
+    return texto.replace(' .', '.')
+
+
+def normalizar_paginas(paginas, com_assunto=False, tamanho_segmento=TAMANHO_SEGMENTO):
+    """
+    Gera o texto normalizado em pedaços, consumindo ``paginas`` sob demanda.
+    Segmentos menores entregam o começo do texto mais cedo.
+    """
+    # Cabeçalhos e rodapés repetidos saem no detector de boilerplate; o cabeçalho
+    # do caderno (só na primeira página) e as linhas www, em _filtrar_linhas.
+    # O fitz termina cada página com uma quebra de linha a mais, que tiraria o
+    # rodapé da última posição; sem ela os dois backends dão o mesmo texto.
+    paginas = perfil.medir_fluxo("normalizar.boilerplate",
+                                 limpar_paginas((p.rstrip("\n") for p in paginas), "tec",
+                                                preservar=_LINHA_ESTRUTURAL.match))
+    blocos = perfil.medir_fluxo("normalizar.espacos", _colapsar_espacos(p + "\n" for p in paginas))
+    linhas = _filtrar_linhas(_linhas(blocos), com_assunto)
+    segmentos = perfil.medir_fluxo("normalizar.segmentos", _segmentos(linhas, tamanho_segmento))
+    for n, segmento in enumerate(segmentos):
+        if n == 0:
+            yield _normalizar_segmento(segmento, com_assunto)
+        else:
+            yield _normalizar_segmento(_PREFIXO_SEGMENTO + segmento, com_assunto)[len(_PREFIXO_SEGMENTO):]
+
+
+def extrair_questoes_pdf(fonte, com_assunto=False, workers=None, backend=None):
+    return ''.join(normalizar_paginas(_paginas_pdf(fonte, workers, backend), com_assunto))
+
+
+_GABARITO_LINHA = re.compile(r'^Gabarito:\s*([A-E])\s*\.?$', re.MULTILINE | re.IGNORECASE)
+_INICIO_ALTERNATIVAS = re.compile(r'\$?[aA]\)')
+_FIM_ALTERNATIVAS = re.compile(r'Gabarito:', re.IGNORECASE)
+_ALTERNATIVA_LINHA = re.compile(r'\$?([a-e])\)\s*(.*)$', re.IGNORECASE)
+
+
+def _montar_questao(bloco, gabarito, com_assunto):
+    """Questão (id 0) do bloco que termina na linha do gabarito, ou None se inválido."""
+    linhas = bloco.splitlines()
+
+    # Extrair assunto se com_assunto
+    assunto = None
     if com_assunto:
-        linhas = texto_completo.split('\n')
-        novas_linhas = []
-        for i, linha in enumerate(linhas):
-            if re.match(r'(?<!\()\d+\)\s*', linha):
-                if novas_linhas:
-                    prev = novas_linhas[-1].rstrip('.')
-                    novas_linhas[-1] = 'Assunto: ' + prev + '.'
-                linha_sem_num = re.sub(r'(?<!\()\d+\)\s*', '', linha)
-                novas_linhas.append('Enunciado: ' + linha_sem_num)
-            else:
-                novas_linhas.append(linha)
-        texto_completo = '\n'.join(novas_linhas)
-    else:
-        # 4 - remover numeração tipo "1) ", "23) "
-        texto_completo = re.sub(r'(?<!\()\d+\)\s*', '', texto_completo)
+        assunto = ""
+        for j, linha in enumerate(linhas):
+            if linha.strip().startswith('Assunto: '):
+                assunto = linha.strip().replace('Assunto: ', '', 1).rstrip('.')
+                del linhas[j]
+                break
+        for j, linha in enumerate(linhas):
+            if linha.strip().startswith('Enunciado: '):
+                linhas[j] = linha.replace('Enunciado: ', '', 1)
+                break
 
-    # 5 - adicionar ponto final após "Gabarito: X"
-    texto_completo = re.sub(r'(Gabarito:\s[A-E])', r'\1.', texto_completo, flags=re.MULTILINE)
-    # 6 - remover quebras de linha não terminadas com ponto
-    texto_completo = re.sub(r'(?<!\.|\:|\;)\n', ' ', texto_completo)
-    # 7 - adiciona quebra de linha em casos a-e)
-    texto_completo = re.sub(r'(?<!\n)\s+([a-e]\))', r'\n\1', texto_completo)
-    # 8 - adicionar quebra de linha quando houver "Gabarito: A-E" no meio do texto
-    texto_completo = re.sub(r'(?<!\n)(Gabarito:\s[A-E]\.)', r'\n\1', texto_completo)
-    # 9 - adicionar ponto no final de texto que começa com a-e) e não termina com ponto ou ponto e vírgula
-    texto_completo = re.sub(r'^([a-e]\).*)(?<![.;])$', r'\1.', texto_completo, flags=re.MULTILINE)
-    texto_completo = texto_completo.replace(' .', '.')
+    # encontra alternativas (primeira linha que começa com a))
+    idx_alt = None
+    for j, linha in enumerate(linhas):
+        if _INICIO_ALTERNATIVAS.match(linha.strip()):
+            idx_alt = j
+            break
 
-    return texto_completo
+    if idx_alt is None:
+        return None
 
+    enunciado = "\n".join(islice(linhas, idx_alt)).strip()
 
-def armazenar_questoes(texto, com_assunto=False):
-    questoes = []
+    alternativas = []
+    esperada = ord('a')
 
-    gabarito_pattern = re.compile(r'^Gabarito:\s*([A-E])\s*\.?$', re.MULTILINE | re.IGNORECASE)
-    matches = list(gabarito_pattern.finditer(texto))
+    for j in range(idx_alt, len(linhas)):
+        linha = linhas[j].strip()
+        if _FIM_ALTERNATIVAS.match(linha):
+            break
+        m = _ALTERNATIVA_LINHA.match(linha)
+        if m:
+            letra = m.group(1).lower()
+            if ord(letra) != esperada:
+                return None
+            alternativas.append(m.group(2).strip())
+            esperada += 1
+        elif alternativas:
+            alternativas[-1] += ' ' + linha
 
-    if not matches:
-        return questoes
+    if not alternativas:
+        return None
 
-    inicio = 0
-    qid = 0
-    for i, match in enumerate(matches):
-        fim = match.end()
-        bloco = texto[inicio:fim].strip()
-        inicio = fim
+    # Resolver gabarito: texto da alternativa correspondente à letra
+    idx_gabarito = ord(gabarito.lower()) - ord('a')
+    texto_gabarito = alternativas[idx_gabarito] if idx_gabarito < len(alternativas) else gabarito
 
-        try:
-            gabarito = match.group(1).upper()
-            linhas = bloco.splitlines()
+    return Questao(0, enunciado, tuple(alternativas), texto_gabarito, assunto)
+
+
+_DEPOIS_DO_GABARITO = re.compile(r'\s*\S.', re.DOTALL)
+
+
+def _gabarito_definido(texto, match):
+    """
+    Se mais texto não pode mudar ``match``: depois dele já há pelo menos dois
+    caracteres que não são espaço, o que fixa o ``\\s*\\.?$`` do padrão.
+    """
+    return _DEPOIS_DO_GABARITO.match(texto, match.end()) is not None
 
-            # Extrair assunto se com_assunto
-            assunto = ""
-            if com_assunto:
-                for j, linha in enumerate(linhas):
-                    if linha.strip().startswith('Assunto: '):
-                        assunto = linha.strip().replace('Assunto: ', '', 1).rstrip('.')
-                        linhas = linhas[:j] + linhas[j+1:]
-                        break
-                for j, linha in enumerate(linhas):
-                    if linha.strip().startswith('Enunciado: '):
-                        linhas[j] = linha.replace('Enunciado: ', '', 1)
-                        break
-
-            # encontra alternativas (primeira linha que começa com a))
-            idx_alt = None
-            for j, linha in enumerate(linhas):
-                if re.match(r'^\$?[aA]\)', linha.strip()):
-                    idx_alt = j
-                    break
-
-            if idx_alt is None:
-                continue
 
-            enunciado = "\n".join(linhas[:idx_alt]).strip()
-
-            alternativas = []
-            esperada = ord('a')
-            valida = True
-
-            for linha in linhas[idx_alt:]:
-                linha = linha.strip()
-                if re.match(r'^Gabarito:', linha, re.IGNORECASE):
-                    break
-                m = re.match(r'^\$?([a-e])\)\s*(.*)$', linha, re.IGNORECASE)
-                if m:
-                    letra = m.group(1).lower()
-                    if ord(letra) != esperada:
-                        valida = False
-                        break
-                    alternativas.append(m.group(2).strip())
-                    esperada += 1
-                elif alternativas:
-                    alternativas[-1] += ' ' + linha
-
-            if not valida or not alternativas:
+def armazenar_questoes_em_fluxo(pedacos, com_assunto=False):
+    """
+    Gera as questões de um texto normalizado que chega em ``pedacos``; cada
+    questão sai assim que a linha do seu gabarito está completa. O resultado
+    é o mesmo de ``armazenar_questoes("".join(pedacos))``.
+    """
+    pendente = ""
+    qid = 0
+    pedacos = iter(pedacos)
+    fim_do_texto = False
+    while not fim_do_texto:
+        pedaco = next(pedacos, None)
+        if pedaco is None:
+            fim_do_texto = True
+        else:
+            pendente += pedaco
+
+        inicio = 0
+        for match in _GABARITO_LINHA.finditer(pendente):
+            if not fim_do_texto and not _gabarito_definido(pendente, match):
+                break
+            fim = match.end()
+            bloco = pendente[inicio:fim].strip()
+            inicio = fim
+            try:
+                questao = _montar_questao(bloco, match.group(1).upper(), com_assunto)
+            except Exception:
                 continue
+            if questao is not None:
+                qid += 1
+                questao.id = qid
+                yield questao
+        pendente = pendente[inicio:]
 
-            # Resolver gabarito: texto da alternativa correspondente à letra
-            idx_gabarito = ord(gabarito.lower()) - ord('a')
-            texto_gabarito = alternativas[idx_gabarito] if idx_gabarito < len(alternativas) else gabarito
-
-            qid += 1
-            questao = {
-                "id": qid,
-                "enunciado": enunciado,
-                "alternativas": alternativas,
-                "gabarito": texto_gabarito
-            }
-            if com_assunto:
-                questao["assunto"] = assunto
-            questoes.append(questao)
-        except Exception:
-            continue
 
-    return questoes
+def armazenar_questoes(texto, com_assunto=False):
+    with perfil.etapa("armazenar_questoes"):
+        return list(armazenar_questoes_em_fluxo([texto], com_assunto))
 
 
-def processar_pdf(pdf_path, com_assunto=False):
-    texto = extrair_questoes_pdf(pdf_path, com_assunto=com_assunto)
-    questoes = armazenar_questoes(texto, com_assunto=com_assunto)
+def processar_pdf(pdf_path, com_assunto=False, workers=None, backend=None):
+    """
+    Questões do PDF ``pdf_path``: um caminho, os bytes do arquivo
+    (``bytes``/``memoryview``) ou um arquivo aberto, lidos sem cópia em disco.
+    ``backend`` ("pdfplumber" ou "fitz") dispensa a escolha automática.
+    Só texto: as figuras (``{image(n)}``) vêm da segmentação por layout.
+    """
+    with perfil.corrida(fonte_pdf.nome(pdf_path)):
+        texto = extrair_questoes_pdf(pdf_path, com_assunto=com_assunto, workers=workers, backend=backend)
+        questoes = armazenar_questoes(texto, com_assunto=com_assunto)
     return questoes
+
+
+def processar_pdf_em_fluxo(pdf_path, com_assunto=False, workers=None, progresso=None,
+                           tamanho_segmento=TAMANHO_SEGMENTO, pool=None, backend=None):
+    """Gera as questões de ``processar_pdf`` à medida que as páginas são lidas."""
+    with perfil.corrida(fonte_pdf.nome(pdf_path)):
+        paginas = iterar_paginas_pdf(pdf_path, workers, progresso, pool, backend)
+        texto = normalizar_paginas(paginas, com_assunto, tamanho_segmento)
+        yield from perfil.medir_fluxo("armazenar_questoes", armazenar_questoes_em_fluxo(texto, com_assunto))
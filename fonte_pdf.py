@@ -0,0 +1,193 @@
+"""
+De onde os backends leem um PDF: caminho, bytes (``bytes``, ``bytearray``,
+``memoryview``) ou arquivo aberto — o ``UploadedFile`` do Streamlit, por
+exemplo — sem passar pelo disco.
+
+``em_memoria`` reduz a fonte, uma vez, a um caminho ou a um buffer:
+``BytesIO`` (e o ``UploadedFile``) entregam o próprio buffer, sem cópia.
+``abrir_fitz`` lê o buffer direto (``stream=``) e ``abrir_pdfplumber``
+por um leitor sobre ele, também sem copiar.
+
+Os processos do pool não enxergam a memória de quem chamou. ``para_pool``
+copia um PDF em memória uma única vez para um bloco de memória
+compartilhada, que cada lote abre pelo nome (``Compartilhado``) e que é
+liberado quando a extração termina; sem espaço para o bloco, os bytes vão
+junto com cada lote.
+"""
+
+import hashlib
+import io
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# Nome e tamanho de um PDF em memória compartilhada.
+Compartilhado = namedtuple("Compartilhado", "nome tamanho")
+
+PASTA_MEMORIA_COMPARTILHADA = "/dev/shm"
+
+
+def eh_caminho(fonte):
+    return isinstance(fonte, (str, os.PathLike))
+
+
+def em_memoria(fonte):
+    """Caminhos ficam como estão; arquivos abertos viram o buffer que contêm."""
+    if eh_caminho(fonte) or isinstance(fonte, (bytes, memoryview, Compartilhado)):
+        return fonte
+    if isinstance(fonte, bytearray):
+        return memoryview(fonte)
+    if hasattr(fonte, "getvalue"):
+        return fonte.getvalue()
+    if fonte.seekable():
+        fonte.seek(0)
+    return fonte.read()
+
+
+def nome(fonte):
+    """Nome para mensagens e medições (``perfil``)."""
+    if eh_caminho(fonte):
+        return os.path.basename(fonte)
+    rotulo = getattr(fonte, "name", None)
+    return os.path.basename(rotulo) if isinstance(rotulo, str) else "PDF em memória"
+
+
+class _Leitor(io.RawIOBase):
+    """Arquivo somente leitura sobre um buffer, sem copiá-lo."""
+
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        base = (0, self._pos, len(self._buffer))[whence]
+        self._pos = max(0, base + pos)
+        return self._pos
+
+    def readinto(self, destino):
+        parte = self._buffer[self._pos:self._pos + len(destino)]
+        destino[:len(parte)] = parte
+        self._pos += len(parte)
+        return len(parte)
+
+    def close(self):
+        # Solta o buffer: um bloco compartilhado só fecha sem visões abertas.
+        self._buffer.release()
+        super().close()
+
+
+def iniciar_rastreador():
+    """
+    Chamar antes de criar um pool de processos. Quem abre um bloco
+    compartilhado o registra no rastreador de recursos; com o rastreador já
+    rodando, os processos herdam o deste processo, que apaga o bloco uma
+    vez só, em ``para_pool``. Sem isso cada processo teria um rastreador
+    próprio, que tentaria apagar o bloco (e avisaria de um vazamento) ao sair.
+    """
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+
+
+def _anexar(nome):
+    try:
+        return shared_memory.SharedMemory(name=nome, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=nome)
+
+
+@contextmanager
+def _dados(fonte):
+    """Caminho ou buffer da fonte; um ``Compartilhado`` é mapeado só enquanto dura o bloco."""
+    fonte = em_memoria(fonte)
+    if not isinstance(fonte, Compartilhado):
+        yield fonte
+        return
+    memoria = _anexar(fonte.nome)
+    visao = memoria.buf[:fonte.tamanho]
+    try:
+        yield visao
+    finally:
+        visao.release()
+        memoria.close()
+
+
+def digest(fonte):
+    """sha256 do conteúdo do PDF, lido em blocos quando é um caminho."""
+    h = hashlib.sha256()
+    with _dados(fonte) as dados:
+        if not eh_caminho(dados):
+            h.update(dados)
+            return h.hexdigest()
+        with open(dados, "rb") as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(bloco)
+    return h.hexdigest()
+
+
+@contextmanager
+def abrir_fitz(fonte):
+    with _dados(fonte) as dados:
+        pdf = fitz.open(dados) if eh_caminho(dados) else fitz.open(stream=dados, filetype="pdf")
+        try:
+            yield pdf
+        finally:
+            pdf.close()
+
+
+@contextmanager
+def abrir_pdfplumber(fonte):
+    with _dados(fonte) as dados:
+        if eh_caminho(dados):
+            with pdfplumber.open(dados) as pdf:
+                yield pdf
+            return
+        with _Leitor(dados) as arquivo, pdfplumber.open(arquivo) as pdf:
+            yield pdf
+
+
+def _cabe_na_memoria_compartilhada(tamanho):
+    try:
+        livre = os.statvfs(PASTA_MEMORIA_COMPARTILHADA)
+    except (AttributeError, OSError):
+        return True
+    return livre.f_bavail * livre.f_frsize >= tamanho
+
+
+@contextmanager
+def para_pool(fonte):
+    """Versão de ``fonte`` que pode ser enviada aos processos do pool."""
+    fonte = em_memoria(fonte)
+    if eh_caminho(fonte) or isinstance(fonte, Compartilhado):
+        yield fonte
+        return
+    tamanho = memoryview(fonte).nbytes
+    if not tamanho or not _cabe_na_memoria_compartilhada(tamanho):
+        yield bytes(fonte)
+        return
+    memoria = shared_memory.SharedMemory(create=True, size=tamanho)
+    try:
+        memoria.buf[:tamanho] = memoryview(fonte).cast("B")
+        yield Compartilhado(memoria.name, tamanho)
+    finally:
+        memoria.close()
+        memoria.unlink()
@@ -0,0 +1,118 @@
+"""
+Imagens embutidas nos PDFs de questões.
+
+``imagens_da_pagina`` roda junto da extração das linhas (no pool, se
+houver) e devolve as figuras de uma página em PNG, com a posição e o hash
+do conteúdo; cada xref é convertido uma vez por lote. ``RegistroImagens``
+numera as figuras de um banco na ordem em que aparecem — conteúdo repetido
+reusa o número — e grava ``images/<pasta>/<banco>-<n>.png`` só quando o
+arquivo mudou: reprocessar um banco não reescreve nada. ``podar``, chamado
+no fim da extração, apaga os PNGs de números que o banco não usa mais.
+
+Só a segmentação por layout (``segmentacao_layout``, na linha de comando
+``python -m simulado.ingestao --layout --imagens``) extrai as figuras. O
+pipeline de regex (``extrator_questoes.processar_pdf``, usado também pelos
+uploads do simulado) achata as páginas em texto e não gera imagens nem
+``{image(n)}``: nesses bancos as imagens continuam feitas à mão.
+"""
+
+import hashlib
+import os
+import re
+
+from simulado import cache_disco
+from simulado.imagens import caminho_esperado
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# Ícones e marcadores menores que isso (em pixels) não são figuras.
+MIN_LADO = 24
+
+# Sem dígitos no marcador: o detector de boilerplate troca dígitos por "#".
+_SEM_DIGITOS = str.maketrans("0123456789", "ghijklmnop")
+
+
+def marcador(digest):
+    """Texto que representa a figura nas linhas até ela receber um número."""
+    return f"[imagem {digest.translate(_SEM_DIGITOS)}]"
+
+
+def placeholder(numero):
+    return f"{{image({numero})}}"
+
+
+def _png(pdf, xref):
+    pix = fitz.Pixmap(pdf, xref)
+    if pix.colorspace and pix.colorspace.n > 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    tipo, valor = pdf.xref_get_key(xref, "SMask")
+    if tipo == "xref":
+        pix = fitz.Pixmap(pix, fitz.Pixmap(pdf, int(valor.split()[0])))
+    return pix.tobytes("png")
+
+
+def imagens_da_pagina(pdf, pagina, convertidas):
+    """
+    Lista de (bbox, digest, png) das figuras da página ``pagina`` (objeto
+    fitz). ``convertidas`` (xref -> (digest, png)) evita converter de novo
+    a mesma imagem em outras páginas.
+    """
+    figuras = []
+    for info in pagina.get_image_info(xrefs=True):
+        xref = info.get("xref", 0)
+        if not xref or min(info["width"], info["height"]) < MIN_LADO:
+            continue
+        if xref not in convertidas:
+            try:
+                png = _png(pdf, xref)
+            except (RuntimeError, ValueError):
+                png = None
+            convertidas[xref] = None if png is None else (hashlib.sha1(png).hexdigest(), png)
+        if convertidas[xref] is not None:
+            figuras.append((tuple(info["bbox"]), *convertidas[xref]))
+    return figuras
+
+
+class RegistroImagens:
+    """Numeração e gravação das figuras do banco ``caminho_banco``."""
+
+    def __init__(self, caminho_banco):
+        self.caminho_banco = caminho_banco
+        self.numeros = {}
+        self.gravadas = 0
+        self.inalteradas = 0
+        self.removidas = 0
+
+    def numerar(self, chave, png):
+        numero = self.numeros.get(chave)
+        if numero is None:
+            numero = self.numeros[chave] = len(self.numeros) + 1
+            self._gravar(numero, png)
+        return numero
+
+    def _gravar(self, numero, png):
+        if cache_disco.gravar_se_mudou(caminho_esperado(self.caminho_banco, numero) + ".png", png):
+            self.gravadas += 1
+        else:
+            self.inalteradas += 1
+
+    def podar(self):
+        """Apaga os ``<banco>-<n>.png`` com n acima dos números desta extração."""
+        # Sem número, o caminho esperado é o prefixo "<banco>-"
+        pasta, prefixo = os.path.split(caminho_esperado(self.caminho_banco, ""))
+        padrao = re.compile(re.escape(prefixo) + r'(\d+)\.png')
+        try:
+            nomes = os.listdir(pasta)
+        except OSError:
+            return
+        for nome in nomes:
+            m = padrao.fullmatch(nome)
+            if m and int(m.group(1)) > len(self.numeros):
+                try:
+                    os.remove(os.path.join(pasta, nome))
+                    self.removidas += 1
+                except OSError:
+                    pass
@@ -0,0 +1,45 @@
+"""
+Registro de uma questão, o mesmo do extrator ao placar.
+
+``Questao`` é uma dataclass com ``__slots__``: cerca de um terço da memória
+de um dict com as mesmas chaves e acesso por atributo. Em disco (JSON do
+banco, cache de PDFs, formato compilado) a questão continua sendo um
+objeto JSON com as chaves de sempre; ``de_dict``/``como_dict`` fazem a
+conversão, e ``assunto``/``comentario`` ausentes não viram chave.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Questao:
+    id: int
+    enunciado: str
+    alternativas: tuple
+    gabarito: str
+    assunto: str = None
+    comentario: str = None
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados["id"], dados["enunciado"], tuple(dados["alternativas"]), dados["gabarito"],
+                   dados.get("assunto"), dados.get("comentario"))
+
+    def como_dict(self):
+        dados = {"id": self.id, "enunciado": self.enunciado,
+                 "alternativas": list(self.alternativas), "gabarito": self.gabarito}
+        if self.assunto is not None:
+            dados["assunto"] = self.assunto
+        if self.comentario is not None:
+            dados["comentario"] = self.comentario
+        return dados
+
+
+def questoes_de_json(dados):
+    """Lista de ``Questao`` a partir da lista de objetos de um JSON de banco."""
+    return [Questao.de_dict(q) for q in dados]
+
+
+def questoes_para_json(questoes):
+    """Lista de dicts pronta para ``json.dumps``."""
+    return [q.como_dict() for q in questoes]
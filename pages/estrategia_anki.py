@@ -1,176 +1,81 @@
 import streamlit as st
-import re
 import io
-import fitz
+import os
+import csv
+import zipfile
+import sys
+import hashlib
+from functools import partial
 
-def limpar_rodape_estrategia(texto_completo):
-    """
-    Remove linhas contendo 'www.estrategiaconcursos.com.br',
-    bem como 3 linhas acima e 3 linhas abaixo.
-    """
-    linhas = texto_completo.splitlines()
-    indices_para_remover = set()
-
-    for i, linha in enumerate(linhas):
-        if "www.estrategiaconcursos.com.br" in linha:
-            inicio = max(0, i - 3)
-            fim = min(len(linhas), i + 4)
-            for k in range(inicio, fim):
-                indices_para_remover.add(k)
-    
-    linhas_limpas = [linha for i, linha in enumerate(linhas) if i not in indices_para_remover]
-    return "\n".join(linhas_limpas)
-
-def normalizar_tracos(txt):
-    txt = (
-        txt.replace("–", "-")
-           .replace("—", "-")
-           .replace("-", "-")
-           .replace("‒", "-")
-           .replace("−", "-")
-    )
-    txt = re.sub(r'[\u00A0\u2000-\u200B\u202F\u205F\u3000]', ' ', txt)
-    txt = re.sub(r'\s\s', ' ', txt)
-    txt = re.sub(r'[0-9]{1,4}\.', '.', txt)
-    txt = re.sub(r'\b\d{1,2}\s\d{1,2}\b', '', txt)
-    txt = re.sub(r"==.{6}==", "", txt)
-    return txt
-
-def validar_bloco_questao(texto):
-    """
-    Verifica se o bloco é válido.
-    Exige apenas:
-    1. Presença de 'Comentários'.
-    2. Conteúdo de pergunta antes do comentário (> 30 chars).
-    """
-    match_comentario = re.search(r'Comentários?:', texto, re.IGNORECASE)
-    
-    if match_comentario:
-        conteudo_antes = texto[:match_comentario.start()].strip()
-        # Exige pelo menos 30 caracteres para considerar uma pergunta válida
-        tem_pergunta = len(conteudo_antes) > 30
-        return tem_pergunta
-    
-    return False
-
-def formatar_questao_final(texto_bloco):
-    """
-    Aplica formatações e insere o PIPE.
-    """
-    # 1. REMOVER NUMERAÇÃO INICIAL (Ex: "14. ", "05. ", "1. ")
-    texto_bloco = re.sub(r'^\s*\d{1,3}\.\s+', '', texto_bloco.strip())
-
-    # 2. Inserir <br> antes de alternativas (a), b), c)...)
-    texto_bloco = re.sub(r'\n([a-eA-E]\))', r'<br> \1', texto_bloco)
-
-    # 3. Tratamento de quebras de linha
-    texto_unido = re.sub(r'(?<!\.)\n', ' ', texto_bloco)
-    texto_unido = re.sub(r'\n', ' <br> ', texto_unido)
-    texto_unido = re.sub(r'^<br>', '', texto_unido)
-    texto_unido = re.sub(r'\s+', ' ', texto_unido).strip()
-    texto_unido = re.sub(r'^\.+\s+', '', texto_unido)
-    texto_unido = re.sub(r'([a-z])([A-Z])', r'\1 \2', texto_unido)
-    texto_unido = re.sub(r'([azA-Z][A-Z])([a-z])', r'\1 \2', texto_unido)
-    
-
-    # 4. CORTE COSMÉTICO (Gabarito final)
-    # Tenta cortar se achar "Gabarito: Letra X" ou "Questão Correta" no final da string
-    padrao_corte = (
-        r'\bGabarito\b(?!\s+da)'
-        r'(?=(?:\s*(?:é|:)\s*(?:a\s+)?)?(?:\s*(?:letra|item)?\s*[A-E]\b\.?))'
-        r'(?:\s*(?:é|:)\s*(?:a\s+)?)?(?:\s*(?:letra|item)?\s*[A-E]\b\.?)'
-        r'|Questão\s+(?:correta|certa|incorreta|errada)\.?'
-    )
-
-    match_corte = re.search(padrao_corte, texto_unido, re.IGNORECASE)
-    if match_corte:
-        texto_unido = texto_unido[:match_corte.end()]
-
-    # 5. Inserir o PIPE (|)
-    # Divisor: palavra "Comentários"
-    match_sep = re.search(r'(Comentários?:)', texto_unido, re.IGNORECASE)
-    
-    if match_sep:
-        idx = match_sep.start()
-        parte_pergunta = texto_unido[:idx].strip()
-        parte_resposta = texto_unido[idx:].strip()
-        
-        if parte_pergunta:
-            final = f"{parte_pergunta}|{parte_resposta}"
-        else:
-            final = texto_unido
-    else:
-        final = texto_unido
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import perfil
+import tarefas_pdf
+from transformacoes import estrategia
+from transformacoes.estrategia import extrair_texto, pos_processar_texto
 
-    return final
 
 def processar_texto(texto_bruto):
-    # 1. Normalização e Limpeza de Rodapé
-    texto_limpo = limpar_rodape_estrategia(texto_bruto)
-    texto_limpo = normalizar_tracos(texto_limpo)
-
-    # 2. Pré-tratamento do "Gabarito:"
-    # Padrão: captura "Gabarito:" seguido de até 3 palavras OU até encontrar \n
-    # Grupo 1: "Gabarito:"
-    # Grupo 2: conteúdo até 3 palavras ou quebra de linha
-    padrao_gabarito = r'(Gabarito:\s*)([^\n]*?)(?=\n|(?:\s+\S+){3}\s+)'
-    
-    def adicionar_ponto_gabarito(match):
-        prefixo = match.group(1)  # "Gabarito: "
-        conteudo = match.group(2).strip()  # conteúdo capturado
-        
-        # Pega até 3 palavras do conteúdo
-        palavras = conteudo.split()
-        ate_tres_palavras = ' '.join(palavras[:3])
-        resto = ' '.join(palavras[3:]) if len(palavras) > 3 else ''
-        
-        # Monta o resultado com ponto e quebra de linha
-        resultado = f"{prefixo}{ate_tres_palavras}.\n"
-        if resto:
-            resultado += resto
-        
-        return resultado
-    
-    texto_limpo = re.sub(padrao_gabarito, adicionar_ponto_gabarito, texto_limpo)
-
-    # 3. Aplicação do padrão agressivo
-    padrao_agressivo = r'\.([^.]*?[-/]\s?20[12][0-9])'
-    texto_marcado = re.sub(padrao_agressivo, r'\n;;;\1', texto_limpo)
-
-    # Verifica se o marcador foi inserido (debugging visual)
-    if ";;;" not in texto_marcado:
-        st.error("ERRO CRÍTICO: O padrão de data (ex: '- 2023' ou '/ 2023') não foi encontrado no texto. O PDF pode estar com formatação muito irregular.")
+    """``estrategia.processar_texto``; sem a data que divide as questões, avisa na tela e devolve ""."""
+    try:
+        return estrategia.processar_texto(texto_bruto)
+    except estrategia.SemDivisaoDeQuestoes as e:
+        st.error(str(e))
         return ""
 
-    # 4. DIVISÃO
-    blocos = texto_marcado.split(';;;')
-    
-    questoes_finais = []
-    
-    for bloco in blocos:
-        if not bloco.strip():
-            continue
-            
-        # 4. VALIDAÇÃO (Requer apenas Comentários + Pergunta)
-        if validar_bloco_questao(bloco):
-            questao_formatada = formatar_questao_final(bloco)
-            questoes_finais.append(questao_formatada)
-    
-    return "\n".join(questoes_finais)
-
-def pos_processar_texto(texto):
-    texto = (
-        texto.replace("..",".")
-        .replace("alternativa. <br>", "alternativa")
-        .replace("questão. <br>", "questão")
-    )
-    texto = re.sub(r'(?<=[.;:])\s([a-e]\))', r'<br>\1', texto)
-
-    return texto
+
+def _rotulos_perfil(arquivo_pdf):
+    """(extração, processamento): rótulos das medições deste PDF no ``perfil``."""
+    return f"{arquivo_pdf.name} (extração)", arquivo_pdf.name
+
+
+def _extrair_texto_tarefa(pdf_bytes, digest, inicio, fim, rotulo, tarefa):
+    with perfil.corrida(rotulo):
+        return extrair_texto(pdf_bytes, inicio, fim, progresso=tarefa.atualizar_progresso,
+                             pool=tarefas_pdf.pool(), digest=digest)
+
+
+def _submeter_extracao(arquivo_pdf, pagina_inicial=None, pagina_final=None):
+    """Tarefa (tarefas_pdf) que extrai o texto das páginas pedidas; sem intervalo, o documento inteiro."""
+    # O buffer do próprio upload, sem cópia; a extração lê direto dele.
+    pdf_bytes = arquivo_pdf.getvalue()
+
+    # Se for para pegar tudo
+    if pagina_inicial is None or pagina_final is None:
+        inicio, fim = 0, None
+    else:
+        inicio, fim = pagina_inicial - 1, pagina_final
+
+    # Páginas já lidas deste PDF (por qualquer botão ou intervalo) vêm do cache_paginas
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    chave = f"estrategia-{digest}-{inicio}-{fim}"
+    rotulo = _rotulos_perfil(arquivo_pdf)[0]
+    return tarefas_pdf.submeter(chave, partial(_extrair_texto_tarefa, pdf_bytes, digest, inicio, fim, rotulo))
+
+
+def _processar_pdf_tarefa(pdf_bytes, digest, rotulos, tarefa):
+    """Lote: extrai o PDF inteiro e já o converte em cards, tudo na tarefa."""
+    texto = _extrair_texto_tarefa(pdf_bytes, digest, 0, None, rotulos[0], tarefa)
+    with perfil.corrida(rotulos[1]):
+        # Sem o aviso de processar_texto: SemDivisaoDeQuestoes vira o erro da tarefa
+        return pos_processar_texto(estrategia.processar_texto(texto))
+
+
+def _submeter_lote(arquivo_pdf):
+    """Tarefa (tarefas_pdf) que devolve o deck do PDF inteiro."""
+    pdf_bytes = arquivo_pdf.getvalue()
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    # Chave própria: a da extração (estrategia-...) devolve só o texto
+    chave = f"estrategia-anki-{digest}"
+    rotulos = _rotulos_perfil(arquivo_pdf)
+    return tarefas_pdf.submeter(chave, partial(_processar_pdf_tarefa, pdf_bytes, digest, rotulos))
+
+
 def extrair_texto_pdf(arquivo_pdf, pagina_inicial=None, pagina_final=None):
     # LER O ARQUIVO ENVIADO PELO STREAMLIT
     """
     Extrai o texto de um arquivo PDF a partir de um streamlit UploadedFile.
+    A extração vai para a fila de tarefas_pdf: o mesmo PDF (e intervalo)
+    pedido por várias sessões ao mesmo tempo é processado uma vez só.
 
     Parâmetros:
     arquivo_pdf (UploadedFile): O arquivo PDF a ser lido.
@@ -180,41 +85,113 @@ def extrair_texto_pdf(arquivo_pdf, pagina_inicial=None, pagina_final=None):
     Retorna:
     str: O texto extraído do arquivo PDF.
     """
-    pdf_bytes = arquivo_pdf.read()
-
-    # ABRIR O PDF A PARTIR DO STREAM
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    
-    # Se for para pegar tudo
-    if pagina_inicial is None or pagina_final is None:
-        pagina_inicial = 1
-        pagina_final = len(doc)
+    tarefa = _submeter_extracao(arquivo_pdf, pagina_inicial, pagina_final)
 
-    texto_completo = ""
-    total_paginas = pagina_final - pagina_inicial + 1
     barra_progresso = st.progress(0)
+    try:
+        return tarefa.aguardar(ao_progredir=lambda t: barra_progresso.progress(t.fracao()))
+    finally:
+        barra_progresso.empty()
+
+
+def _nome_deck(nome_pdf, usados):
+    """Nome do deck no ZIP: o do PDF com .txt, numerado se repetir."""
+    base = os.path.splitext(os.path.basename(nome_pdf))[0] or "questoes_anki"
+    nome, n = f"{base}.txt", 1
+    while nome in usados:
+        n += 1
+        nome = f"{base} ({n}).txt"
+    usados.add(nome)
+    return nome
+
+
+def _zip_lote(decks, resumo):
+    """ZIP com um deck por PDF e o resumo.csv com as contagens."""
+    tabela = io.StringIO()
+    escritor = csv.writer(tabela)
+    escritor.writerow(["pdf", "deck", "questoes", "situacao"])
+    escritor.writerows([l["PDF"], l["Deck"], l["Questões"], l["Situação"]] for l in resumo)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for nome, resultado in decks:
+            arquivo_zip.writestr(nome, resultado)
+        arquivo_zip.writestr("resumo.csv", tabela.getvalue())
+    buffer.seek(0)
+    return buffer
+
+
+def processar_lote(arquivos_pdf):
+    """
+    Processa vários PDFs inteiros de uma vez. Cada PDF vira uma tarefa de
+    tarefas_pdf (várias em paralelo, páginas no pool de processos) que extrai
+    o texto e já aplica processar_texto/pos_processar_texto; cada um aparece
+    na tela assim que a tarefa dele termina, na ordem em que terminam. Um PDF
+    sem a data que divide as questões fica com a situação "erro".
+
+    Parâmetros:
+    arquivos_pdf (list[UploadedFile]): Os PDFs enviados.
+
+    Retorna:
+    tuple: (decks, resumo): [(nome do deck, texto)] dos PDFs com questões e
+    uma linha por PDF com o nome do deck, a contagem e a situação.
+    """
+    # Uploads idênticos caem na mesma tarefa: extraídos uma vez, um deck para cada.
+    arquivos_por_tarefa = {}
+    for arquivo in arquivos_pdf:
+        arquivos_por_tarefa.setdefault(_submeter_lote(arquivo), []).append(arquivo)
+    tarefas = list(arquivos_por_tarefa)
 
-    for i, pagina in enumerate(range(pagina_inicial - 1, pagina_final)):
-        texto_pagina = doc[pagina].get_text("text")
-        if texto_pagina:
-            texto_completo += texto_pagina + "\n"
-        
-        barra_progresso.progress((i + 1) / total_paginas)
+    barra_progresso = st.progress(0)
+    andamento = st.empty()
+
+    def progredir(tarefas):
+        concluidas = sum(t.concluida for t in tarefas)
+        barra_progresso.progress(sum(1.0 if t.concluida else t.fracao() for t in tarefas) / len(tarefas))
+        andamento.caption(f"{concluidas} de {len(tarefas)} PDFs processados")
+
+    usados, decks, resumo = set(), [], []
+    for tarefa in tarefas_pdf.conforme_concluem(tarefas, ao_progredir=progredir):
+        arquivos = arquivos_por_tarefa[tarefa]
+        erro = tarefa.erro
+        resultado = tarefa.resultado if erro is None else ""
+        qtd = len(resultado.splitlines()) if resultado.strip() else 0
+
+        for arquivo in arquivos:
+            deck = _nome_deck(arquivo.name, usados) if qtd else ""
+            if erro is not None:
+                situacao = "erro"
+                st.error(f"❌ {arquivo.name}: erro ao processar o arquivo: {erro}")
+            elif qtd <= 1:
+                situacao = "verificar"
+                st.warning(f"⚠️ {arquivo.name}: apenas {qtd} questão foi identificada.")
+            else:
+                situacao = "ok"
+                st.success(f"✅ {arquivo.name}: {qtd} questões extraídas.")
+            if qtd:
+                decks.append((deck, resultado))
+                with st.expander(f"Preview da primeira questão — {deck}"):
+                    st.code(resultado.split("\n")[0], language="text")
+            resumo.append({"PDF": arquivo.name, "Deck": deck, "Questões": qtd, "Situação": situacao})
 
     barra_progresso.empty()
-    return texto_completo
+    andamento.empty()
+    return decks, resumo
 
 
 # --- Interface Streamlit ---
 
 st.set_page_config(page_title="Extrator PDF → Flashcards Anki", layout="wide")
+tarefas_pdf.aquecer()
 
 st.title("📄🦉🟣 Extrator de Questões para Anki")
 st.markdown("""
 Este aplicativo converte PDFs de questões comentadas do Estratégia Concursos em um formato compatível com flashcards do Anki.
 """)
 
-uploaded_file = st.file_uploader("Escolha o arquivo PDF", type="pdf")
+uploaded_files = st.file_uploader("Escolha o(s) arquivo(s) PDF", type="pdf", accept_multiple_files=True) or []
+# Um PDF: intervalo de páginas ou documento inteiro. Vários: lote, cada um inteiro.
+uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
 
 # Campos para intervalo
 pagina_inicial = st.number_input("Página inicial", min_value=1, value=1)
@@ -229,8 +206,9 @@ if uploaded_file is not None:
         with st.spinner('Processando somente o intervalo selecionado...'):
             try:
                 texto_extraido = extrair_texto_pdf(uploaded_file, pagina_inicial, pagina_final)
-                resultado = processar_texto(texto_extraido)
-                resultado = pos_processar_texto(resultado)
+                with perfil.corrida(_rotulos_perfil(uploaded_file)[1]):
+                    resultado = processar_texto(texto_extraido)
+                    resultado = pos_processar_texto(resultado)
                 # --- restante do código permanece igual ---
                 if not resultado.strip():
                     qtd = 0
@@ -269,8 +247,9 @@ if uploaded_file is not None:
         with st.spinner('Processando DOCUMENTO INTEIRO...'):
             try:
                 texto_extraido = extrair_texto_pdf(uploaded_file)  # sem intervalos
-                resultado = processar_texto(texto_extraido)
-                resultado = pos_processar_texto(resultado)
+                with perfil.corrida(_rotulos_perfil(uploaded_file)[1]):
+                    resultado = processar_texto(texto_extraido)
+                    resultado = pos_processar_texto(resultado)
                 # --- restante igual ---
                 if not resultado.strip():
                     qtd = 0
@@ -297,3 +276,28 @@ if uploaded_file is not None:
 
             except Exception as e:
                 st.error(f"Erro ao processar o arquivo: {e}")
+
+    perfil.painel(*_rotulos_perfil(uploaded_file))
+
+if len(uploaded_files) > 1:
+    st.info(f"{len(uploaded_files)} PDFs: \"Processar TUDO\" converte cada um inteiro em um deck e junta tudo num ZIP.")
+
+    if processar_tudo:
+        with st.spinner(f'Processando {len(uploaded_files)} PDFs...'):
+            decks, resumo = processar_lote(uploaded_files)
+
+        total = sum(linha["Questões"] for linha in resumo)
+        st.subheader("Resumo")
+        st.dataframe(resumo, hide_index=True, use_container_width=True)
+        if decks:
+            st.success(f"📦 {total} questões em {len(decks)} decks.")
+            st.download_button(
+                label="📥 Baixar ZIP para Anki",
+                data=_zip_lote(decks, resumo),
+                file_name="questoes_anki.zip",
+                mime="application/zip"
+            )
+        else:
+            st.warning("Nenhuma questão foi identificada nos PDFs enviados.")
+
+    perfil.painel(*(rotulo for arquivo in uploaded_files for rotulo in _rotulos_perfil(arquivo)))
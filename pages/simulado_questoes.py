@@ -3,26 +3,38 @@ import os
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tarefas_pdf
 from simulado.ui import aplicar_estilos
-from simulado.carregamento import secao_carregamento, processar_arquivo
+from simulado.carregamento import secao_carregamento, processar_arquivo, acompanhar_processamento
 from simulado.resultado import tela_resultado
 from simulado.questao import secao_questao
+from simulado.placar import placar_atual
+from simulado.progressivo import processando
 
 st.set_page_config(page_title="Simulado de Questões", layout="centered")
 aplicar_estilos()
+tarefas_pdf.aquecer()
 st.title("📝 Simulado de Questões")
 
 uploaded_file, arquivo_local_selecionado = secao_carregamento()
 processar_arquivo(uploaded_file, arquivo_local_selecionado)
+acompanhar_processamento()
 
 if "questoes" not in st.session_state:
     st.info("Envie um PDF ou selecione um arquivo do servidor para começar.")
     st.stop()
 
 questoes = st.session_state.questoes
-total = len(questoes)
+try:
+    total = len(questoes)
+except LookupError as e:
+    del st.session_state.questoes
+    st.warning(str(e))
+    st.stop()
 
 if total == 0:
+    if processando(questoes):
+        st.stop()
     st.warning("Nenhuma questão encontrada no arquivo.")
     st.stop()
 
@@ -32,11 +44,8 @@ if st.session_state.idx >= total:
 if st.session_state.finalizado:
     tela_resultado(questoes)
 
-acertos = sum(
-    1 for qid, resp in st.session_state.respostas.items()
-    if any(q["alternativas"][ord(resp) - ord('A')] == q["gabarito"] for q in questoes if q["id"] == qid)
-)
-erros = len(st.session_state.respostas) - acertos
+placar = placar_atual(questoes)
+acertos, erros = placar["acertos"], placar["erros"]
 
 col_ac, col_er, col_tot = st.columns(3)
 col_ac.metric("✅ Acertos", acertos)
@@ -1,81 +1,9 @@
 import streamlit as st
-import re
+import os
+import sys
 
-
-def tratar_texto(texto, cebraspe_option=False):
-    # Limpezas iniciais
-    texto = re.sub(r'(.*?)Assuntos\)', '', texto, flags=re.DOTALL)
-    texto = re.sub(r'^www\..*\n?', '', texto, flags=re.MULTILINE)
-
-    # Padroniza gabarito
-    texto = texto.replace('Gabarito:', '|Gabarito')
-
-    if not cebraspe_option:
-        linhas = texto.splitlines()
-        novas_linhas = []
-
-        for i, linha in enumerate(linhas):
-            match_gab = re.search(r'\|Gabarito\s*([A-E])', linha)
-            if match_gab:
-                letra = match_gab.group(1).lower()
-
-                alternativa = None
-                # procura a alternativa acima
-                for j in range(i - 1, -1, -1):
-                    m_alt = re.match(rf'{letra}\)\s*(.*)', linhas[j], re.IGNORECASE)
-                    if m_alt:
-                        alternativa = m_alt.group(1).strip()
-                        break
-
-                if alternativa:
-                    novas_linhas.append(f"| {alternativa}")
-                else:
-                    novas_linhas.append(linha)
-            else:
-                novas_linhas.append(linha)
-
-        texto = "\n".join(novas_linhas)
-
-    texto = texto.replace('\n', '<br>')
-
-    # Outras limpezas já existentes
-    texto = re.sub(r'<br>[0-9]{1,4}\)', '\n', texto)
-    texto = texto.replace('<br>\n <br>', '\n')
-    texto = texto.replace('\n <br>', '\n')
-    texto = texto.replace('<br><br>', '<br>')
-    texto = re.sub(r'<br>.<br>', '<br>', texto)
-    texto = texto.replace('<br><br>', '<br>')
-    texto = texto.replace('<br>| ', '|')
-    texto = re.sub(r'^\n', '', texto)
-    texto = re.sub(r'.*Caderno de Questões.*\n', '', texto)
-
-    return texto
-
-
-# ➕ CEBRASPE (INALTERADO)
-def tratar_cebraspe(texto):
-    cards = re.split(r'(?=\n)', texto)
-
-    novos_cards = []
-    for card in cards:
-        c = card.strip()
-        if not c:
-            continue
-
-        match = re.search(r'\.<br>', c)
-        if match:
-            c = c[match.end():].lstrip()
-
-        c = re.sub(r'Certo<br>Errado<br>', '', c)
-        c = re.sub(r'Certo<br>Errado', '', c)
-        c = re.sub(r'Certo Errado', '', c)
-        c = re.sub(r'<br>\|', '|', c)
-        c = re.sub(r'^<br>', '', c)
-        c = re.sub(r'Gabarito ', '', c)
-
-        novos_cards.append(c)
-
-    return "\n".join(novos_cards)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transformacoes.transformador_tec import transformar
 
 
 def main():
@@ -109,10 +37,7 @@ def main():
 
         if st.button("🔄 Processar Texto", type="primary", use_container_width=True):
             if texto_entrada.strip():
-                texto_processado = tratar_texto(texto_entrada, cebraspe_option)
-
-                if cebraspe_option:
-                    texto_processado = tratar_cebraspe(texto_processado)
+                texto_processado = transformar(texto_entrada, cebraspe_option)
 
                 st.session_state['texto_processado'] = texto_processado
                 st.session_state['processado'] = True
@@ -1,29 +1,15 @@
 import streamlit as st
-import re
+import os
+import sys
 import streamlit.components.v1 as components
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transformacoes.texto import tratar_questao, tratar_texto
+
 st.title("Tratador de Quebras de Linha (PDF)")
 
 texto = st.text_area("Cole o texto aqui:", height=300)
 
-def tratar_texto(t):
-    # Remove quebras de linha que NÃO venham depois de um ponto
-    t = re.sub(r'(?<!\.)\n', ' ', t)
-
-    # Remover tempos do tipo 1m, 25m, 30m etc.
-    t = re.sub(r'\b\d{1,2}m\b', '', t)
-
-    # Remover o link (com possível número na frente)
-    t = re.sub(r'www\.grancursosonline\.com\.br\s*\d*', '', t)
-
-    # Remover mensagem de erro completa
-    t = re.sub(r'Viu algum erro neste material\? Contate-nos em: degravacoes@grancursosonline\.com\.br', '', t, flags=re.IGNORECASE)
-
-    # Remover múltiplos espaços gerados após substituições
-    t = re.sub(r'\s{2,}', ' ', t)
-
-    return t.strip()
-
 if "saida" not in st.session_state:
     st.session_state.saida = ""
 
@@ -35,10 +21,7 @@ with col1:
 
 with col2:
     if st.button("Tratar questão"):
-        texto = re.sub(r'([A-E])\n', r'(\1) ', texto)
-        texto = re.sub(r'\n\n', '\n', texto)
-        texto = re.sub(r'\n\n', '\n', texto)
-        st.session_state.saida = texto
+        st.session_state.saida = tratar_questao(texto)
 
 if st.session_state.saida:
     st.text_area("Texto tratado:", st.session_state.saida, height=300)
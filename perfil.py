@@ -0,0 +1,262 @@
+"""
+Medição opcional de cada etapa da extração: tempo de parede, tempo de CPU
+e memória alocada (tracemalloc).
+
+Desligada por padrão: ``etapa()`` devolve um contexto vazio e
+``medir_fluxo()`` devolve o próprio iterável, então o custo é um ``if``.
+Liga com ``PERFIL_EXTRACAO=1`` no ambiente ou com ``ativar()`` (o
+tracemalloc deixa as alocações bem mais lentas enquanto mede).
+
+Etapas aninhadas são comuns — o pipeline é uma corrente de geradores — e
+cada medição guarda o tempo total (``parede_ms``) e o próprio, sem o das
+etapas de dentro (``proprio_ms``, ``cpu_ms``): os tempos próprios somam o
+total da corrida. Uma etapa em fluxo (``medir_fluxo``) só conta o tempo
+gasto dentro dela a cada item, não o de quem a consome. Páginas extraídas
+no pool de processos aparecem como o tempo de espera por elas.
+
+Dentro de ``corrida(rotulo)`` as medições são somadas por etapa e, no fim,
+viram uma linha JSON por etapa em ``ARQUIVO_LOG``; as últimas
+``MAX_MEMORIA`` ficam em memória para ``painel``. Fora de uma corrida,
+cada medição vira uma linha. O tracemalloc é um só por processo: com
+várias tarefas ao mesmo tempo, a memória é aproximada.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+ARQUIVO_LOG = os.path.join(".cache", "perfil.jsonl")
+MAX_MEMORIA = 2000
+
+_ativo = os.environ.get("PERFIL_EXTRACAO") == "1"
+_trava = threading.Lock()
+_local = threading.local()
+_recentes = deque(maxlen=MAX_MEMORIA)
+_NADA = nullcontext()
+
+
+def ativo():
+    return _ativo
+
+
+def ativar():
+    global _ativo
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _ativo = True
+
+
+def desativar():
+    global _ativo
+    _ativo = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class _Quadro:
+    """Uma medição aberta na pilha da thread."""
+
+    __slots__ = ("nome", "parede0", "cpu0", "memoria0", "pico", "filhos_parede", "filhos_cpu")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.filhos_parede = 0.0
+        self.filhos_cpu = 0.0
+        self.memoria0, pico_anterior = tracemalloc.get_traced_memory()
+        pilha = _pilha()
+        if pilha:
+            # reset_peak apaga o pico do pai; ele fica guardado no quadro dele
+            pilha[-1].pico = max(pilha[-1].pico, pico_anterior)
+        tracemalloc.reset_peak()
+        self.pico = 0
+        pilha.append(self)
+        self.cpu0 = time.thread_time()
+        self.parede0 = time.perf_counter()
+
+    def fechar(self):
+        parede = time.perf_counter() - self.parede0
+        cpu = time.thread_time() - self.cpu0
+        memoria, pico = tracemalloc.get_traced_memory()
+        pico = max(self.pico, pico)
+        pilha = _pilha()
+        # Um gerador abandonado pode ser fechado pelo coletor em outra thread.
+        if pilha and pilha[-1] is self:
+            pilha.pop()
+        elif self in pilha:
+            pilha.remove(self)
+        if pilha:
+            pai = pilha[-1]
+            pai.filhos_parede += parede
+            pai.filhos_cpu += cpu
+            pai.pico = max(pai.pico, pico)
+        return {
+            "parede_ms": parede * 1e3,
+            "proprio_ms": (parede - self.filhos_parede) * 1e3,
+            "cpu_ms": (cpu - self.filhos_cpu) * 1e3,
+            "alocado_bytes": memoria - self.memoria0,
+            "pico_bytes": max(0, pico - self.memoria0),
+        }
+
+
+def _pilha():
+    pilha = getattr(_local, "pilha", None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+
+def _gravar(registros):
+    with _trava:
+        _recentes.extend(registros)
+        try:
+            os.makedirs(os.path.dirname(ARQUIVO_LOG), exist_ok=True)
+            with open(ARQUIVO_LOG, "a", encoding="utf-8") as f:
+                for registro in registros:
+                    f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+def _registrar(nome, medida, chamadas=1):
+    corrida = getattr(_local, "corrida", None)
+    if corrida is None:
+        _gravar([{"ts": time.time(), "rotulo": None, "etapa": nome, "chamadas": chamadas, **medida}])
+        return
+    total = corrida["etapas"].get(nome)
+    if total is None:
+        corrida["etapas"][nome] = {"chamadas": chamadas, **medida}
+        return
+    total["chamadas"] += chamadas
+    for campo in ("parede_ms", "proprio_ms", "cpu_ms", "alocado_bytes"):
+        total[campo] += medida[campo]
+    total["pico_bytes"] = max(total["pico_bytes"], medida["pico_bytes"])
+
+
+@contextmanager
+def _medir(nome):
+    quadro = _Quadro(nome)
+    try:
+        yield
+    finally:
+        _registrar(nome, quadro.fechar())
+
+
+def etapa(nome):
+    """``with etapa("nome"):`` mede o bloco (se a medição estiver ligada)."""
+    return _medir(nome) if _ativo else _NADA
+
+
+def medir_fluxo(nome, iteravel):
+    """Mede o tempo gasto dentro de ``iteravel`` a cada item, somado numa medição só."""
+    if not _ativo:
+        return iteravel
+    return _fluxo(nome, iter(iteravel))
+
+
+def _fluxo(nome, iterador):
+    total = None
+    chamadas = 0
+    try:
+        while True:
+            quadro = _Quadro(nome)
+            try:
+                item = next(iterador)
+            except StopIteration:
+                return
+            finally:
+                medida = quadro.fechar()
+                chamadas += 1
+                if total is None:
+                    total = medida
+                else:
+                    for campo in ("parede_ms", "proprio_ms", "cpu_ms", "alocado_bytes"):
+                        total[campo] += medida[campo]
+                    total["pico_bytes"] = max(total["pico_bytes"], medida["pico_bytes"])
+            yield item
+    finally:
+        if total is not None:
+            _registrar(nome, total, chamadas)
+
+
+def medir(nome):
+    """Decorador: cada chamada da função é uma ``etapa(nome)``."""
+    def decorador(funcao):
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            if not _ativo:
+                return funcao(*args, **kwargs)
+            with _medir(nome):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+
+@contextmanager
+def corrida(rotulo):
+    """Agrupa as medições desta thread sob ``rotulo`` (ex.: a chave do PDF)."""
+    if not _ativo or getattr(_local, "corrida", None) is not None:
+        yield
+        return
+    atual = _local.corrida = {"rotulo": rotulo, "etapas": {}}
+    inicio = time.time()
+    try:
+        with _medir("total"):
+            yield
+    finally:
+        if getattr(_local, "corrida", None) is atual:
+            _local.corrida = None
+        _gravar([{"ts": inicio, "rotulo": rotulo, "etapa": nome, **medida}
+                 for nome, medida in atual["etapas"].items()])
+
+
+def registros(rotulo=None):
+    """Medições em memória (de ``rotulo``, se dado), da mais antiga para a mais nova."""
+    with _trava:
+        return [r for r in _recentes if rotulo is None or r["rotulo"] == rotulo]
+
+
+def resumo(rotulo):
+    """Última medição de cada etapa de ``rotulo``, mais pesada primeiro."""
+    ultimas = {}
+    for registro in registros(rotulo):
+        ultimas[registro["etapa"]] = registro
+    linhas = [
+        {
+            "etapa": nome,
+            "chamadas": r["chamadas"],
+            "parede (ms)": round(r["parede_ms"], 1),
+            "próprio (ms)": round(r["proprio_ms"], 1),
+            "CPU (ms)": round(r["cpu_ms"], 1),
+            "alocado (KB)": round(r["alocado_bytes"] / 1024, 1),
+            "pico (KB)": round(r["pico_bytes"] / 1024, 1),
+        }
+        for nome, r in ultimas.items()
+    ]
+    return sorted(linhas, key=lambda l: (l["etapa"] != "total", -l["próprio (ms)"]))
+
+
+def painel(*rotulos, titulo="⏱️ Perfil por etapa"):
+    """Painel recolhível do Streamlit com o ``resumo`` dos rótulos (só com a medição ligada)."""
+    if not _ativo:
+        return
+    import streamlit as st
+
+    tabelas = [(rotulo, resumo(rotulo)) for rotulo in rotulos]
+    tabelas = [(rotulo, linhas) for rotulo, linhas in tabelas if linhas]
+    if not tabelas:
+        return
+    with st.expander(titulo, expanded=False):
+        for rotulo, linhas in tabelas:
+            if len(tabelas) > 1:
+                st.caption(rotulo)
+            st.dataframe(linhas, hide_index=True, use_container_width=True)
+        st.caption(f"Histórico completo em `{ARQUIVO_LOG}`.")
+
+
+if _ativo:
+    ativar()
@@ -0,0 +1,179 @@
+"""
+Conjuntos de regras (``regras_texto``) das páginas de limpeza e de Anki.
+
+Cada módulo de ``transformacoes`` aplica os seus pelo nome da constante; o
+que não é uma sequência de substituições (divisão em questões, um card por
+alternativa, níveis do edital) fica no próprio módulo. Mudou uma regra,
+sobe a versão do conjunto.
+"""
+
+import re
+
+from regras_texto import ConjuntoRegras, aplicar, cortar_ate_ultimo, remover_linhas_com, substituir, trocar
+
+# --- transformacoes/texto.py ---
+
+# Texto colado, sem páginas: a Gran sai pelo link e pelo aviso, onde estiverem
+# na linha (não pelo detector de boilerplate, que precisa das páginas).
+TRATAR_TEXTO = ConjuntoRegras("tratar_texto.texto", "2", [
+    # Quebras de linha que NÃO venham depois de um ponto
+    substituir(r'(?<!\.)\n', ' '),
+    # Tempos do tipo 1m, 25m, 30m etc.
+    substituir(r'\b\d{1,2}m\b', ''),
+    # O link (com possível número na frente)
+    substituir(r'www\.grancursosonline\.com\.br\s*\d*', ''),
+    # A mensagem de erro completa
+    substituir(r'Viu algum erro neste material\? Contate-nos em: degravacoes@grancursosonline\.com\.br', '',
+               re.IGNORECASE, nome="aviso de erro da Gran"),
+    # Múltiplos espaços gerados após as substituições
+    substituir(r'\s{2,}', ' '),
+    aplicar(str.strip),
+])
+
+TRATAR_QUESTAO = ConjuntoRegras("tratar_texto.questao", "1", [
+    substituir(r'([A-E])\n', r'(\1) '),
+    substituir(r'\n\n', '\n'),
+    substituir(r'\n\n', '\n'),
+])
+
+# --- transformacoes/transformador_tec.py e transformacoes/alternativas_tec.py ---
+
+# Cabeçalho do caderno do TEC até "Assuntos)" e linhas que começam com www.
+_CABECALHO_TEC = [
+    cortar_ate_ultimo('Assuntos)'),
+    substituir(r'^www\..*\n?', '', re.MULTILINE),
+]
+
+TRANSFORMADOR_INICIO = ConjuntoRegras("transformador_anki.inicio", "1", [
+    *_CABECALHO_TEC,
+    # Padroniza gabarito
+    trocar('Gabarito:', '|Gabarito'),
+])
+
+TRANSFORMADOR_FIM = ConjuntoRegras("transformador_anki.fim", "1", [
+    trocar('\n', '<br>'),
+    substituir(r'<br>[0-9]{1,4}\)', '\n'),
+    trocar('<br>\n <br>', '\n'),
+    trocar('\n <br>', '\n'),
+    trocar('<br><br>', '<br>'),
+    substituir(r'<br>.<br>', '<br>'),
+    trocar('<br><br>', '<br>'),
+    trocar('<br>| ', '|'),
+    substituir(r'^\n', ''),
+    remover_linhas_com('Caderno de Questões'),
+])
+
+# Um card Cebraspe, depois de cortado o enunciado até o primeiro ".<br>"
+CEBRASPE_CARD = ConjuntoRegras("transformador_anki.cebraspe", "1", [
+    substituir(r'Certo<br>Errado<br>', ''),
+    substituir(r'Certo<br>Errado', ''),
+    substituir(r'Certo Errado', ''),
+    substituir(r'<br>\|', '|'),
+    substituir(r'^<br>', ''),
+    substituir(r'Gabarito ', ''),
+])
+
+TEC_TODAS_ALTERNATIVAS = ConjuntoRegras("tec_todas_alternativas.texto", "1", [
+    *_CABECALHO_TEC,
+    # Marca o início das questões e os "Certo"/"Errado" sozinhos em linhas
+    # antes de as quebras de linha virarem <br>
+    substituir(r'\n\s*(\d+)\)', r'\n@@Q@@\1)'),
+    substituir(r'\n(Certo)\s*\n', r'\n@@CE@@\1@@CE@@\n'),
+    substituir(r'\n(Errado)\s*\n', r'\n@@CE@@\1@@CE@@\n'),
+    trocar('\n', '<br>'),
+    # Os marcadores voltam a ser quebras reais: cada questão numa linha
+    trocar('@@Q@@', '\n'),
+    trocar('@@CE@@', '\n'),
+    trocar('Gabarito:', '|Gabarito'),
+    trocar('<br>\n <br>', '\n'),
+    trocar('\n <br>', '\n'),
+    trocar('<br><br>', '<br>'),
+    substituir(r'<br>.<br>', '<br>'),
+    trocar('<br><br>', '<br>'),
+    remover_linhas_com('Caderno de Questões'),
+])
+
+# --- transformacoes/edital.py ---
+
+ORGANIZAR_EDITAL = ConjuntoRegras("organizar_edital.texto", "1", [
+    # Quebras de linha entre números de páginas
+    substituir(r'\n[0-9][0-9]\n', ' '),
+    # Exceções entre parênteses
+    substituir(r' \(EXCETO.*\n.*\)', ''),
+    # Quebras de linha que NÃO venham depois de um ponto
+    substituir(r'(?<!\.)\n', ' '),
+    substituir(r'\s{2,}', ' '),
+    aplicar(str.strip),
+])
+
+# --- transformacoes/estrategia.py e transformacoes/estrategia_sem_ano.py ---
+
+ESTRATEGIA_TRACOS = ConjuntoRegras("estrategia.tracos", "1", [
+    trocar("–", "-"),
+    trocar("—", "-"),
+    trocar("‒", "-"),
+    trocar("−", "-"),
+    substituir(r'[\u00A0\u2000-\u200B\u202F\u205F\u3000]', ' '),
+    substituir(r'\s\s', ' '),
+    substituir(r'[0-9]{1,4}\.', '.'),
+    substituir(r'\b\d{1,2}\s\d{1,2}\b', ''),
+    substituir(r"==.{6}==", ""),
+])
+
+
+def _ponto_no_gabarito(match):
+    """Prefixo do gabarito e até 3 palavras, ponto e quebra de linha; o resto vem depois."""
+    palavras = match.group(2).strip().split()
+    resultado = f"{match.group(1)}{' '.join(palavras[:3])}.\n"
+    if len(palavras) > 3:
+        resultado += ' '.join(palavras[3:])
+    return resultado
+
+
+ESTRATEGIA_MARCAR = ConjuntoRegras("estrategia.marcar", "1", [
+    # "Gabarito:" seguido de até 3 palavras OU até encontrar \n
+    substituir(r'(Gabarito:\s*)([^\n]*?)(?=\n|(?:\s+\S+){3}\s+)', _ponto_no_gabarito, nome="gabarito"),
+    # Padrão agressivo: ";;;" antes de cada "(... - 20XX)" precedido de ponto
+    substituir(r'\.([^.]*?[-/]\s?20[12][0-9])', r'\n;;;\1'),
+])
+
+ESTRATEGIA_QUESTAO = ConjuntoRegras("estrategia.questao", "1", [
+    aplicar(str.strip),
+    # Numeração inicial (Ex: "14. ", "05. ", "1. ")
+    substituir(r'^\s*\d{1,3}\.\s+', ''),
+    # <br> antes de alternativas (a), b), c)...)
+    substituir(r'\n([a-eA-E]\))', r'<br> \1'),
+    # Quebras de linha
+    substituir(r'(?<!\.)\n', ' '),
+    substituir(r'\n', ' <br> '),
+    substituir(r'^<br>', ''),
+    substituir(r'\s+', ' '),
+    aplicar(str.strip),
+    substituir(r'^\.+\s+', ''),
+    substituir(r'([a-z])([A-Z])', r'\1 \2'),
+    substituir(r'([azA-Z][A-Z])([a-z])', r'\1 \2'),
+])
+
+ESTRATEGIA_POS = ConjuntoRegras("estrategia.pos", "1", [
+    trocar("..", "."),
+    trocar("alternativa. <br>", "alternativa"),
+    trocar("questão. <br>", "questão"),
+    substituir(r'(?<=[.;:])\s([a-e]\))', r'<br>\1'),
+])
+
+ESTRATEGIA_SEM_ANO_QUESTAO = ConjuntoRegras("estrategia_sem_ano.questao", "1", [
+    aplicar(str.strip),
+    # Numeração puramente numérica do início; fica o (BANCA - ÓRGÃO)
+    substituir(r'^\d+\.\s+', ''),
+    # <br> antes de alternativas
+    substituir(r'\n([a-eA-E]\))', r'<br> \1'),
+    # Quebras de linha excessivas viram espaço
+    substituir(r'\s+', ' '),
+    aplicar(str.strip),
+])
+
+ESTRATEGIA_SEM_ANO_POS = ConjuntoRegras("estrategia_sem_ano.pos", "1", [
+    trocar("..", "."),
+    trocar("alternativa. <br>", "alternativa"),
+    substituir(r'(?<=[.:;])\s([a-e]\))', r'<br>\1'),
+])
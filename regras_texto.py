@@ -0,0 +1,194 @@
+"""
+Motor das transformações de texto das páginas de limpeza e de Anki.
+
+Cada transformação é um ``ConjuntoRegras``: nome, versão e a lista de
+regras, declaradas com ``substituir`` (``re.sub``), ``trocar``
+(``str.replace``) e ``aplicar`` (uma função qualquer, para o que não é
+substituição). O conjunto é compilado uma vez, quando é criado (na
+importação do módulo que o declara):
+
+- cada padrão vira um ``re.Pattern``: nada de consultar o cache do ``re``
+  (nem de recompilar quando ele enche) a cada chamada;
+- uma regex que é só texto literal (``r'<br>\\|'``, ``r'\\n\\n'``), sem flags e
+  com troca sem referências, vira ``str.replace``, bem mais rápido;
+- trocas literais vizinhas viram um passo só (``Passo``).
+
+Duas regexes comuns nas páginas levam tempo quadrático e têm regra própria,
+com o mesmo resultado: ``cortar_ate_ultimo`` (``(.*?)marcador`` com
+DOTALL) e ``remover_linhas_com`` (``.*trecho.*\n``).
+
+Um passo de trocas roda como uma corrente de ``str.replace``, não como uma
+passada única por alternância de regex ou ``str.translate``: no CPython a
+corrente é de 3 a 100 vezes mais rápida, e um ``replace`` que não acha o
+padrão devolve o próprio texto, sem cópia.
+
+A saída é sempre a de aplicar as regras uma a uma, em ordem, como faz
+``aplicar_em_ordem`` (a referência, sem compilar nada). A versão identifica
+a saída: mudou uma regra, muda a versão. Todo conjunto criado fica em
+``CONJUNTOS``, pelo nome; benchmarks/bench_regras.py mede cada passo.
+"""
+
+import re
+from collections import namedtuple
+from functools import partial
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
+# tipo: "regex", "literal" ou "funcao"; numa "funcao", ``padrao`` é a função e
+# ``referencia``, se houver, é a regex equivalente (padrao, troca, flags).
+Regra = namedtuple("Regra", "tipo nome padrao troca flags referencia", defaults=(None,))
+# Uma ou mais regras compiladas numa função texto -> texto.
+Passo = namedtuple("Passo", "nome regras executar")
+
+# nome -> ConjuntoRegras
+CONJUNTOS = {}
+
+
+def substituir(padrao, troca, flags=0, nome=None):
+    """Regra ``re.sub(padrao, troca, texto, flags=flags)``; ``troca`` pode ser uma função."""
+    return Regra("regex", nome or padrao, padrao, troca, flags)
+
+
+def trocar(antigo, novo, nome=None):
+    """Regra ``texto.replace(antigo, novo)``."""
+    return Regra("literal", nome or antigo, antigo, novo, 0)
+
+
+def aplicar(funcao, nome=None):
+    """Regra ``funcao(texto)``."""
+    return Regra("funcao", nome or getattr(funcao, "__name__", repr(funcao)), funcao, None, 0)
+
+
+def cortar_ate_ultimo(marcador, nome=None):
+    """
+    Regra ``re.sub(r'(.*?)marcador', '', texto, flags=re.DOTALL)``: apaga o
+    texto até a última ocorrência de ``marcador``, inclusive. A regex tenta
+    cada posição depois dela e lê até o fim do texto; aqui é um ``rfind``.
+    """
+    def cortar(texto):
+        i = texto.rfind(marcador)
+        return texto if i < 0 else texto[i + len(marcador):]
+    return Regra("funcao", nome or f"até {marcador}", cortar, None, 0,
+                 (r'(.*?)' + re.escape(marcador), '', re.DOTALL))
+
+
+def remover_linhas_com(trecho, nome=None):
+    """
+    Regra ``re.sub(r'.*trecho.*\n', '', texto)``: apaga cada linha que contém
+    ``trecho``, com a quebra (a última linha, sem quebra, fica). A regex lê
+    a linha inteira a partir de cada posição dela.
+    """
+    def remover(texto):
+        if trecho not in texto:
+            return texto
+        linhas = texto.split("\n")
+        ultima = linhas.pop()
+        return "".join(linha + "\n" for linha in linhas if trecho not in linha) + ultima
+    return Regra("funcao", nome or f"linhas com {trecho}", remover, None, 0,
+                 (r'.*' + re.escape(trecho) + r'.*\n', '', 0))
+
+
+def _literal(padrao, flags):
+    """O texto que ``padrao`` casa, se a regex for só texto literal; senão None."""
+    if flags or not padrao:
+        return None
+    try:
+        itens = _sre_parse.parse(padrao)
+    except re.error:
+        return None
+    # (?i), (?x)... no próprio padrão; UNICODE é o padrão de toda str
+    if itens.state.flags & ~re.UNICODE:
+        return None
+    if not all(op is _sre_parse.LITERAL for op, _ in itens):
+        return None
+    return "".join(chr(codigo) for _, codigo in itens)
+
+
+def _como_literal(regra):
+    """A regra regex equivalente a um ``str.replace``, como regra literal; senão a própria."""
+    if not isinstance(regra.troca, str) or "\\" in regra.troca:
+        return regra
+    literal = _literal(regra.padrao, regra.flags)
+    return regra if literal is None else regra._replace(tipo="literal", padrao=literal)
+
+
+def _passo_trocas(regras):
+    pares = tuple((r.padrao, r.troca) for r in regras)
+    if len(pares) == 1:
+        antigo, novo = pares[0]
+
+        def executar(texto):
+            return texto.replace(antigo, novo)
+    else:
+        def executar(texto):
+            for antigo, novo in pares:
+                texto = texto.replace(antigo, novo)
+            return texto
+    return Passo(" + ".join(r.nome for r in regras), regras, executar)
+
+
+def _compilar(regras):
+    passos = []
+    trocas = []
+    for regra in regras:
+        if regra.tipo == "regex":
+            regra = _como_literal(regra)
+        if regra.tipo == "literal":
+            trocas.append(regra)
+            continue
+        if trocas:
+            passos.append(_passo_trocas(tuple(trocas)))
+            trocas = []
+        if regra.tipo == "regex":
+            executar = partial(re.compile(regra.padrao, regra.flags).sub, regra.troca)
+        else:
+            executar = regra.padrao
+        passos.append(Passo(regra.nome, (regra,), executar))
+    if trocas:
+        passos.append(_passo_trocas(tuple(trocas)))
+    return tuple(passos)
+
+
+def aplicar_regra(regra, texto):
+    """Uma regra como seria escrita à mão: ``re.sub`` com o padrão em texto ou ``str.replace``."""
+    if regra.tipo == "regex":
+        return re.sub(regra.padrao, regra.troca, texto, flags=regra.flags)
+    if regra.tipo == "literal":
+        return texto.replace(regra.padrao, regra.troca)
+    if regra.referencia is not None:
+        padrao, troca, flags = regra.referencia
+        return re.sub(padrao, troca, texto, flags=flags)
+    return regra.padrao(texto)
+
+
+class ConjuntoRegras:
+    """Regras aplicadas em ordem; chamar o conjunto com um texto aplica todas."""
+
+    def __init__(self, nome, versao, regras):
+        self.nome = nome
+        self.versao = versao
+        self.regras = tuple(regras)
+        self.passos = _compilar(self.regras)
+        CONJUNTOS[nome] = self
+
+    @property
+    def chave(self):
+        """``nome@versao``, para chaves de cache que dependem da saída."""
+        return f"{self.nome}@{self.versao}"
+
+    def __call__(self, texto):
+        for passo in self.passos:
+            texto = passo.executar(texto)
+        return texto
+
+    def aplicar_em_ordem(self, texto):
+        """Referência: as regras uma a uma, com ``aplicar_regra``."""
+        for regra in self.regras:
+            texto = aplicar_regra(regra, texto)
+        return texto
+
+    def __repr__(self):
+        return f"<ConjuntoRegras {self.chave}: {len(self.regras)} regras, {len(self.passos)} passos>"
@@ -0,0 +1,262 @@
+"""
+Segmentação de questões pelo layout do PDF (PyMuPDF).
+
+Em vez de achatar a página em texto e reconstruir a estrutura com regex,
+percorre uma única vez as linhas de ``page.get_text("dict")`` — cada uma
+com a sua caixa — classificando-as:
+
+- número ("12) ...") no início da linha abre o enunciado;
+- "a)" a "e)" no início da linha, na letra esperada, abre uma alternativa;
+- "Certo" e "Errado" sozinhos na linha são as alternativas de C/E;
+- "Comentário(s)" abre o comentário do professor;
+- "Gabarito: X" fecha a questão.
+
+Como a unidade é a linha do PDF, "a)" ou "3)" no meio de uma frase não
+quebram a questão, e um espaço vertical maior que ``FATOR_PARAGRAFO``
+alturas de linha vira quebra de parágrafo. Cabeçalhos e rodapés saem no
+detector de boilerplate. As questões são as mesmas ``Questao`` de
+``extrator_questoes.armazenar_questoes`` (mais ``comentario``, quando há).
+
+Com um ``imagens_pdf.RegistroImagens``, as figuras embutidas viram linhas
+``{image(n)}`` na posição em que aparecem e são gravadas em ``images/``;
+uma figura repetida em todas as páginas (logotipo) sai como boilerplate.
+
+Comparação com o pipeline de regex: ``benchmarks/bench_segmentacao.py``.
+"""
+
+import re
+from collections import namedtuple
+from functools import partial
+
+import fonte_pdf
+from boilerplate import DetectorBoilerplate
+from extrator_questoes import _iterar_paginas, _contar_paginas, fitz
+from imagens_pdf import imagens_da_pagina, marcador, placeholder
+from modelo_questao import Questao
+
+# Incrementar quando uma mudança alterar as questões geradas (como
+# extrator_questoes.VERSAO_EXTRATOR).
+VERSAO_LAYOUT = "1"
+# Linhas do cabeçalho do caderno, descartadas como no pipeline de regex.
+LINHAS_CABECALHO = 3
+# Espaço vertical (em alturas de linha) que separa parágrafos.
+FATOR_PARAGRAFO = 1.0
+
+# ``imagem`` (PNG) só nas linhas que representam uma figura.
+Linha = namedtuple("Linha", "texto x0 y0 y1 pagina imagem", defaults=(None,))
+
+_ESPACOS = re.compile(r'\s+')
+_NUMERO = re.compile(r'(\d+)\)\s*')
+_ALTERNATIVA = re.compile(r'\$?([a-eA-E])\)\s*')
+_GABARITO = re.compile(r'(?:^|\s)Gabarito:\s*(?:letra\s+)?(Certo|Errado|[A-E])\s*\.?\s*$', re.IGNORECASE)
+_COMENTARIO = re.compile(r'Coment[áa]rios?\b:?\s*', re.IGNORECASE)
+_ESTRUTURAL = re.compile(r'\s*(?:Gabarito:|Coment[áa]rio|\$?[a-eA-E]\)|\d+\)|Certo\s*$|Errado\s*$)', re.IGNORECASE)
+_CERTO_ERRADO = {"certo": "A", "errado": "B"}
+_PLACEHOLDER = re.compile(r'\{image\(\d+\)\}')
+
+
+def _intercalar(linhas, figuras):
+    """
+    Põe cada figura logo depois da linha de texto imediatamente acima dela
+    (a de maior base até o topo da figura), ou no começo da página. A ordem
+    do conteúdo nem sempre é a visual; a posição é que decide.
+    """
+    depois = {}
+    for figura in figuras:
+        acima = [(linha.y1, i) for i, linha in enumerate(linhas) if linha.y1 <= figura.y0 + 1]
+        depois.setdefault(max(acima)[1] if acima else -1, []).append(figura)
+    resultado = depois.get(-1, [])
+    for i, linha in enumerate(linhas):
+        resultado.append(linha)
+        resultado.extend(depois.get(i, ()))
+    return resultado
+
+
+def _linhas_fitz(fonte, inicio, fim, imagens=False):
+    """Backend de páginas: lista de ``Linha`` de cada página, na ordem do conteúdo."""
+    flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+    convertidas = {}
+    with fonte_pdf.abrir_fitz(fonte) as pdf:
+        for i in range(inicio, fim):
+            pagina = pdf[i]
+            linhas = []
+            for bloco in pagina.get_text("dict", flags=flags)["blocks"]:
+                for linha in bloco.get("lines", ()):
+                    texto = _ESPACOS.sub(' ', "".join(s["text"] for s in linha["spans"])).strip()
+                    if texto:
+                        x0, y0, _, y1 = linha["bbox"]
+                        linhas.append(Linha(texto, x0, y0, y1, i))
+            if imagens:
+                figuras = [Linha(marcador(digest), bbox[0], bbox[1], bbox[3], i, png)
+                           for bbox, digest, png in imagens_da_pagina(pdf, pagina, convertidas)]
+                linhas = _intercalar(linhas, figuras)
+            yield linhas
+
+
+def _juntar(linhas):
+    """Texto de um trecho: parágrafo novo vira quebra de linha, o resto vira espaço."""
+    partes = []
+    anterior = None
+    for linha in linhas:
+        if anterior is not None:
+            altura = anterior.y1 - anterior.y0
+            paragrafo = (linha.pagina == anterior.pagina and linha.y0 - anterior.y1 > FATOR_PARAGRAFO * altura
+                         or _PLACEHOLDER.fullmatch(linha.texto) or _PLACEHOLDER.fullmatch(anterior.texto))
+            partes.append('\n' if paragrafo or anterior.texto.endswith(('.', ':', ';')) else ' ')
+        partes.append(linha.texto)
+        anterior = linha
+    return "".join(partes).strip().replace(' .', '.')
+
+
+def _alternativa(linhas):
+    texto = " ".join(l.texto for l in linhas).strip().replace(' .', '.')
+    return texto if texto.endswith(('.', ';')) else texto + '.'
+
+
+class _Questao:
+    """Questão em montagem: as linhas de cada parte, até o gabarito."""
+
+    def __init__(self):
+        self.numero = None
+        self.assunto = ""
+        self.enunciado = []
+        self.alternativas = []
+        self.comentario = []
+        self.estado = "enunciado"
+
+    def fechar(self, letra, com_assunto):
+        if not self.alternativas:
+            return None
+        alternativas = [_alternativa(linhas) for linhas in self.alternativas]
+        letra = _CERTO_ERRADO.get(letra.lower(), letra.upper())
+        indice = ord(letra) - ord('A')
+        return Questao(
+            0,
+            _juntar(self.enunciado),
+            tuple(alternativas),
+            alternativas[indice] if indice < len(alternativas) else letra,
+            self.assunto if com_assunto else None,
+            _juntar(self.comentario) if self.comentario else None,
+        )
+
+
+def segmentar(linhas, com_assunto=False):
+    """Gera as questões (com id) de uma sequência de ``Linha``, numa passada só."""
+    atual = _Questao()
+    ultimo_numero = 0
+    proximo_id = 1
+    for linha in linhas:
+        texto = linha.texto
+
+        gabarito = _GABARITO.search(texto)
+        if gabarito:
+            antes = texto[:gabarito.start()].strip()
+            if antes:
+                _continuar(atual, linha._replace(texto=antes))
+            questao = atual.fechar(gabarito.group(1), com_assunto)
+            if questao is not None:
+                questao.id = proximo_id
+                yield questao
+                proximo_id += 1
+            atual = _Questao()
+            continue
+
+        numero = _NUMERO.match(texto)
+        if numero:
+            n = int(numero.group(1))
+            # Um número só abre questão antes das alternativas (o resto é uma
+            # lista dentro do enunciado) ou, se a anterior ficou sem
+            # gabarito, quando é exatamente o seguinte.
+            if atual.estado == "enunciado" and atual.numero is None and n > ultimo_numero:
+                if com_assunto and atual.enunciado:
+                    atual.assunto = atual.enunciado.pop().texto.rstrip('.')
+                atual.numero = ultimo_numero = n
+                atual.enunciado.append(linha._replace(texto=texto[numero.end():]))
+                continue
+            if atual.estado != "enunciado" and n == ultimo_numero + 1:
+                atual = _Questao()
+                atual.numero = ultimo_numero = n
+                atual.enunciado.append(linha._replace(texto=texto[numero.end():]))
+                continue
+
+        _continuar(atual, linha)
+
+
+def _continuar(atual, linha):
+    texto = linha.texto
+    if atual.estado != "comentario":
+        alternativa = _ALTERNATIVA.match(texto)
+        if alternativa and ord(alternativa.group(1).lower()) - ord('a') == len(atual.alternativas):
+            atual.estado = "alternativas"
+            atual.alternativas.append([linha._replace(texto=texto[alternativa.end():])])
+            return
+        chave = texto.lower()
+        if chave in _CERTO_ERRADO and "ABCDE".index(_CERTO_ERRADO[chave]) == len(atual.alternativas):
+            atual.estado = "alternativas"
+            atual.alternativas.append([linha])
+            return
+
+    comentario = _COMENTARIO.match(texto)
+    if comentario and atual.estado != "comentario":
+        atual.estado = "comentario"
+        resto = texto[comentario.end():]
+        if resto:
+            atual.comentario.append(linha._replace(texto=resto))
+        return
+
+    if atual.estado == "alternativas":
+        atual.alternativas[-1].append(linha)
+    elif atual.estado == "comentario":
+        atual.comentario.append(linha)
+    else:
+        atual.enunciado.append(linha)
+
+
+def linhas_pdf(fonte, editora="tec", workers=None, pool=None, progresso=None, imagens=False):
+    """
+    ``Linha`` de todo o documento, sem cabeçalho do caderno, cabeçalhos e
+    rodapés. Com ``imagens``, as figuras vêm como linhas com ``imagem``.
+    """
+    fonte = fonte_pdf.em_memoria(fonte)
+    total = _contar_paginas(fonte)
+    detector = DetectorBoilerplate(editora, preservar=_ESTRUTURAL.match)
+    backend = partial(_linhas_fitz, imagens=True) if imagens else _linhas_fitz
+    paginas = _iterar_paginas(backend, fonte, workers, total=total, pool=pool)
+    descartar = LINHAS_CABECALHO
+    for n, pagina in enumerate(detector.filtrar(paginas, texto=lambda l: l.texto), 1):
+        if progresso:
+            progresso(n, total)
+        for linha in pagina:
+            if descartar:
+                descartar -= linha.imagem is None
+                continue
+            yield linha
+
+
+def _com_placeholders(linhas, registro):
+    for linha in linhas:
+        if linha.imagem is None:
+            yield linha
+        else:
+            numero = registro.numerar(linha.texto, linha.imagem)
+            yield linha._replace(texto=placeholder(numero), imagem=None)
+
+
+def processar_pdf_layout_em_fluxo(pdf_path, com_assunto=False, workers=None, progresso=None, pool=None,
+                                  imagens=None):
+    """
+    Gera as questões à medida que as páginas são lidas. Com ``imagens`` (um
+    ``imagens_pdf.RegistroImagens``), as figuras são gravadas em ``images/``
+    e o texto recebe os ``{image(n)}``.
+    """
+    if fitz is None:
+        raise RuntimeError("PyMuPDF (fitz) é necessário para a segmentação por layout.")
+    linhas = linhas_pdf(pdf_path, workers=workers, pool=pool, progresso=progresso, imagens=imagens is not None)
+    if imagens is not None:
+        linhas = _com_placeholders(linhas, imagens)
+    return segmentar(linhas, com_assunto)
+
+
+def processar_pdf_layout(pdf_path, com_assunto=False, workers=None, imagens=None):
+    """Mesmo formato de ``extrator_questoes.processar_pdf``, pelo layout."""
+    return list(processar_pdf_layout_em_fluxo(pdf_path, com_assunto, workers, imagens=imagens))
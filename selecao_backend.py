@@ -0,0 +1,197 @@
+"""
+Escolha do backend de texto (pdfplumber ou fitz) para cada documento.
+
+O pdfplumber costuma dar o texto mais fiel e o fitz costuma ser dezenas de
+vezes mais rápido. Para um modelo de PDF ainda não visto, ``escolher`` lê
+``AMOSTRA_PAGINAS`` páginas espalhadas com cada backend e compara, por
+backend, o tempo e os sinais de qualidade do texto (``sinais``): linhas de
+gabarito, de alternativa e de número de questão, e caracteres não brancos.
+Vence o mais rápido que não perde nenhum marcador em relação ao melhor
+e tem pelo menos ``FRACAO_CARACTERES`` dos caracteres.
+
+O modelo (``modelo``) é a editora mais o produtor, o criador e o tamanho da
+página do PDF: cadernos gerados pelo mesmo sistema caem no mesmo modelo.
+A escolha de cada modelo fica em ``ARQUIVO_ESCOLHAS`` e vale para os
+próximos documentos (apagar o arquivo refaz as amostras). PDFs sem
+produtor nem criador não têm modelo: a escolha fica lembrada pelo hash do
+conteúdo (``chave``), só para o mesmo arquivo, e só as
+``LIMITE_POR_CONTEUDO`` mais recentes. Cada decisão — por amostra,
+lembrada ou forçada — vira uma linha em ``ARQUIVO_DECISOES``, que passa
+para ``.1`` (substituindo o anterior) ao chegar a ``LIMITE_DECISOES``
+bytes.
+
+``backend="fitz"`` (ou ``EXTRATOR_BACKEND=fitz`` no ambiente) força um
+backend e dispensa a amostra.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import fonte_pdf
+from simulado import cache_disco
+
+ARQUIVO_ESCOLHAS = os.path.join(".cache", "backends.json")
+ARQUIVO_DECISOES = os.path.join(".cache", "backends.jsonl")
+LIMITE_DECISOES = 1024 * 1024
+LIMITE_POR_CONTEUDO = 500
+AMOSTRA_PAGINAS = 4
+FRACAO_CARACTERES = 0.9
+# "auto" ou o nome de um backend; vale quando a chamada não diz qual.
+BACKEND_PADRAO = os.environ.get("EXTRATOR_BACKEND", "auto")
+
+_MARCADORES = {
+    "gabaritos": re.compile(r'^\s*Gabarito:', re.MULTILINE | re.IGNORECASE),
+    "alternativas": re.compile(r'^\s*\$?[a-eA-E]\)', re.MULTILINE),
+    "numeros": re.compile(r'^\s*\d+\)', re.MULTILINE),
+}
+_BRANCOS = re.compile(r'\s+')
+
+_trava = threading.Lock()
+_escolhas = None
+
+
+def sinais(texto):
+    """Contagem dos marcadores de questão e dos caracteres não brancos de ``texto``."""
+    contagem = {nome: len(padrao.findall(texto)) for nome, padrao in _MARCADORES.items()}
+    contagem["caracteres"] = len(_BRANCOS.sub('', texto))
+    return contagem
+
+
+def modelo(fonte, editora):
+    """
+    Chave do modelo do PDF: editora, produtor, criador e tamanho da primeira
+    página. None quando o PDF não diz quem o gerou (``chave`` usa o conteúdo).
+    """
+    try:
+        with fonte_pdf.abrir_fitz(fonte) as pdf:
+            meta = pdf.metadata or {}
+            largura, altura = (pdf[0].rect.width, pdf[0].rect.height) if pdf.page_count else (0, 0)
+    except Exception:
+        return None
+    produtor, criador = meta.get("producer") or "", meta.get("creator") or ""
+    if not produtor and not criador:
+        return None
+    return f"{editora}|{produtor}|{criador}|{largura:.0f}x{altura:.0f}"
+
+
+def chave(fonte, editora):
+    """``modelo`` ou, sem ele, o hash do conteúdo (``editora|sha256:...``)."""
+    chave_modelo = modelo(fonte, editora)
+    if chave_modelo:
+        return chave_modelo
+    try:
+        return f"{editora}|sha256:{fonte_pdf.digest(fonte)}"
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _paginas_amostra(total):
+    if total <= AMOSTRA_PAGINAS:
+        return list(range(total))
+    return sorted({int((i + 0.5) * total / AMOSTRA_PAGINAS) for i in range(AMOSTRA_PAGINAS)})
+
+
+def _amostrar(backends, fonte, paginas):
+    """Roda (no pool, se houver): tempo e sinais de cada backend nas ``paginas``."""
+    medidas = {}
+    for nome, backend in backends:
+        inicio = time.perf_counter()
+        try:
+            texto = "\n".join(t for p in paginas for t in backend(fonte, p, p + 1))
+        except Exception as e:
+            medidas[nome] = {"erro": str(e) or type(e).__name__}
+            continue
+        medidas[nome] = {"segundos": time.perf_counter() - inicio, **sinais(texto)}
+    return medidas
+
+
+def _decidir(medidas):
+    """Backend mais rápido entre os que não perdem qualidade, ou None."""
+    validas = {nome: m for nome, m in medidas.items() if "erro" not in m}
+    if not validas:
+        return None
+    melhor = {campo: max(m[campo] for m in validas.values()) for campo in (*_MARCADORES, "caracteres")}
+    if not melhor["caracteres"]:
+        return None
+    aceitos = [
+        nome for nome, m in validas.items()
+        if all(m[campo] >= melhor[campo] for campo in _MARCADORES)
+        and m["caracteres"] >= FRACAO_CARACTERES * melhor["caracteres"]
+    ]
+    return min(aceitos, key=lambda nome: validas[nome]["segundos"]) if aceitos else None
+
+
+def _carregar():
+    global _escolhas
+    if _escolhas is None:
+        try:
+            with open(ARQUIVO_ESCOLHAS, "r", encoding="utf-8") as f:
+                _escolhas = json.load(f)
+        except (OSError, ValueError):
+            _escolhas = {}
+    return _escolhas
+
+
+def _registrar(decisao, lembrar):
+    global _escolhas
+    with _trava:
+        try:
+            os.makedirs(os.path.dirname(ARQUIVO_DECISOES), exist_ok=True)
+            if lembrar:
+                # Relê o arquivo: outros processos (ingestão) podem ter gravado.
+                _escolhas = None
+                escolhas = _carregar()
+                escolhas.pop(decisao["modelo"], None)
+                escolhas[decisao["modelo"]] = decisao["backend"]
+                # Os mais antigos primeiro: a ordem do dict é a da gravação
+                por_conteudo = [c for c in escolhas if "|sha256:" in c]
+                for antiga in por_conteudo[:-LIMITE_POR_CONTEUDO]:
+                    del escolhas[antiga]
+                dados = json.dumps(escolhas, ensure_ascii=False, indent=1).encode("utf-8")
+                cache_disco.gravar_atomico(ARQUIVO_ESCOLHAS, dados)
+            if os.path.exists(ARQUIVO_DECISOES) and os.path.getsize(ARQUIVO_DECISOES) >= LIMITE_DECISOES:
+                os.replace(ARQUIVO_DECISOES, ARQUIVO_DECISOES + ".1")
+            with open(ARQUIVO_DECISOES, "a", encoding="utf-8") as f:
+                f.write(json.dumps(decisao, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+def escolher(fonte, backends, total, editora="tec", backend=None, pool=None):
+    """
+    Ordem em que tentar os ``backends`` (pares (nome, função de páginas))
+    neste documento: o escolhido primeiro, os outros como reserva. Um
+    backend forçado vem sozinho. Com ``pool``, a amostra roda nele.
+    """
+    backend = backend or BACKEND_PADRAO
+    nomes = [nome for nome, _ in backends]
+    decisao = {"ts": time.time(), "fonte": fonte_pdf.nome(fonte), "editora": editora}
+    if backend != "auto":
+        if backend not in nomes:
+            raise ValueError(f"Backend {backend!r} indisponível (disponíveis: {', '.join(nomes)}).")
+        _registrar({**decisao, "modelo": None, "origem": "forçado", "backend": backend}, lembrar=False)
+        return [backend]
+    if len(nomes) == 1:
+        return nomes
+
+    chave_doc = chave(fonte, editora)
+    with _trava:
+        lembrado = _carregar().get(chave_doc) if chave_doc else None
+    if lembrado in nomes:
+        _registrar({**decisao, "modelo": chave_doc, "origem": "memória", "backend": lembrado}, lembrar=False)
+        escolhido = lembrado
+    else:
+        paginas = _paginas_amostra(total)
+        if pool is not None:
+            with fonte_pdf.para_pool(fonte) as compartilhada:
+                medidas = pool.submit(_amostrar, backends, compartilhada, paginas).result()
+        else:
+            medidas = _amostrar(backends, fonte, paginas)
+        escolhido = _decidir(medidas)
+        _registrar({**decisao, "modelo": chave_doc, "origem": "amostra", "backend": escolhido,
+                    "paginas": paginas, "medidas": medidas}, lembrar=bool(chave_doc and escolhido))
+        escolhido = escolhido or nomes[0]
+    return [escolhido] + [nome for nome in nomes if nome != escolhido]
@@ -0,0 +1,247 @@
+"""
+Formato compilado (``.qbc``) dos bancos de ``questoes_filtradas``.
+
+Layout do arquivo::
+
+    b"QBC" + versão (1 byte)
+    uint32  tamanho do bloco de metadados  | metadados (JSON utf-8)
+    uint32  tamanho do dicionário zlib     | dicionário
+    uint64 * (total + 1)                   | tabela de offsets
+    questões, cada uma um JSON compacto comprimido com zlib + dicionário
+
+A tabela de offsets permite decodificar só a questão ``i``; o dicionário
+compartilhado recupera a compressão que se perderia comprimindo cada
+questão isoladamente. Os metadados trazem também o gabarito indexado
+(ids e letras corretas), para pontuar sem decodificar questão alguma.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from array import array
+
+from modelo_questao import Questao, questoes_de_json
+from simulado import cache_disco
+from simulado.catalogo import PASTA_RAIZ
+
+PASTA_COMPILADOS = os.path.join(".cache", "bancos")
+VERSAO_FORMATO = 2
+MAGICO = b"QBC" + bytes([VERSAO_FORMATO])
+TAMANHO_DICIONARIO = 32 * 1024
+
+
+LETRAS = "ABCDE"
+
+
+def indexar_gabarito(questoes):
+    """
+    Retorna (ids, corretas): ``corretas[i]`` são as letras cujas alternativas
+    têm o texto do gabarito da questão ``i`` (normalmente uma só).
+    """
+    ids, corretas = [], []
+    for q in questoes:
+        ids.append(q.id)
+        corretas.append("".join(
+            LETRAS[j] for j, alt in enumerate(q.alternativas[:len(LETRAS)]) if alt == q.gabarito
+        ))
+    return ids, corretas
+
+
+def _posicoes(ids):
+    posicoes = {}
+    for i, qid in enumerate(ids):
+        posicoes.setdefault(qid, i)
+    return posicoes
+
+
+class Banco:
+    """Sequência somente leitura de ``Questao``, com o gabarito já indexado."""
+
+    ids = ()
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __getitem__(self, i):
+        raise NotImplementedError
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def posicao(self, qid):
+        return self._posicoes[qid]
+
+    def letras_corretas(self, i):
+        return self._corretas[i]
+
+    def letra_gabarito(self, i):
+        return self.letras_corretas(i)[:1] or None
+
+    def acertou(self, qid, letra):
+        return bool(letra) and letra in self.letras_corretas(self.posicao(qid))
+
+
+class BancoLista(Banco):
+    def __init__(self, questoes):
+        self._questoes = questoes
+        self.ids, self._corretas = indexar_gabarito(questoes)
+        self._posicoes = _posicoes(self.ids)
+
+    def __len__(self):
+        return len(self._questoes)
+
+    def __getitem__(self, i):
+        return self._questoes[i]
+
+
+class BancoCompilado(Banco):
+    def __init__(self, dados):
+        dados = memoryview(dados)
+        if dados[:4] != MAGICO:
+            raise ValueError("Arquivo compilado inválido ou de outra versão.")
+        pos = 4
+        (tam_meta,) = struct.unpack_from("<I", dados, pos)
+        pos += 4
+        self.meta = json.loads(bytes(dados[pos:pos + tam_meta]).decode("utf-8"))
+        self.ids = self.meta.pop("ids")
+        self._corretas = self.meta.pop("corretas")
+        self._posicoes = _posicoes(self.ids)
+        pos += tam_meta
+        (tam_dic,) = struct.unpack_from("<I", dados, pos)
+        pos += 4
+        self._dicionario = bytes(dados[pos:pos + tam_dic])
+        pos += tam_dic
+        total = self.meta["total"]
+        self._offsets = array("Q")
+        self._offsets.frombytes(dados[pos:pos + 8 * (total + 1)])
+        pos += 8 * (total + 1)
+        self._dados = dados[pos:]
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        inicio, fim = self._offsets[i], self._offsets[i + 1]
+        dec = zlib.decompressobj(zdict=self._dicionario) if self._dicionario else zlib.decompressobj()
+        return Questao.de_dict(json.loads(dec.decompress(self._dados[inicio:fim])))
+
+    @property
+    def tamanho_bytes(self):
+        return len(self._dados) + len(self._dicionario) + self._offsets.itemsize * len(self._offsets)
+
+
+def caminho_compilado(caminho_json):
+    caminho_abs = os.path.abspath(caminho_json)
+    digest = hashlib.sha1(caminho_abs.encode("utf-8")).hexdigest()[:16]
+    nome = os.path.splitext(os.path.basename(caminho_json))[0]
+    return os.path.join(PASTA_COMPILADOS, f"{digest}-{nome}.qbc")
+
+
+def _montar_dicionario(blobs):
+    """Amostra do começo das questões; o zlib dá preferência ao fim do dicionário."""
+    amostra = bytearray()
+    for blob in blobs:
+        amostra += blob
+        if len(amostra) >= TAMANHO_DICIONARIO:
+            break
+    return bytes(amostra[:TAMANHO_DICIONARIO])
+
+
+def serializar(questoes, origem_mtime_ns=0, origem_tamanho=0):
+    blobs = [json.dumps(q.como_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8") for q in questoes]
+    dicionario = _montar_dicionario(blobs)
+
+    offsets = array("Q", [0])
+    partes = []
+    for blob in blobs:
+        comp = zlib.compressobj(9, zdict=dicionario) if dicionario else zlib.compressobj(9)
+        dado = comp.compress(blob) + comp.flush()
+        partes.append(dado)
+        offsets.append(offsets[-1] + len(dado))
+
+    ids, corretas = indexar_gabarito(questoes)
+    meta = json.dumps({
+        "total": len(blobs),
+        "ids": ids,
+        "corretas": corretas,
+        "origem_mtime_ns": origem_mtime_ns,
+        "origem_tamanho": origem_tamanho,
+    }).encode("utf-8")
+    return b"".join([
+        MAGICO,
+        struct.pack("<I", len(meta)), meta,
+        struct.pack("<I", len(dicionario)), dicionario,
+        offsets.tobytes(),
+        *partes,
+    ])
+
+
+def compilar(caminho_json, destino=None):
+    """Compila ``caminho_json`` e retorna o caminho do artefato gerado."""
+    st = os.stat(caminho_json)
+    with open(caminho_json, "r", encoding="utf-8") as f:
+        questoes = questoes_de_json(json.load(f))
+    destino = destino or caminho_compilado(caminho_json)
+    cache_disco.gravar_atomico(destino, serializar(questoes, st.st_mtime_ns, st.st_size))
+    return destino
+
+
+def abrir_banco(caminho_json, compilar_se_velho=True):
+    """
+    Abre o banco pelo artefato compilado quando ele corresponde ao JSON atual
+    (mesmo mtime e tamanho); caso contrário lê o JSON e, por padrão,
+    regrava o artefato para os próximos carregamentos.
+    Sem ``compilar_se_velho`` o retorno é um ``BancoLista`` com o JSON.
+    """
+    st = os.stat(caminho_json)
+    destino = caminho_compilado(caminho_json)
+    try:
+        with open(destino, "rb") as f:
+            banco = BancoCompilado(f.read())
+        if (banco.meta.get("origem_mtime_ns") == st.st_mtime_ns
+                and banco.meta.get("origem_tamanho") == st.st_size):
+            return banco
+    except (OSError, ValueError, KeyError, struct.error):
+        pass
+
+    with open(caminho_json, "r", encoding="utf-8") as f:
+        questoes = questoes_de_json(json.load(f))
+    if not compilar_se_velho:
+        return BancoLista(questoes)
+    dados = serializar(questoes, st.st_mtime_ns, st.st_size)
+    try:
+        cache_disco.gravar_atomico(destino, dados)
+    except OSError:
+        pass
+    return BancoCompilado(dados)
+
+
+def compilar_todos(raiz=PASTA_RAIZ):
+    gerados = []
+    for pasta, _, nomes in os.walk(raiz):
+        for nome in sorted(nomes):
+            if nome.endswith(".json"):
+                caminho = os.path.join(pasta, nome)
+                destino = compilar(caminho)
+                gerados.append((caminho, os.path.getsize(caminho), os.path.getsize(destino)))
+    return gerados
+
+
+if __name__ == "__main__":
+    import sys
+
+    raiz = sys.argv[1] if len(sys.argv) > 1 else PASTA_RAIZ
+    total_json = total_qbc = 0
+    for caminho, tam_json, tam_qbc in compilar_todos(raiz):
+        total_json += tam_json
+        total_qbc += tam_qbc
+        print(f"{tam_json:>9} -> {tam_qbc:>8}  {caminho}")
+    if total_json:
+        print(f"Total: {total_json} -> {total_qbc} bytes ({total_qbc / total_json:.0%}).")
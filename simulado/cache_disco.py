@@ -0,0 +1,57 @@
+import os
+import threading
+
+_trava = threading.Lock()
+
+
+def gravar_atomico(caminho, dados):
+    """Grava ``dados`` (bytes) num temporário e troca de uma vez: leitores nunca veem meio arquivo."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dados)
+    os.replace(tmp, caminho)
+
+
+def gravar_se_mudou(caminho, dados):
+    """Como ``gravar_atomico``, mas não regrava um arquivo igual; diz se gravou."""
+    try:
+        if os.path.getsize(caminho) == len(dados):
+            with open(caminho, "rb") as f:
+                if f.read() == dados:
+                    return False
+    except OSError:
+        pass
+    gravar_atomico(caminho, dados)
+    return True
+
+
+def tocar(caminho):
+    """Marca o arquivo como usado agora (ordem do LRU é o mtime)."""
+    try:
+        os.utime(caminho)
+    except OSError:
+        pass
+
+
+def podar(pasta, limite, sufixo):
+    """Remove os arquivos ``*sufixo`` usados há mais tempo até o total caber em ``limite`` bytes."""
+    with _trava:
+        try:
+            itens = []
+            with os.scandir(pasta) as it:
+                for item in it:
+                    if item.name.endswith(sufixo) and item.is_file():
+                        st = item.stat()
+                        itens.append((st.st_mtime_ns, st.st_size, item.path))
+        except OSError:
+            return
+        total = sum(tamanho for _, tamanho, _ in itens)
+        for _, tamanho, caminho in sorted(itens):
+            if total <= limite:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+
+from extrator_questoes import VERSAO_EXTRATOR
+from modelo_questao import questoes_de_json, questoes_para_json
+from simulado import cache_disco
+
+PASTA_CACHE = os.path.join(".cache", "pdf_questoes")
+LIMITE_BYTES = 256 * 1024 * 1024
+
+# (caminho, mtime_ns, tamanho) -> sha256, para não reler PDFs do servidor a cada sessão
+_hash_por_arquivo = {}
+
+
+def hash_bytes(dados):
+    return hashlib.sha256(dados).hexdigest()
+
+
+def hash_arquivo(caminho):
+    st = os.stat(caminho)
+    chave = (caminho, st.st_mtime_ns, st.st_size)
+    digest = _hash_por_arquivo.get(chave)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(bloco)
+        digest = h.hexdigest()
+        _hash_por_arquivo[chave] = digest
+    return digest
+
+
+def chave_resultado(digest_pdf, com_assunto=False):
+    """Chave do resultado: conteúdo do PDF + opções + versão do extrator."""
+    return f"{digest_pdf}-{int(bool(com_assunto))}-v{VERSAO_EXTRATOR}"
+
+
+def _caminho(chave):
+    return os.path.join(PASTA_CACHE, f"{chave}.json")
+
+
+def disponivel(chave):
+    return os.path.exists(_caminho(chave))
+
+
+def obter(chave):
+    """Retorna a lista de questões guardada ou None. Um acerto renova o item no LRU."""
+    caminho = _caminho(chave)
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            questoes = questoes_de_json(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    cache_disco.tocar(caminho)
+    return questoes
+
+
+def guardar(chave, questoes):
+    dados = json.dumps(questoes_para_json(questoes), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    try:
+        cache_disco.gravar_atomico(_caminho(chave), dados)
+    except OSError:
+        return
+    cache_disco.podar(PASTA_CACHE, LIMITE_BYTES, ".json")
+
+
+def processar_com_cache(digest_pdf, processar, com_assunto=False):
+    """
+    Devolve as questões do PDF identificado por ``digest_pdf``.
+    ``processar`` só é chamado (e o resultado gravado) quando não há cache.
+    """
+    chave = chave_resultado(digest_pdf, com_assunto)
+    questoes = obter(chave)
+    if questoes is None:
+        questoes = processar()
+        guardar(chave, questoes)
+    return questoes
@@ -1,19 +1,29 @@
 import streamlit as st
-import tempfile
 import os
 import json
-from extrator_questoes import processar_pdf
-
-PASTA_RAIZ = "questoes_filtradas"
-
-
-def _botao_atalho(label, caminho_pasta):
-    if os.path.exists(caminho_pasta) and os.path.isdir(caminho_pasta):
+from functools import partial
+import perfil
+import tarefas_pdf
+from extrator_questoes import processar_pdf_em_fluxo
+from modelo_questao import questoes_de_json
+from simulado import cache_pdf
+from simulado.placar import reiniciar_respostas
+from simulado.progressivo import BancoParcial, obter_ou_iniciar
+from simulado.repositorio import banco_do_arquivo, banco_do_conteudo, conteudo_disponivel
+from simulado.catalogo import PASTA_RAIZ, obter_catalogo
+
+# Segmentos pequenos fazem as primeiras questões aparecerem mais cedo.
+SEGMENTO_PROGRESSIVO = 8 * 1024
+INTERVALO_PROGRESSO = 1.0
+
+
+def _botao_atalho(label, catalogo, pasta):
+    if catalogo.tem_pasta(pasta):
         if st.button(label, use_container_width=True):
-            jsons = [f for f in os.listdir(caminho_pasta) if f.endswith(".json")]
+            jsons = catalogo.arquivos(pasta, (".json",))
             if jsons:
-                st.session_state.arquivo_simulado_ativo = os.path.join(caminho_pasta, jsons[0])
-                st.success(f"Carregado: `{jsons[0]}`")
+                st.session_state.arquivo_simulado_ativo = jsons[0].caminho
+                st.success(f"Carregado: `{jsons[0].nome}`")
             else:
                 st.error("Nenhum arquivo `.json` encontrado.")
 
@@ -24,26 +34,20 @@ def secao_carregamento():
 
     arquivo_local_selecionado = None
 
-    if not os.path.exists(PASTA_RAIZ):
+    catalogo = obter_catalogo()
+    if catalogo is None:
         st.info(f"A pasta `{PASTA_RAIZ}` ainda não existe no diretório raiz.")
         return uploaded_file, arquivo_local_selecionado
 
-    _botao_atalho("📝 Exercício de Inglês", os.path.join(PASTA_RAIZ, "Inglês Texto"))
-    _botao_atalho("📝 Fazer simulado da Semana", os.path.join(PASTA_RAIZ, "Simulado"))
+    _botao_atalho("📝 Exercício de Inglês", catalogo, "Inglês Texto")
+    _botao_atalho("📝 Fazer simulado da Semana", catalogo, "Simulado")
      
-    _botao_atalho("📝 Fazer simulado da Semana (Danilo)", os.path.join(PASTA_RAIZ, "Simulado_Danilo"))
-
-    todos_arquivos = []
-    for raiz, _, nomes in os.walk(PASTA_RAIZ):
-        for nome in nomes:
-            if nome.endswith((".pdf", ".json")):
-                caminho_completo = os.path.join(raiz, nome)
-                todos_arquivos.append((os.path.relpath(caminho_completo, PASTA_RAIZ), caminho_completo))
+    _botao_atalho("📝 Fazer simulado da Semana (Danilo)", catalogo, "Simulado_Danilo")
 
     aba_pastas, aba_busca = st.tabs(["📁 Navegar por pastas", "🔍 Pesquisar"])
 
     with aba_pastas:
-        subpastas = [f for f in os.listdir(PASTA_RAIZ) if os.path.isdir(os.path.join(PASTA_RAIZ, f))]
+        subpastas = catalogo.subpastas()
         if not subpastas:
             st.warning(f"Nenhuma subpasta encontrada dentro de `{PASTA_RAIZ}`.")
         else:
@@ -51,23 +55,25 @@ def secao_carregamento():
             if subpasta_sel != "Selecione...":
                 if "arquivo_simulado_ativo" in st.session_state:
                     del st.session_state.arquivo_simulado_ativo
-                caminho_subpasta = os.path.join(PASTA_RAIZ, subpasta_sel)
-                arquivos = [f for f in os.listdir(caminho_subpasta) if f.endswith((".pdf", ".json"))]
+                arquivos = {e.nome: e for e in catalogo.arquivos(subpasta_sel)}
                 if not arquivos:
                     st.warning("Nenhum arquivo PDF ou JSON encontrado nesta pasta.")
                 else:
-                    arquivo_sel = st.selectbox("Selecione o arquivo de questões:", ["Selecione..."] + arquivos)
+                    arquivo_sel = st.selectbox(
+                        "Selecione o arquivo de questões:", ["Selecione..."] + list(arquivos),
+                        format_func=lambda nome: catalogo.descrever(arquivos[nome].rotulo, nome) if nome in arquivos else nome,
+                    )
                     if arquivo_sel != "Selecione...":
-                        arquivo_local_selecionado = os.path.join(caminho_subpasta, arquivo_sel)
+                        arquivo_local_selecionado = arquivos[arquivo_sel].caminho
 
     with aba_busca:
         st.caption("Digite no campo abaixo para filtrar — o seletor já tem busca nativa.")
-        opcoes = ["Selecione..."] + [label for label, _ in todos_arquivos]
-        sel_label = st.selectbox("Simulados disponíveis:", opcoes)
+        opcoes = ["Selecione..."] + [e.rotulo for e in catalogo.todos]
+        sel_label = st.selectbox("Simulados disponíveis:", opcoes, format_func=catalogo.descrever)
         if sel_label != "Selecione...":
             if "arquivo_simulado_ativo" in st.session_state:
                 del st.session_state.arquivo_simulado_ativo
-            arquivo_local_selecionado = next(p for l, p in todos_arquivos if l == sel_label)
+            arquivo_local_selecionado = catalogo.por_rotulo(sel_label).caminho
 
     if "arquivo_simulado_ativo" in st.session_state:
         arquivo_local_selecionado = st.session_state.arquivo_simulado_ativo
@@ -97,33 +103,78 @@ def processar_arquivo(uploaded_file, arquivo_local_selecionado):
     try:
         if nome_do_arquivo.endswith(".json"):
             if origem_local:
-                with open(arquivo_para_processar, "r", encoding="utf-8") as f:
-                    questoes = json.load(f)
+                questoes = banco_do_arquivo(arquivo_para_processar)
             else:
-                questoes = json.loads(arquivo_para_processar.read().decode("utf-8"))
+                json_bytes = arquivo_para_processar.getvalue()
+                questoes = banco_do_conteudo(
+                    f"json-{cache_pdf.hash_bytes(json_bytes)}",
+                    lambda: questoes_de_json(json.loads(json_bytes.decode("utf-8"))),
+                )
         else:
             if origem_local:
-                with st.spinner("Gerando seu simulado do servidor, aguarde..."):
-                    questoes = processar_pdf(arquivo_para_processar)
+                digest = cache_pdf.hash_arquivo(arquivo_para_processar)
+                gerar = partial(_questoes_em_fluxo, nome_do_arquivo, arquivo_para_processar)
             else:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(uploaded_file.read())
-                    tmp_path = tmp.name
-                try:
-                    with st.spinner("Gerando seu simulado, por favor aguarde alguns segundos..."):
-                        questoes = processar_pdf(tmp_path)
-                finally:
-                    os.unlink(tmp_path)
+                pdf_bytes = uploaded_file.getvalue()
+                digest = cache_pdf.hash_bytes(pdf_bytes)
+                gerar = partial(_questoes_em_fluxo, nome_do_arquivo, pdf_bytes)
+
+            chave = cache_pdf.chave_resultado(digest)
+            if conteudo_disponivel(f"pdf-{chave}") or cache_pdf.disponivel(chave):
+                questoes = banco_do_conteudo(
+                    f"pdf-{chave}",
+                    lambda: cache_pdf.processar_com_cache(digest, lambda: list(gerar(None))),
+                )
+            else:
+                # Ainda não processado: o simulado começa com as questões já lidas
+                questoes = obter_ou_iniciar(f"pdf-{chave}", gerar, partial(cache_pdf.guardar, chave))
 
         st.session_state.questoes = questoes
         st.session_state.arquivo_nome = nome_do_arquivo
-        st.session_state.idx = 0
-        st.session_state.respostas = {}
-        st.session_state.respondidas = {}
-        st.session_state.mostrar_gabarito = {}
-        st.session_state.eliminadas = {}
-        st.session_state.finalizado = False
+        reiniciar_respostas()
         st.rerun()
     except Exception as e:
         st.error(f"Erro ao processar arquivo: {e}")
         st.stop()
+
+
+def _questoes_em_fluxo(rotulo, fonte, progresso):
+    """``fonte`` é o caminho do PDF ou os bytes enviados (lidos direto da memória)."""
+    with perfil.corrida(rotulo):
+        yield from processar_pdf_em_fluxo(fonte, progresso=progresso, tamanho_segmento=SEGMENTO_PROGRESSIVO,
+                                          pool=tarefas_pdf.pool())
+
+
+@st.fragment(run_every=INTERVALO_PROGRESSO)
+def _andamento(banco, total_exibido):
+    # Questões novas (ou o fim) pedem um rerun da página para liberar a navegação.
+    if banco.concluido or len(banco) != total_exibido:
+        st.rerun(scope="app")
+    if banco.total_paginas:
+        st.progress(
+            banco.paginas_lidas / banco.total_paginas,
+            text=f"⏳ Lendo o PDF: página {banco.paginas_lidas} de {banco.total_paginas} "
+                 f"— {len(banco)} questões prontas",
+        )
+    else:
+        st.progress(0, text="⏳ Gerando seu simulado, por favor aguarde alguns segundos...")
+
+
+def acompanhar_processamento():
+    """
+    Enquanto o PDF da sessão é processado, mostra o andamento; quando termina,
+    troca o banco parcial pelo definitivo (mesmos ids, respostas mantidas).
+    Com a medição ligada (``perfil``), mostra o tempo de cada etapa.
+    """
+    questoes = st.session_state.get("questoes")
+    if isinstance(questoes, BancoParcial):
+        if not questoes.concluido:
+            _andamento(questoes, len(questoes))
+            return
+        if questoes.erro is not None:
+            del st.session_state.questoes
+            st.error(f"Erro ao processar arquivo: {questoes.erro}")
+            st.stop()
+        st.session_state.questoes = banco_do_conteudo(questoes.chave_conteudo, questoes.lista)
+    if "arquivo_nome" in st.session_state:
+        perfil.painel(st.session_state.arquivo_nome)
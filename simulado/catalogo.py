@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+PASTA_RAIZ = "questoes_filtradas"
+ARQUIVO_INDICE = os.path.join(".cache", "catalogo.json")
+EXTENSOES = (".pdf", ".json")
+VERSAO_INDICE = 1
+
+# Intervalo mínimo entre duas verificações de mtime. Dentro dele, um rerun
+# do Streamlit recebe o catálogo em memória sem nenhuma chamada ao disco.
+INTERVALO_VERIFICACAO = 2.0
+
+
+@dataclass(frozen=True)
+class EntradaBanco:
+    caminho: str
+    rotulo: str
+    pasta: str
+    nome: str
+    tamanho: int
+    mtime_ns: int
+    total_questoes: object
+    assuntos: tuple
+
+
+@dataclass(frozen=True)
+class PastaCatalogo:
+    mtime_ns: int
+    arquivos: tuple
+    subpastas: tuple
+
+
+class Catalogo:
+    """Fotografia imutável da árvore de bancos; é compartilhada entre sessões."""
+
+    def __init__(self, raiz, pastas):
+        self.raiz = raiz
+        self.pastas = pastas
+        self.todos = tuple(sorted(
+            (e for p in pastas.values() for e in p.arquivos), key=lambda e: e.rotulo
+        ))
+        self._por_rotulo = {e.rotulo: e for e in self.todos}
+
+    def tem_pasta(self, rel):
+        return rel in self.pastas
+
+    def subpastas(self, rel=""):
+        pasta = self.pastas.get(rel)
+        return list(pasta.subpastas) if pasta else []
+
+    def arquivos(self, rel, extensoes=EXTENSOES):
+        pasta = self.pastas.get(rel)
+        if not pasta:
+            return []
+        return [e for e in pasta.arquivos if e.nome.endswith(extensoes)]
+
+    def por_rotulo(self, rotulo):
+        return self._por_rotulo.get(rotulo)
+
+    def descrever(self, rotulo, texto=None):
+        """Rótulo para selectbox, com a contagem de questões quando conhecida."""
+        texto = texto or rotulo
+        entrada = self._por_rotulo.get(rotulo)
+        if entrada is None or entrada.total_questoes is None:
+            return texto
+        return f"{texto} ({entrada.total_questoes} questões)"
+
+
+_trava = threading.Lock()
+_catalogos = {}
+
+
+def _ler_banco(caminho):
+    if not caminho.endswith(".json"):
+        return None, ()
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            questoes = json.load(f)
+    except (OSError, ValueError):
+        return None, ()
+    if not isinstance(questoes, list):
+        return None, ()
+    assuntos = sorted({q["assunto"] for q in questoes if isinstance(q, dict) and q.get("assunto")})
+    return len(questoes), tuple(assuntos)
+
+
+def _varrer(raiz, rel, antigas, novas):
+    """
+    Atualiza ``novas`` a partir de ``antigas`` descendo pela árvore.
+    Só lista (e relê os arquivos alterados de) pastas cujo mtime mudou.
+    Retorna True se algo mudou.
+    """
+    caminho_pasta = os.path.join(raiz, rel) if rel else raiz
+    try:
+        mtime_ns = os.stat(caminho_pasta).st_mtime_ns
+    except OSError:
+        return True
+
+    anterior = antigas.get(rel)
+    mudou = False
+    if anterior is not None and anterior.mtime_ns == mtime_ns:
+        pasta = anterior
+    else:
+        mudou = True
+        antigos_por_nome = {e.nome: e for e in anterior.arquivos} if anterior else {}
+        arquivos, subpastas = [], []
+        with os.scandir(caminho_pasta) as it:
+            for item in it:
+                if item.is_dir():
+                    subpastas.append(item.name)
+                elif item.name.endswith(EXTENSOES):
+                    st_arq = item.stat()
+                    antigo = antigos_por_nome.get(item.name)
+                    if antigo and antigo.mtime_ns == st_arq.st_mtime_ns and antigo.tamanho == st_arq.st_size:
+                        arquivos.append(antigo)
+                        continue
+                    caminho = os.path.join(caminho_pasta, item.name)
+                    total, assuntos = _ler_banco(caminho)
+                    rotulo = os.path.join(rel, item.name) if rel else item.name
+                    arquivos.append(EntradaBanco(
+                        caminho=caminho,
+                        rotulo=rotulo,
+                        pasta=rel.split(os.sep)[0] if rel else "",
+                        nome=item.name,
+                        tamanho=st_arq.st_size,
+                        mtime_ns=st_arq.st_mtime_ns,
+                        total_questoes=total,
+                        assuntos=assuntos,
+                    ))
+        arquivos.sort(key=lambda e: e.nome)
+        subpastas.sort()
+        pasta = PastaCatalogo(mtime_ns=mtime_ns, arquivos=tuple(arquivos), subpastas=tuple(subpastas))
+
+    novas[rel] = pasta
+    for sub in pasta.subpastas:
+        if _varrer(raiz, os.path.join(rel, sub) if rel else sub, antigas, novas):
+            mudou = True
+    return mudou
+
+
+def _carregar_indice(raiz):
+    try:
+        with open(ARQUIVO_INDICE, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if dados.get("versao") != VERSAO_INDICE or dados.get("raiz") != raiz:
+        return {}
+    return {
+        rel: PastaCatalogo(
+            mtime_ns=p["mtime_ns"],
+            arquivos=tuple(EntradaBanco(**{**a, "assuntos": tuple(a["assuntos"])}) for a in p["arquivos"]),
+            subpastas=tuple(p["subpastas"]),
+        )
+        for rel, p in dados.get("pastas", {}).items()
+    }
+
+
+def _salvar_indice(raiz, pastas):
+    dados = {
+        "versao": VERSAO_INDICE,
+        "raiz": raiz,
+        "pastas": {
+            rel: {
+                "mtime_ns": p.mtime_ns,
+                "subpastas": list(p.subpastas),
+                "arquivos": [e.__dict__ for e in p.arquivos],
+            }
+            for rel, p in pastas.items()
+        },
+    }
+    try:
+        os.makedirs(os.path.dirname(ARQUIVO_INDICE), exist_ok=True)
+        tmp = f"{ARQUIVO_INDICE}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(tmp, ARQUIVO_INDICE)
+    except OSError:
+        pass
+
+
+def obter_catalogo(raiz=PASTA_RAIZ, forcar=False):
+    """
+    Retorna o ``Catalogo`` de ``raiz`` (ou None se a pasta não existir).
+    O índice vive no processo e em ``.cache/catalogo.json``; a cada
+    ``INTERVALO_VERIFICACAO`` segundos os mtimes das pastas são conferidos.
+    """
+    agora = time.monotonic()
+    atual = _catalogos.get(raiz)
+    if atual and not forcar and agora - atual[1] < INTERVALO_VERIFICACAO:
+        return atual[0]
+
+    with _trava:
+        atual = _catalogos.get(raiz)
+        if atual and not forcar and agora - atual[1] < INTERVALO_VERIFICACAO:
+            return atual[0]
+        if not os.path.isdir(raiz):
+            _catalogos.pop(raiz, None)
+            return None
+
+        antigas = atual[0].pastas if atual else _carregar_indice(raiz)
+        novas = {}
+        mudou = _varrer(raiz, "", antigas, novas) or set(novas) != set(antigas)
+        catalogo = atual[0] if (atual and not mudou) else Catalogo(raiz, novas)
+        if mudou:
+            _salvar_indice(raiz, novas)
+        _catalogos[raiz] = (catalogo, time.monotonic())
+        return catalogo
+
+
+if __name__ == "__main__":
+    cat = obter_catalogo(forcar=True)
+    if cat is None:
+        print(f"Pasta {PASTA_RAIZ} não encontrada.")
+    else:
+        for entrada in cat.todos:
+            total = "-" if entrada.total_questoes is None else entrada.total_questoes
+            print(f"{total:>5}  {entrada.tamanho:>9}  {entrada.rotulo}")
+        print(f"{len(cat.todos)} arquivos em {len(cat.pastas)} pastas.")
@@ -0,0 +1,162 @@
+"""
+Manifesto das imagens em ``images/<pasta>/<banco>-<n>.<ext>``.
+
+Cada pasta é listada uma vez e fica em memória; o mtime da pasta é
+reconferido no máximo a cada ``INTERVALO_VERIFICACAO`` segundos, então
+renderizar uma questão com ``{image(n)}`` não faz chamadas ao sistema de
+arquivos. ``python -m simulado.imagens`` valida os bancos offline.
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from simulado.catalogo import INTERVALO_VERIFICACAO, PASTA_RAIZ
+
+PASTA_IMAGENS = "images"
+# Ordem de preferência quando existe mais de uma extensão para a mesma imagem.
+EXTENSOES = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+PADRAO_PLACEHOLDER = re.compile(r'\{image\((\d+)\)\}')
+
+
+@dataclass(frozen=True)
+class EntradaImagem:
+    caminho: str
+    largura: object
+    altura: object
+
+
+_trava = threading.Lock()
+# pasta -> (mtime_ns, verificado_em, {(banco, n): EntradaImagem})
+_manifestos = {}
+
+
+def _dimensoes(caminho):
+    """(largura, altura) lidas do cabeçalho de PNG, GIF, JPEG ou WEBP; (None, None) se não reconhecido."""
+    try:
+        with open(caminho, "rb") as f:
+            cab = f.read(32)
+            if cab[:8] == b"\x89PNG\r\n\x1a\n" and cab[12:16] == b"IHDR":
+                return struct.unpack(">II", cab[16:24])
+            if cab[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", cab[6:10])
+            if cab[:4] == b"RIFF" and cab[8:12] == b"WEBP":
+                bloco = cab[12:16]
+                if bloco == b"VP8 ":
+                    largura, altura = struct.unpack("<HH", cab[26:30])
+                    return largura & 0x3FFF, altura & 0x3FFF
+                if bloco == b"VP8L":
+                    b = cab[21:25]
+                    largura = 1 + (((b[1] & 0x3F) << 8) | b[0])
+                    altura = 1 + (((b[3] & 0xF) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+                    return largura, altura
+                if bloco == b"VP8X":
+                    return (1 + int.from_bytes(cab[24:27], "little"),
+                            1 + int.from_bytes(cab[27:30], "little"))
+            if cab[:2] == b"\xff\xd8":
+                f.seek(2)
+                while True:
+                    marcador = f.read(2)
+                    if len(marcador) < 2 or marcador[0] != 0xFF:
+                        break
+                    (tamanho,) = struct.unpack(">H", f.read(2))
+                    if marcador[1] in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                        altura, largura = struct.unpack(">xHH", f.read(5))
+                        return largura, altura
+                    f.seek(tamanho - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        pass
+    return None, None
+
+
+def _listar(caminho_pasta):
+    manifesto = {}
+    prioridade = {}
+    with os.scandir(caminho_pasta) as it:
+        for item in it:
+            nome, ext = os.path.splitext(item.name)
+            ext = ext.lower()
+            if ext not in EXTENSOES or "-" not in nome:
+                continue
+            banco, numero = nome.rsplit("-", 1)
+            if not numero.isdigit():
+                continue
+            chave = (banco, numero)
+            if chave in prioridade and prioridade[chave] <= EXTENSOES.index(ext):
+                continue
+            prioridade[chave] = EXTENSOES.index(ext)
+            manifesto[chave] = item.path
+    return {chave: EntradaImagem(caminho, *_dimensoes(caminho)) for chave, caminho in manifesto.items()}
+
+
+def manifesto_pasta(pasta):
+    """Mapa (banco, número) -> ``EntradaImagem`` de ``images/<pasta>``."""
+    agora = time.monotonic()
+    atual = _manifestos.get(pasta)
+    if atual and agora - atual[1] < INTERVALO_VERIFICACAO:
+        return atual[2]
+
+    with _trava:
+        atual = _manifestos.get(pasta)
+        if atual and agora - atual[1] < INTERVALO_VERIFICACAO:
+            return atual[2]
+        caminho_pasta = os.path.join(PASTA_IMAGENS, pasta)
+        try:
+            mtime_ns = os.stat(caminho_pasta).st_mtime_ns
+        except OSError:
+            _manifestos[pasta] = (None, time.monotonic(), {})
+            return {}
+        if atual and atual[0] == mtime_ns:
+            manifesto = atual[2]
+        else:
+            manifesto = _listar(caminho_pasta)
+        _manifestos[pasta] = (mtime_ns, time.monotonic(), manifesto)
+        return manifesto
+
+
+def _pasta_e_banco(caminho_banco):
+    pasta = os.path.basename(os.path.dirname(caminho_banco))
+    banco = os.path.splitext(os.path.basename(caminho_banco))[0]
+    return pasta, banco
+
+
+def caminho_esperado(caminho_banco, numero):
+    """Caminho (sem extensão) onde a imagem ``numero`` do banco deveria estar."""
+    pasta, banco = _pasta_e_banco(caminho_banco)
+    return os.path.join(PASTA_IMAGENS, pasta, f"{banco}-{numero}")
+
+
+def resolver_imagem(caminho_banco, numero):
+    """``EntradaImagem`` da imagem ``numero`` do banco, ou None se não existir."""
+    pasta, banco = _pasta_e_banco(caminho_banco)
+    return manifesto_pasta(pasta).get((banco, str(numero)))
+
+
+def validar(raiz=PASTA_RAIZ):
+    """Lista (banco, id da questão, número, caminho esperado) das imagens referenciadas e ausentes."""
+    faltando = []
+    for pasta, _, nomes in os.walk(raiz):
+        for nome in sorted(nomes):
+            if not nome.endswith(".json"):
+                continue
+            caminho = os.path.join(pasta, nome)
+            with open(caminho, "r", encoding="utf-8") as f:
+                questoes = json.load(f)
+            for q in questoes:
+                for numero in PADRAO_PLACEHOLDER.findall(q.get("enunciado", "")):
+                    if resolver_imagem(caminho, numero) is None:
+                        faltando.append((caminho, q.get("id"), numero, caminho_esperado(caminho, numero)))
+    return faltando
+
+
+if __name__ == "__main__":
+    faltando = validar(sys.argv[1] if len(sys.argv) > 1 else PASTA_RAIZ)
+    for caminho, qid, numero, esperado in faltando:
+        print(f"{caminho} (questão {qid}): imagem {numero} não encontrada em {esperado}.*")
+    print(f"{len(faltando)} imagem(ns) ausente(s).")
+    sys.exit(1 if faltando else 0)
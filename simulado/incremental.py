@@ -0,0 +1,95 @@
+"""
+Lote incremental das linhas de comando ``simulado.ingestao`` e
+``transformacoes.lote``: cada entrada vira um arquivo de destino, e um
+destino só é refeito quando o hash da entrada ou a versão mudaram.
+
+O manifesto (um JSON em ``.cache``) guarda, por destino, o hash e a versão
+que o geraram e a contagem do resultado (questões, linhas...). As entradas
+pendentes rodam num pool de processos, as maiores primeiro; o manifesto é
+salvo mesmo se o lote for interrompido.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulado import cache_disco
+from simulado.cache_pdf import hash_arquivo
+
+
+def carregar_manifesto(arquivo):
+    try:
+        with open(arquivo, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def salvar_manifesto(arquivo, manifesto):
+    dados = json.dumps(manifesto, ensure_ascii=False, indent=1).encode("utf-8")
+    cache_disco.gravar_atomico(arquivo, dados)
+
+
+def processar(pares, tarefa, versao, arquivo_manifesto, contagem, workers=None, forcar=False):
+    """
+    Roda ``tarefa(entrada, destino)`` nos pares (entrada, destino) que não
+    estão em dia e devolve um resultado por par, na ordem das entradas:
+    dict com entrada, destino, estado ("gerado", "inalterado", "em dia" ou
+    "erro"), ``contagem``, tempo e erro.
+
+    ``tarefa`` roda num processo do pool (precisa ser serializável: uma
+    função do módulo ou um ``partial`` dela), grava o destino e devolve
+    (contagem, gravou, segundos); uma exceção vira o estado "erro".
+    """
+    manifesto = carregar_manifesto(arquivo_manifesto)
+    resultados = []
+    pendentes = []
+    for entrada, destino in pares:
+        digest = hash_arquivo(entrada)
+        anterior = manifesto.get(destino)
+        em_dia = (not forcar and anterior and os.path.exists(destino)
+                  and anterior["hash"] == digest and anterior["versao"] == versao)
+        if em_dia:
+            resultados.append({"entrada": entrada, "destino": destino, "estado": "em dia",
+                               contagem: anterior[contagem], "tempo": 0.0, "erro": None})
+        else:
+            pendentes.append((os.path.getsize(entrada), entrada, destino, digest))
+
+    if pendentes:
+        pendentes.sort(reverse=True)
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(pendentes))) as pool:
+            futuros = {
+                pool.submit(tarefa, entrada, destino): (entrada, destino, digest)
+                for _, entrada, destino, digest in pendentes
+            }
+            try:
+                for futuro in as_completed(futuros):
+                    entrada, destino, digest = futuros[futuro]
+                    resultado = {"entrada": entrada, "destino": destino, "tempo": 0.0, contagem: 0, "erro": None}
+                    try:
+                        total, gravou, tempo = futuro.result()
+                    except Exception as e:
+                        resultado.update(estado="erro", erro=str(e) or type(e).__name__)
+                    else:
+                        resultado.update({"estado": "gerado" if gravou else "inalterado",
+                                          contagem: total, "tempo": tempo})
+                        manifesto[destino] = {"hash": digest, "versao": versao, contagem: total}
+                    resultados.append(resultado)
+            finally:
+                salvar_manifesto(arquivo_manifesto, manifesto)
+
+    return sorted(resultados, key=lambda r: r["entrada"])
+
+
+def relatorio(resultados, duracao, contagem, coluna, arquivos):
+    """Tabela com tempo, ``contagem`` (título ``coluna``) e estado por arquivo, e o resumo do lote."""
+    print(f"{'tempo (s)':>9} {coluna:>8}  {'estado':<10} arquivo")
+    for r in resultados:
+        detalhe = f"  ({r['erro']})" if r["erro"] else ""
+        print(f"{r['tempo']:>9.2f} {r[contagem]:>8}  {r['estado']:<10} {r['destino']}{detalhe}")
+    estados = {}
+    for r in resultados:
+        estados[r["estado"]] = estados.get(r["estado"], 0) + 1
+    resumo = ", ".join(f"{n} {estado}" for estado, n in sorted(estados.items()))
+    print(f"{len(resultados)} {arquivos} ({resumo or 'nenhum'}), "
+          f"{sum(r[contagem] for r in resultados)} {coluna} em {duracao:.1f}s.")
@@ -0,0 +1,118 @@
+"""
+Ingestão em lote: uma árvore de PDFs vira bancos JSON em ``questoes_filtradas``.
+
+Uso: python -m simulado.ingestao ENTRADA [--saida PASTA] [--assunto]
+         [--layout [--imagens]] [--backend NOME] [--workers N] [--forcar]
+
+``ENTRADA/<disciplina>/<banco>.pdf`` gera ``<saida>/<disciplina>/<banco>.json``
+(PDFs soltos na raiz vão para a pasta com o nome de ENTRADA). Os PDFs são
+processados num pool de processos, os maiores primeiro. Um banco só é
+refeito quando o hash do PDF, a versão do extrator ou as opções mudaram:
+``.cache/ingestao.json`` guarda o que gerou cada saída. As gravações são
+atômicas e um JSON igual ao existente não é regravado. No fim sai um
+relatório com tempo e número de questões por arquivo.
+
+As figuras dos PDFs só são extraídas com ``--layout --imagens``: viram
+``images/<disciplina>/<banco>-<n>.png`` e ``{image(n)}`` no enunciado
+(``imagens_pdf``). O pipeline de regex, o padrão, não extrai imagens.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+
+from extrator_questoes import VERSAO_EXTRATOR, processar_pdf
+from modelo_questao import questoes_para_json
+from simulado import cache_disco, incremental
+from simulado.catalogo import PASTA_RAIZ
+
+ARQUIVO_MANIFESTO = os.path.join(".cache", "ingestao.json")
+
+
+def _versao(com_assunto, layout, imagens, backend=None):
+    if layout:
+        from segmentacao_layout import VERSAO_LAYOUT
+        motor = f"layout-v{VERSAO_LAYOUT}" + ("-imagens" if imagens else "")
+    else:
+        motor = f"regex-v{VERSAO_EXTRATOR}" + (f"-{backend}" if backend else "")
+    return f"{motor}-assunto{int(bool(com_assunto))}"
+
+
+def _ingerir(pdf, destino, com_assunto, layout, imagens, backend=None):
+    """Roda num processo do pool: extrai, grava e devolve (questões, gravou, segundos)."""
+    inicio = time.perf_counter()
+    registro = None
+    if layout:
+        from imagens_pdf import RegistroImagens
+        from segmentacao_layout import processar_pdf_layout
+        registro = RegistroImagens(destino) if imagens else None
+        questoes = processar_pdf_layout(pdf, com_assunto, workers=1, imagens=registro)
+        if registro is not None and questoes:
+            registro.podar()
+    else:
+        questoes = processar_pdf(pdf, com_assunto, workers=1, backend=backend)
+    if not questoes:
+        raise ValueError("nenhuma questão encontrada")
+    dados = json.dumps(questoes_para_json(questoes), ensure_ascii=False, indent=4).encode("utf-8")
+    return len(questoes), cache_disco.gravar_se_mudou(destino, dados), time.perf_counter() - inicio
+
+
+def listar_pdfs(entrada, saida=PASTA_RAIZ):
+    """Pares (pdf, json de destino) da árvore ``entrada``."""
+    entrada = os.path.normpath(entrada)
+    pares = []
+    for pasta, subpastas, nomes in os.walk(entrada):
+        subpastas.sort()
+        rel = os.path.relpath(pasta, entrada)
+        destino_pasta = os.path.join(saida, os.path.basename(entrada) if rel == "." else rel)
+        for nome in sorted(nomes):
+            if nome.lower().endswith(".pdf"):
+                banco = os.path.splitext(nome)[0] + ".json"
+                pares.append((os.path.join(pasta, nome), os.path.join(destino_pasta, banco)))
+    return pares
+
+
+def ingerir(entrada, saida=PASTA_RAIZ, com_assunto=False, layout=False, imagens=False,
+            workers=None, forcar=False, backend=None):
+    """
+    Processa os PDFs de ``entrada`` que mudaram e devolve um resultado por
+    arquivo: dict com entrada (o PDF), destino, estado ("gerado",
+    "inalterado", "em dia" ou "erro"), questoes, tempo e erro.
+    """
+    tarefa = partial(_ingerir, com_assunto=com_assunto, layout=layout, imagens=imagens, backend=backend)
+    return incremental.processar(listar_pdfs(entrada, saida), tarefa, _versao(com_assunto, layout, imagens, backend),
+                                 ARQUIVO_MANIFESTO, "questoes", workers, forcar)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulado.ingestao", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("entrada", help="pasta com os PDFs (subpastas viram disciplinas)")
+    parser.add_argument("--saida", default=PASTA_RAIZ, help=f"pasta dos bancos (padrão: {PASTA_RAIZ})")
+    parser.add_argument("--assunto", action="store_true", help="extrair o assunto de cada questão")
+    parser.add_argument("--layout", action="store_true", help="usar a segmentação por layout")
+    parser.add_argument("--imagens", action="store_true", help="extrair as figuras para images/ (só com --layout: o pipeline "
+                             "de regex não extrai imagens)")
+    parser.add_argument("--backend", choices=("pdfplumber", "fitz"), default=None,
+                        help="sem --layout, usar este backend de texto em vez da escolha automática")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--forcar", action="store_true", help="refazer mesmo os bancos em dia")
+    args = parser.parse_args(argv)
+    if args.imagens and not args.layout:
+        parser.error("--imagens exige --layout")
+    if args.backend and args.layout:
+        parser.error("--backend não se aplica a --layout")
+    if not os.path.isdir(args.entrada):
+        parser.error(f"pasta {args.entrada} não encontrada")
+
+    inicio = time.perf_counter()
+    resultados = ingerir(args.entrada, args.saida, args.assunto, args.layout, args.imagens,
+                         args.workers, args.forcar, args.backend)
+    incremental.relatorio(resultados, time.perf_counter() - inicio, "questoes", "questões", "PDFs")
+    return 1 if any(r["estado"] == "erro" for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import streamlit as st
+
+
+def reiniciar_respostas():
+    st.session_state.idx = 0
+    st.session_state.respostas = {}
+    st.session_state.respondidas = {}
+    st.session_state.mostrar_gabarito = {}
+    st.session_state.eliminadas = {}
+    st.session_state.placar = {"acertos": 0, "erros": 0}
+    st.session_state.finalizado = False
+
+
+def registrar_resposta(questoes, qid, letra):
+    """Grava a resposta e atualiza o placar sem varrer o banco."""
+    if qid in st.session_state.respostas:
+        return
+    st.session_state.respostas[qid] = letra
+    st.session_state.respondidas[qid] = True
+    placar = placar_atual(questoes)
+    placar["acertos" if questoes.acertou(qid, letra) else "erros"] += 1
+
+
+def placar_atual(questoes):
+    """
+    Contadores de acertos/erros da sessão. São recalculados pelo índice de
+    gabarito (O(respostas)) só se estiverem ausentes ou fora de sincronia.
+    """
+    placar = st.session_state.get("placar")
+    respostas = st.session_state.respostas
+    if placar is None or placar["acertos"] + placar["erros"] != len(respostas):
+        acertos = sum(1 for qid, resp in respostas.items() if questoes.acertou(qid, resp))
+        placar = {"acertos": acertos, "erros": len(respostas) - acertos}
+        st.session_state.placar = placar
+    return placar
@@ -0,0 +1,88 @@
+"""
+Simulado que começa antes de o PDF terminar de ser processado.
+
+A extração roda como uma tarefa de ``tarefas_pdf`` que publica as questões
+à medida que saem; ``BancoParcial`` é a visão da sessão sobre essa tarefa
+e funciona como um banco qualquer, com ``len()`` crescendo a cada página
+lida. Sessões que abrem o mesmo PDF enquanto ele é processado recebem a
+mesma tarefa. Ao terminar, ``ao_concluir`` recebe a lista completa (para o
+cache) e a sessão troca o parcial pelo banco definitivo; os ids são os
+mesmos, então as respostas continuam valendo.
+"""
+
+from functools import partial
+
+import tarefas_pdf
+from simulado.banco_compilado import Banco, indexar_gabarito
+
+
+class BancoParcial(Banco):
+    def __init__(self, tarefa):
+        self.tarefa = tarefa
+        self.chave_conteudo = tarefa.chave
+        self.chave = ("parcial", tarefa.chave)
+        self.ids = []
+        self._corretas = []
+        self._posicoes = {}
+
+    def _sincronizar(self):
+        novas = self.tarefa.itens[len(self.ids):]
+        if novas:
+            ids, corretas = indexar_gabarito(novas)
+            for qid in ids:
+                self._posicoes.setdefault(qid, len(self.ids))
+                self.ids.append(qid)
+            self._corretas.extend(corretas)
+
+    def __len__(self):
+        self._sincronizar()
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return self.tarefa.itens[i]
+
+    def posicao(self, qid):
+        if qid not in self._posicoes:
+            self._sincronizar()
+        return self._posicoes[qid]
+
+    @property
+    def concluido(self):
+        return self.tarefa.concluida
+
+    @property
+    def erro(self):
+        return self.tarefa.erro
+
+    @property
+    def paginas_lidas(self):
+        return self.tarefa.feito
+
+    @property
+    def total_paginas(self):
+        return self.tarefa.total
+
+    def lista(self):
+        return list(self.tarefa.resultado)
+
+
+def _executar(gerar_questoes, ao_concluir, tarefa):
+    for questao in gerar_questoes(tarefa.atualizar_progresso):
+        tarefa.publicar(questao)
+    questoes = list(tarefa.itens)
+    ao_concluir(questoes)
+    return questoes
+
+
+def obter_ou_iniciar(chave_conteudo, gerar_questoes, ao_concluir):
+    """
+    ``BancoParcial`` do conteúdo ``chave_conteudo``, enfileirando o
+    processamento se ninguém o pediu. ``gerar_questoes(progresso)`` é um
+    gerador de questões que chama ``progresso(paginas_lidas, total_paginas)``.
+    """
+    tarefa = tarefas_pdf.submeter(chave_conteudo, partial(_executar, gerar_questoes, ao_concluir))
+    return BancoParcial(tarefa)
+
+
+def processando(questoes):
+    return isinstance(questoes, BancoParcial) and not questoes.concluido
@@ -1,9 +1,13 @@
 import streamlit as st
 import re
-import os
 import random
 import html as html_lib
-from code_formatter import format_enunciado
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from code_formatter import VERSAO_FORMATADOR, format_enunciado
+from simulado.imagens import caminho_esperado, resolver_imagem
+from simulado.placar import registrar_resposta
 
 
 def highlight_texto(text):
@@ -25,42 +29,106 @@ def escape_markdown(text):
     return text.replace('R\x00', r'R\$')
 
 
-def render_enunciado_com_imagens(enunciado, arquivo_local_selecionado):
+LETRAS = "ABCDE"
+LIMITE_RENDER = 4096
+
+_trava_render = threading.Lock()
+_render_cache = OrderedDict()
+
+
+@dataclass(frozen=True)
+class QuestaoRenderizada:
+    """Fragmentos prontos para emitir; nenhum processamento de texto no rerun."""
+    qid: object
+    assunto: str
+    fragmentos: tuple
+    rotulos_radio: tuple
+    rotulos_html: tuple
+
+
+def _fragmentos_enunciado(enunciado):
+    """
+    Divide o enunciado em fragmentos ("md", texto, html), ("md", texto, None)
+    ou ("imagem", n, None), já formatados.
+    """
+    fragmentos = []
     partes = re.split(r'\{image\((\d+)\)\}', enunciado)
     for i, parte in enumerate(partes):
         if i % 2 == 0:
             enunciado_html, tem_codigo = format_enunciado(parte)
             if tem_codigo:
-                st.markdown(enunciado_html, unsafe_allow_html=True)
+                fragmentos.append(("md", enunciado_html, True))
             elif parte.strip():
                 highlighted, tem_highlight = highlight_texto(parte)
                 if tem_highlight:
-                    st.markdown(highlighted, unsafe_allow_html=True)
+                    fragmentos.append(("md", highlighted, True))
                 else:
-                    st.markdown(escape_markdown(parte))
+                    fragmentos.append(("md", escape_markdown(parte), False))
         else:
-            if arquivo_local_selecionado:
-                pasta_json = os.path.basename(os.path.dirname(arquivo_local_selecionado))
-                nome_json = os.path.splitext(os.path.basename(arquivo_local_selecionado))[0]
-                img_path = os.path.join("images", pasta_json, f"{nome_json}-{parte}")
-                for ext in [".png", ".jpg", ".jpeg", ".gif", ".webp"]:
-                    if os.path.exists(img_path + ext):
-                        st.image(img_path + ext)
-                        break
-                else:
-                    st.warning(f"Imagem não encontrada: {img_path}")
+            fragmentos.append(("imagem", parte, None))
+    return tuple(fragmentos)
+
+
+def _emitir_fragmentos(fragmentos, arquivo_local_selecionado):
+    for tipo, valor, html in fragmentos:
+        if tipo == "md":
+            if html:
+                st.markdown(valor, unsafe_allow_html=True)
+            else:
+                st.markdown(valor)
+        elif arquivo_local_selecionado:
+            imagem = resolver_imagem(arquivo_local_selecionado, valor)
+            if imagem:
+                st.image(imagem.caminho)
+            else:
+                st.warning(f"Imagem não encontrada: {caminho_esperado(arquivo_local_selecionado, valor)}")
+
+
+def _renderizar(q):
+    return QuestaoRenderizada(
+        qid=q.id,
+        assunto=q.assunto or "",
+        fragmentos=_fragmentos_enunciado(q.enunciado),
+        rotulos_radio=tuple(f"{LETRAS[i]}) {escape_markdown(alt)}" for i, alt in enumerate(q.alternativas)),
+        rotulos_html=tuple(f"{LETRAS[i]}) {html_lib.escape(alt)}" for i, alt in enumerate(q.alternativas)),
+    )
+
+
+def questao_renderizada(questoes, idx):
+    """
+    Versão renderizada da questão ``idx``, em LRU compartilhado entre sessões
+    e chaveado por (banco, id da questão, versão do formatador). Num acerto a
+    questão nem é decodificada do banco.
+    """
+    chave_banco = getattr(questoes, "chave", None)
+    if chave_banco is None:
+        return _renderizar(questoes[idx])
+
+    chave = (chave_banco, questoes.ids[idx], VERSAO_FORMATADOR)
+    with _trava_render:
+        renderizada = _render_cache.get(chave)
+        if renderizada is not None:
+            _render_cache.move_to_end(chave)
+            return renderizada
+
+    renderizada = _renderizar(questoes[idx])
+    with _trava_render:
+        _render_cache[chave] = renderizada
+        while len(_render_cache) > LIMITE_RENDER:
+            _render_cache.popitem(last=False)
+    return renderizada
 
 
 def secao_questao(questoes, arquivo_local_selecionado):
     total = len(questoes)
     idx = st.session_state.idx
-    q = questoes[idx]
-    qid = q["id"]
-    letras = "ABCDE"
+    r = questao_renderizada(questoes, idx)
+    qid = r.qid
+    letras = LETRAS
 
     col_titulo, col_ir = st.columns([3, 1])
     with col_titulo:
-        st.subheader(f"Questão {q['id']} de {total}")
+        st.subheader(f"Questão {qid} de {total}")
     with col_ir:
         ir_para = st.number_input("Ir para:", min_value=1, max_value=total, value=idx + 1,
                                   key=f"ir_questao_{idx}", label_visibility="collapsed")
@@ -68,10 +136,10 @@ def secao_questao(questoes, arquivo_local_selecionado):
             st.session_state.idx = ir_para - 1
             st.rerun()
 
-    if q.get("assunto"):
-        st.caption(f"📚 Assunto: {q['assunto']}")
+    if r.assunto:
+        st.caption(f"📚 Assunto: {r.assunto}")
 
-    render_enunciado_com_imagens(q["enunciado"], arquivo_local_selecionado)
+    _emitir_fragmentos(r.fragmentos, arquivo_local_selecionado)
 
     ja_respondida = qid in st.session_state.respondidas
     mostrar_gab = st.session_state.mostrar_gabarito.get(qid, False)
@@ -79,8 +147,7 @@ def secao_questao(questoes, arquivo_local_selecionado):
 
     if not ja_respondida and not mostrar_gab:
         elim = st.session_state.eliminadas.get(qid, set())
-        opcoes_filtradas = [f"{letras[i]}) {escape_markdown(alt)}"
-                            for i, alt in enumerate(q["alternativas"]) if letras[i] not in elim]
+        opcoes_filtradas = [rotulo for i, rotulo in enumerate(r.rotulos_radio) if letras[i] not in elim]
         if not opcoes_filtradas:
             st.warning("Todas as alternativas foram eliminadas.")
             selecao = None
@@ -88,7 +155,7 @@ def secao_questao(questoes, arquivo_local_selecionado):
             selecao = st.radio("Alternativas:", opcoes_filtradas, index=None,
                                key=f"radio_{qid}", label_visibility="collapsed")
 
-        opcoes_pills = [f"✂️{letras[i]}" for i in range(len(q["alternativas"])) if letras[i] not in elim]
+        opcoes_pills = [f"✂️{letras[i]}" for i in range(len(r.rotulos_radio)) if letras[i] not in elim]
         if elim:
             opcoes_pills.append("↩ Restaurar")
         eliminada_pill = st.pills("Eliminar letra:", opcoes_pills, key=f"pills_{qid}", label_visibility="collapsed")
@@ -103,8 +170,7 @@ def secao_questao(questoes, arquivo_local_selecionado):
         with col_resp:
             if st.button("✔️ Responder", key=f"resp_{qid}", use_container_width=True):
                 if selecao:
-                    st.session_state.respostas[qid] = selecao[0]
-                    st.session_state.respondidas[qid] = True
+                    registrar_resposta(questoes, qid, selecao[0])
                     st.rerun()
                 else:
                     st.warning("Selecione uma alternativa.")
@@ -113,15 +179,12 @@ def secao_questao(questoes, arquivo_local_selecionado):
                 st.session_state.mostrar_gabarito[qid] = True
                 st.rerun()
     else:
-        letra_gabarito = next(
-            (letras[i] for i, alt in enumerate(q["alternativas"]) if alt == q["gabarito"]), None
-        )
-        acertou = (escolha == letra_gabarito) if ja_respondida else None
+        letra_gabarito = questoes.letra_gabarito(idx)
+        acertou = questoes.acertou(qid, escolha) if ja_respondida else None
         mostrar_correta = mostrar_gab or (ja_respondida and acertou)
 
-        for i, alt in enumerate(q["alternativas"]):
+        for i, texto_safe in enumerate(r.rotulos_html):
             letra = letras[i]
-            texto_safe = f"{letra}) {html_lib.escape(alt)}"
             if ja_respondida:
                 if mostrar_correta and letra == letra_gabarito:
                     css = "alt-box correta"
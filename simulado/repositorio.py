@@ -0,0 +1,142 @@
+"""
+Bancos de questões compartilhados por todas as sessões do processo.
+
+Cada banco é carregado uma única vez (em formato compilado) e fica num LRU
+limitado por memória. A sessão guarda apenas um ``HandleBanco`` — chave e
+como carregar — e suas próprias respostas; se o banco for despejado, o
+handle o recarrega do disco no próximo acesso (ou, sem o arquivo, o gera de
+novo).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+
+from simulado import cache_disco
+from simulado.banco_compilado import PASTA_COMPILADOS, Banco, BancoCompilado, abrir_banco, serializar
+
+LIMITE_MEMORIA = 256 * 1024 * 1024
+PASTA_CONTEUDO = os.path.join(PASTA_COMPILADOS, "conteudo")
+LIMITE_DISCO_CONTEUDO = 512 * 1024 * 1024
+
+_trava = threading.Lock()
+_bancos = OrderedDict()
+_uso = {"bytes": 0}
+
+
+def _tamanho(banco):
+    return getattr(banco, "tamanho_bytes", 0)
+
+
+def _obter(chave, carregar):
+    with _trava:
+        banco = _bancos.get(chave)
+        if banco is not None:
+            _bancos.move_to_end(chave)
+            return banco
+
+    # Carrega fora da trava para não bloquear as outras sessões; se duas
+    # carregarem o mesmo banco ao mesmo tempo, a primeira a chegar vence.
+    novo = carregar()
+    with _trava:
+        banco = _bancos.get(chave)
+        if banco is not None:
+            _bancos.move_to_end(chave)
+            return banco
+        _bancos[chave] = novo
+        _uso["bytes"] += _tamanho(novo)
+        while _uso["bytes"] > LIMITE_MEMORIA and len(_bancos) > 1:
+            _, antigo = _bancos.popitem(last=False)
+            _uso["bytes"] -= _tamanho(antigo)
+    return novo
+
+
+def estatisticas():
+    with _trava:
+        return {"bancos": len(_bancos), "bytes": _uso["bytes"], "limite": LIMITE_MEMORIA}
+
+
+class HandleBanco(Banco):
+    """Referência leve a um banco do repositório; é isto que vai para ``st.session_state``."""
+
+    def __init__(self, chave, carregar):
+        self.chave = chave
+        self._carregar = carregar
+
+    def banco(self):
+        return _obter(self.chave, self._carregar)
+
+    def __len__(self):
+        return len(self.banco())
+
+    def __getitem__(self, i):
+        return self.banco()[i]
+
+    def __iter__(self):
+        return iter(self.banco())
+
+    @property
+    def ids(self):
+        return self.banco().ids
+
+    def posicao(self, qid):
+        return self.banco().posicao(qid)
+
+    def letras_corretas(self, i):
+        return self.banco().letras_corretas(i)
+
+
+def _carregar_conteudo(caminho):
+    try:
+        with open(caminho, "rb") as f:
+            dados = f.read()
+    except OSError:
+        raise LookupError("O banco desta sessão expirou; carregue o arquivo novamente.")
+    cache_disco.tocar(caminho)
+    return BancoCompilado(dados)
+
+
+def banco_do_arquivo(caminho):
+    """Handle para um JSON do servidor, chaveado por caminho + mtime."""
+    st = os.stat(caminho)
+    chave = ("arquivo", os.path.abspath(caminho), st.st_mtime_ns, st.st_size)
+    handle = HandleBanco(chave, partial(abrir_banco, caminho))
+    handle.banco()
+    return handle
+
+
+def conteudo_disponivel(chave):
+    """Se ``banco_do_conteudo(chave, ...)`` abriria o banco sem chamar ``gerar``."""
+    with _trava:
+        if ("conteudo", chave) in _bancos:
+            return True
+    return os.path.exists(os.path.join(PASTA_CONTEUDO, f"{chave}.qbc"))
+
+
+def banco_do_conteudo(chave, gerar):
+    """
+    Handle para questões sem arquivo de origem estável (uploads, PDFs).
+    ``chave`` identifica o conteúdo (hash); ``gerar()`` só roda se o banco
+    não estiver nem em memória nem em ``.cache/bancos/conteudo`` — também
+    depois de um despejo, se o arquivo não pôde ser gravado ou foi podado.
+    """
+    caminho = os.path.join(PASTA_CONTEUDO, f"{chave}.qbc")
+    carregar = partial(_carregar_conteudo, caminho)
+
+    def carregar_ou_gerar():
+        try:
+            return carregar()
+        except LookupError:
+            pass
+        dados = serializar(gerar())
+        try:
+            cache_disco.gravar_atomico(caminho, dados)
+            cache_disco.podar(PASTA_CONTEUDO, LIMITE_DISCO_CONTEUDO, ".qbc")
+        except OSError:
+            pass
+        return BancoCompilado(dados)
+
+    handle = HandleBanco(("conteudo", chave), carregar_ou_gerar)
+    handle.banco()
+    return handle
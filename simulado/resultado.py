@@ -1,12 +1,10 @@
 import streamlit as st
+from simulado.placar import placar_atual, reiniciar_respostas
 
 
 def tela_resultado(questoes):
     respondidas = len(st.session_state.respostas)
-    acertos = sum(
-        1 for qid, resp in st.session_state.respostas.items()
-        if any(q["alternativas"][ord(resp) - ord('A')] == q["gabarito"] for q in questoes if q["id"] == qid)
-    )
+    acertos = placar_atual(questoes)["acertos"]
     porcentagem = (acertos / respondidas * 100) if respondidas > 0 else 0
 
     st.markdown("---")
@@ -16,11 +14,10 @@ def tela_resultado(questoes):
     st.metric("Erros", f"{respondidas - acertos}/{respondidas}")
 
     blocos_html = '<div style="display:flex;flex-wrap:wrap;gap:6px;margin:16px 0">'
-    for i, q in enumerate(questoes):
-        qid = q["id"]
+    for i, qid in enumerate(questoes.ids):
         resp = st.session_state.respostas.get(qid)
         if resp is not None:
-            cor = "#28a745" if q["alternativas"][ord(resp) - ord('A')] == q["gabarito"] else "#dc3545"
+            cor = "#28a745" if resp in questoes.letras_corretas(i) else "#dc3545"
         else:
             cor = "#aaaaaa"
         blocos_html += (
@@ -34,11 +31,6 @@ def tela_resultado(questoes):
     st.markdown(blocos_html, unsafe_allow_html=True)
 
     if st.button("🔄 Reiniciar", use_container_width=True):
-        st.session_state.idx = 0
-        st.session_state.respostas = {}
-        st.session_state.respondidas = {}
-        st.session_state.mostrar_gabarito = {}
-        st.session_state.eliminadas = {}
-        st.session_state.finalizado = False
+        reiniciar_respostas()
         st.rerun()
     st.stop()
@@ -0,0 +1,216 @@
+"""
+Fila local de processamento de PDFs, compartilhada por todas as sessões.
+
+Cada pedido vira uma ``Tarefa`` identificada por uma chave de conteúdo
+(hash do arquivo + operação). Pedidos com a mesma chave enquanto a tarefa
+existe recebem a mesma tarefa: uma turma inteira enviando o mesmo PDF gera
+um único processamento. No máximo ``MAX_TAREFAS`` tarefas rodam ao mesmo
+tempo (as demais esperam ``"na_fila"``), e o trabalho pesado vai para um
+único pool de processos, limitado a ``WORKERS`` e aquecido com fitz e
+pdfplumber já importados.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import fonte_pdf
+from extrator_questoes import WORKERS_EXTRACAO
+
+MAX_TAREFAS = int(os.environ.get("TAREFAS_SIMULTANEAS", "4"))
+WORKERS = WORKERS_EXTRACAO or os.cpu_count() or 1
+# Tarefas concluídas continuam respondendo pela chave durante este tempo.
+RETENCAO_SEGUNDOS = 600
+
+ESTADOS = ("na_fila", "executando", "concluida", "erro")
+
+
+def _aquecer():
+    """Initializer dos processos: paga as importações antes do primeiro pedido."""
+    try:
+        import fitz  # noqa: F401
+    except ImportError:
+        pass
+    try:
+        import pdfplumber  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _nada():
+    return os.getpid()
+
+
+_trava = threading.Lock()
+_pool = None
+_coordenadores = None
+# chave -> Tarefa
+_tarefas = {}
+
+
+def pool():
+    """O pool de processos compartilhado, criado (e aquecido) no primeiro uso."""
+    global _pool
+    with _trava:
+        # Um processo morto (falta de memória, PDF que derruba o fitz) quebra
+        # o executor inteiro; o próximo pedido recebe um pool novo.
+        if _pool is None or getattr(_pool, "_broken", False):
+            fonte_pdf.iniciar_rastreador()
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, initializer=_aquecer)
+            for _ in range(WORKERS):
+                _pool.submit(_nada)
+        return _pool
+
+
+def aquecer():
+    pool()
+
+
+def _executor_tarefas():
+    global _coordenadores
+    with _trava:
+        if _coordenadores is None:
+            _coordenadores = ThreadPoolExecutor(max_workers=MAX_TAREFAS, thread_name_prefix="tarefa-pdf")
+        return _coordenadores
+
+
+class Tarefa:
+    """
+    Um processamento na fila. ``executar(tarefa)`` roda numa thread da fila;
+    pode publicar resultados parciais com ``publicar`` e informar o andamento
+    com ``atualizar_progresso``. O retorno vira ``resultado``.
+    """
+
+    def __init__(self, chave, executar):
+        self.chave = chave
+        self._executar = executar
+        self.estado = "na_fila"
+        self.feito = 0
+        self.total = None
+        self.itens = []
+        self.resultado = None
+        self.erro = None
+        self.criada_em = time.time()
+        self.iniciada_em = None
+        self.concluida_em = None
+        self._fim = threading.Event()
+
+    @property
+    def concluida(self):
+        return self._fim.is_set()
+
+    def publicar(self, item):
+        self.itens.append(item)
+
+    def atualizar_progresso(self, feito, total=None):
+        self.feito = feito
+        if total is not None:
+            self.total = total
+
+    def fracao(self):
+        return min(1.0, self.feito / self.total) if self.total else 0.0
+
+    def status(self):
+        return {
+            "chave": self.chave,
+            "estado": self.estado,
+            "feito": self.feito,
+            "total": self.total,
+            "itens": len(self.itens),
+            "erro": None if self.erro is None else str(self.erro),
+            "espera": (self.iniciada_em or time.time()) - self.criada_em,
+            "duracao": None if self.iniciada_em is None else (self.concluida_em or time.time()) - self.iniciada_em,
+        }
+
+    def aguardar(self, timeout=None, ao_progredir=None, intervalo=0.2):
+        """
+        Bloqueia até a tarefa terminar e devolve o resultado (ou levanta o
+        erro dela). ``ao_progredir(tarefa)`` é chamado a cada ``intervalo``.
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        while not self._fim.wait(intervalo):
+            if ao_progredir:
+                ao_progredir(self)
+            if limite is not None and time.monotonic() >= limite:
+                raise TimeoutError(f"Tarefa {self.chave} não terminou em {timeout}s.")
+        if ao_progredir:
+            ao_progredir(self)
+        if self.erro is not None:
+            raise self.erro
+        return self.resultado
+
+    def _rodar(self):
+        self.estado = "executando"
+        self.iniciada_em = time.time()
+        try:
+            self.resultado = self._executar(self)
+            self.estado = "concluida"
+        except Exception as e:
+            self.erro = e
+            self.estado = "erro"
+        finally:
+            self.concluida_em = time.time()
+            self._fim.set()
+
+
+def conforme_concluem(tarefas, ao_progredir=None, intervalo=0.2):
+    """
+    Entrega cada uma das ``tarefas`` assim que termina, na ordem em que
+    terminam (como ``concurrent.futures.as_completed``); o resultado ou o
+    erro ficam na própria tarefa. ``ao_progredir(tarefas)`` é chamado a cada
+    ``intervalo`` enquanto alguma estiver pendente.
+    """
+    pendentes = list(dict.fromkeys(tarefas))
+    while pendentes:
+        concluidas = [t for t in pendentes if t.concluida]
+        if not concluidas:
+            if ao_progredir:
+                ao_progredir(tarefas)
+            pendentes[0]._fim.wait(intervalo)
+            continue
+        for tarefa in concluidas:
+            pendentes.remove(tarefa)
+            yield tarefa
+    if ao_progredir:
+        ao_progredir(tarefas)
+
+
+def _limpar_antigas(agora):
+    for chave, tarefa in list(_tarefas.items()):
+        if tarefa.concluida and (tarefa.erro is not None or agora - tarefa.concluida_em > RETENCAO_SEGUNDOS):
+            del _tarefas[chave]
+
+
+def submeter(chave, executar):
+    """
+    Tarefa da ``chave``, enfileirando ``executar`` só se não houver uma em
+    andamento (ou concluída há pouco) para o mesmo conteúdo. Tarefas que
+    falharam não são reaproveitadas: o próximo pedido tenta de novo.
+    """
+    with _trava:
+        _limpar_antigas(time.time())
+        tarefa = _tarefas.get(chave)
+        if tarefa is not None:
+            return tarefa
+        tarefa = Tarefa(chave, executar)
+        _tarefas[chave] = tarefa
+    _executor_tarefas().submit(tarefa._rodar)
+    return tarefa
+
+
+def obter(chave):
+    with _trava:
+        return _tarefas.get(chave)
+
+
+def status(chave):
+    tarefa = obter(chave)
+    return None if tarefa is None else tarefa.status()
+
+
+def listar():
+    with _trava:
+        tarefas = list(_tarefas.values())
+    return [t.status() for t in sorted(tarefas, key=lambda t: t.criada_em)]
+
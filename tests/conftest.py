@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do app ficam na raiz, como nos benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def _cache_temporario(tmp_path, monkeypatch):
+    """Cada teste roda numa pasta vazia: nada vai para o .cache (nem o images/) de verdade."""
+    monkeypatch.chdir(tmp_path)
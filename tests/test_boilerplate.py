@@ -0,0 +1,99 @@
+"""Detector de cabeçalhos e rodapés (boilerplate) e o texto colado, que não passa por ele."""
+
+import pytest
+
+from boilerplate import JANELA, MIN_PAGINAS, RAIO_MARCA, limpar_paginas
+from extrator_questoes import fitz, processar_pdf
+from transformacoes.texto import tratar_texto
+
+
+# Dígitos não distinguem linhas (viram "#"): o corpo de cada página muda nas palavras
+_ASSUNTOS = ["legalidade", "moralidade", "publicidade", "eficiência", "impessoalidade", "motivação",
+             "finalidade", "autotutela", "razoabilidade", "segurança", "continuidade", "isonomia"]
+
+
+def _pagina(n, corpo):
+    return "\n".join([f"Curso de Direito Administrativo - Aula {n % 3}", "Prof. Fulano", *corpo,
+                      f"Página {n} de 40", "www.exemplo.com.br"])
+
+
+@pytest.mark.parametrize("total", [MIN_PAGINAS, JANELA, JANELA + 5])
+def test_cabecalho_e_rodape_repetidos_saem_de_todas_as_paginas(total):
+    corpos = [[f"O princípio da {_ASSUNTOS[n]}.", f"Questão sobre {_ASSUNTOS[-n - 1]}."] for n in range(total)]
+    limpas = list(limpar_paginas(_pagina(n, corpo) for n, corpo in enumerate(corpos)))
+    assert limpas == ["\n".join(corpo) for corpo in corpos]
+
+
+def test_poucas_paginas_nao_perdem_nada():
+    paginas = [_pagina(n, [f"O princípio da {_ASSUNTOS[n]}."]) for n in range(MIN_PAGINAS - 1)]
+    assert list(limpar_paginas(paginas, "tec")) == paginas
+
+
+def test_linhas_estruturais_repetidas_ficam():
+    paginas = [f"Cabeçalho\nSobre {assunto}.\na) alternativa.\nGabarito: A" for assunto in _ASSUNTOS[:8]]
+    limpas = list(limpar_paginas(paginas, preservar=lambda linha: linha.startswith(("a)", "Gabarito:"))))
+    assert limpas == [f"Sobre {assunto}.\na) alternativa.\nGabarito: A" for assunto in _ASSUNTOS[:8]]
+
+
+def test_linha_conhecida_sai_mesmo_numa_pagina_so():
+    pagina = "Aula 1\nwww.grancursosonline.com.br 12\nconteúdo.\nViu algum erro neste material? " \
+             "Contate-nos em: degravacoes@grancursosonline.com.br"
+    assert list(limpar_paginas([pagina], "gran")) == ["Aula 1\nconteúdo."]
+
+
+def test_intervalo_curto_do_estrategia_tira_o_rodape_em_volta_da_marca():
+    # Com menos de MIN_PAGINAS não há frequência: sai a marca e RAIO_MARCA linhas de
+    # cada lado, contadas através da quebra de página.
+    corpo = [f"O princípio da {assunto}." for assunto in _ASSUNTOS]
+    rodape = [f"Prof. Fulano {n}" for n in range(RAIO_MARCA)]
+    primeira = corpo[:6] + rodape + ["www.estrategiaconcursos.com.br"]
+    segunda = rodape + corpo[6:]
+    limpas = list(limpar_paginas(["\n".join(primeira), "\n".join(segunda)], "estrategia"))
+    assert limpas == ["\n".join(corpo[:6]), "\n".join(corpo[6:])]
+
+
+def test_sem_marca_nada_sai_no_intervalo_curto():
+    paginas = ["Prof. Fulano\nquestão 1.", "Prof. Fulano\nquestão 2."]
+    assert list(limpar_paginas(paginas, "estrategia")) == paginas
+
+
+def test_rodape_www_do_tec_sai_em_pdf_curto(tmp_path):
+    # Com menos de MIN_PAGINAS o detector não conta nada: o link do TEC (diferente em
+    # cada página) e, com assunto, a linha seguinte saem pelo filtro de linhas www.
+    paginas = [
+        ["Caderno de Questões", "Gerado em 01/01/2026", "Filtros: Direito", "Direito - Tema 1",
+         "1) Enunciado um continua.", "a) alfa.", "b) beta.", "Gabarito: A", "www.tecconcursos.com.br/questoes/123"],
+        ["Cabecalho seguinte", "Direito - Tema 2", "2) Enunciado dois continua.", "a) gama.", "b) delta.",
+         "Gabarito: B", "www.tecconcursos.com.br/questoes/456"],
+    ]
+    assert len(paginas) < MIN_PAGINAS
+    doc = fitz.open()
+    for linhas in paginas:
+        pagina = doc.new_page()
+        for n, linha in enumerate(linhas):
+            pagina.insert_text((40, 60 + 20 * n), linha, fontsize=9)
+    caminho = str(tmp_path / "curto.pdf")
+    doc.save(caminho)
+    doc.close()
+
+    questoes = processar_pdf(caminho, com_assunto=True, workers=1, backend="fitz")
+    assert [(q.enunciado, q.assunto) for q in questoes] == [
+        ("Enunciado um continua.", "Direito - Tema 1"),
+        ("Enunciado dois continua.", "Direito - Tema 2"),
+    ]
+    assert [q.gabarito for q in processar_pdf(caminho, workers=1, backend="fitz")] == ["alfa.", "delta."]
+
+
+def test_tratar_texto_mantem_o_cabecalho_de_cada_questao():
+    # Regressão: com a frequência aplicada ao texto colado, o cabeçalho repetido
+    # de propósito em cada questão sumia.
+    colado = "".join(f"Questão {n}. Julgue o item a seguir.\nO ato {n} é\nvinculado.\n" for n in range(1, 4))
+    tratado = tratar_texto(colado)
+    assert tratado.count("Julgue o item a seguir.") == 3
+    assert "Questão 3." in tratado
+
+
+def test_tratar_texto_tira_link_e_aviso_da_gran_no_meio_da_linha():
+    colado = ("12m\nO princípio da legalidade www.grancursosonline.com.br 7 vincula a\nadministração. "
+              "Viu algum erro neste material? Contate-nos em: degravacoes@grancursosonline.com.br\nFim.")
+    assert tratar_texto(colado) == "O princípio da legalidade vincula a administração. Fim."
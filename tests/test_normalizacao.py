@@ -0,0 +1,107 @@
+"""Normalização em fluxo (extrator_questoes.normalizar_paginas) contra o texto inteiro."""
+
+import random
+import re
+
+import pytest
+
+from extrator_questoes import normalizar_paginas
+
+
+def _referencia(paginas, com_assunto):
+    """As regras sobre o documento inteiro, como eram antes da normalização em fluxo."""
+    texto = "".join(p.rstrip("\n") + "\n" for p in paginas)
+    texto = re.sub(r'\s{2,}', ' ', texto)
+    texto = '\n'.join(texto.split('\n')[3:])
+    linhas, pular_proxima = [], False
+    for linha in texto.split('\n'):
+        if pular_proxima:
+            pular_proxima = False
+            continue
+        if linha.startswith('www'):
+            pular_proxima = com_assunto
+            continue
+        linhas.append(linha)
+    texto = '\n'.join(linhas)
+    texto = re.sub(r'Certo\s+Errado\s+Gabarito:\s*Certo', 'a) Certo\nb) Errado\nGabarito: A', texto)
+    texto = re.sub(r'Certo\s+Errado\s+Gabarito:\s*Errado', 'a) Certo\nb) Errado\nGabarito: B', texto)
+    if com_assunto:
+        novas_linhas = []
+        for linha in texto.split('\n'):
+            if re.match(r'(?<!\()\d+\)\s*', linha):
+                if novas_linhas:
+                    novas_linhas[-1] = 'Assunto: ' + novas_linhas[-1].rstrip('.') + '.'
+                novas_linhas.append('Enunciado: ' + re.sub(r'(?<!\()\d+\)\s*', '', linha))
+            else:
+                novas_linhas.append(linha)
+        texto = '\n'.join(novas_linhas)
+    else:
+        texto = re.sub(r'(?<!\()\d+\)\s*', '', texto)
+    texto = re.sub(r'(Gabarito:\s[A-E])', r'\1.', texto, flags=re.MULTILINE)
+    texto = re.sub(r'(?<!\.|\:|\;)\n', ' ', texto)
+    texto = re.sub(r'(?<!\n)\s+([a-e]\))', r'\n\1', texto)
+    texto = re.sub(r'(?<!\n)(Gabarito:\s[A-E]\.)', r'\n\1', texto)
+    texto = re.sub(r'^([a-e]\).*)(?<![.;])$', r'\1.', texto, flags=re.MULTILINE)
+    return texto.replace(' .', '.')
+
+
+_TRECHOS = ["ato administrativo", "do art. 5", "(3) inciso", "alínea b) do", "12)", "a)", "c)",
+            "Certo", "Errado", "Gabarito: Certo", "Gabarito: Errado", "Gabarito: C", ".", ";", ":",
+            "  ", "\t", " "]
+
+
+def _caderno(rng, n_questoes):
+    """Linhas de um caderno do TEC, com ruído nas bordas das quebras."""
+    linhas = ["Caderno de Questões", "Gerado em 01/01/2026", "Filtros: Direito Administrativo"]
+    for q in range(1, n_questoes + 1):
+        linhas.append(f"Direito Administrativo - Tema {q % 5}")
+        linhas.append(f"{q}) " + " ".join(rng.choice(_TRECHOS) for _ in range(rng.randint(1, 8))))
+        if rng.random() < 0.3:
+            linhas += ["Certo", "Errado", rng.choice(["Gabarito: Certo", "Gabarito:Errado"])]
+        else:
+            for letra in "abcde"[:rng.randint(2, 5)]:
+                fim = rng.choice(["", ".", ";", " ", ":"])
+                linhas.append(f"{letra}) " + " ".join(rng.choice(_TRECHOS) for _ in range(rng.randint(1, 4))) + fim)
+            linhas.append(f"Gabarito: {rng.choice('ABCDE')}" + rng.choice(["", " ", "."]))
+        if rng.random() < 0.2:
+            linhas.append("")
+        if rng.random() < 0.05:
+            linhas.append(f"www.tecconcursos.com.br/questoes/{rng.randint(1, 9999)}")
+    return linhas
+
+
+def _paginas(rng, n_questoes, n_paginas):
+    """Páginas do caderno, quase todas com o rodapé do TEC (link diferente em cada uma)."""
+    linhas = _caderno(rng, n_questoes)
+    cortes = sorted(rng.sample(range(1, len(linhas)), n_paginas - 1))
+    paginas = []
+    for i, f in zip([0] + cortes, cortes + [len(linhas)]):
+        rodape = [f"www.tecconcursos.com.br/questoes/{rng.randint(1, 9999)}"] if rng.random() < 0.8 else []
+        paginas.append("\n".join(linhas[i:f] + rodape))
+    return paginas
+
+
+@pytest.mark.parametrize("com_assunto", [False, True])
+def test_segmentos_nao_mudam_o_texto(com_assunto):
+    rng = random.Random(10)
+    for _ in range(40):
+        paginas = _paginas(rng, rng.randint(3, 30), rng.randint(1, 6))
+        inteiro = "".join(normalizar_paginas(paginas, com_assunto, tamanho_segmento=10 ** 9))
+        for tamanho in (1, 40, 500):
+            assert "".join(normalizar_paginas(paginas, com_assunto, tamanho_segmento=tamanho)) == inteiro
+
+
+@pytest.mark.parametrize("com_assunto", [False, True])
+def test_igual_as_regras_no_documento_inteiro(com_assunto):
+    # Duas páginas: o detector de boilerplate ainda não tem frequência para remover
+    # nada, e o rodapé www só sai pelo filtro de linhas, como antes
+    rng = random.Random(11)
+    for _ in range(60):
+        paginas = _paginas(rng, rng.randint(3, 20), 2)
+        assert "".join(normalizar_paginas(paginas, com_assunto, tamanho_segmento=1)) == _referencia(paginas, com_assunto)
+
+
+def test_espacos_entre_paginas_colapsam_como_no_texto_inteiro():
+    paginas = ["a\nb\nc\n1) enunciado   ", "   continua.\na) x\nb) y\nGabarito: A"]
+    assert "".join(normalizar_paginas(paginas, tamanho_segmento=1)) == _referencia(paginas, False)
+
@@ -0,0 +1,104 @@
+"""Simulado que começa antes do fim do PDF: questões em fluxo e BancoParcial."""
+
+import random
+import threading
+
+from extrator_questoes import (
+    armazenar_questoes, armazenar_questoes_em_fluxo, fitz, processar_pdf, processar_pdf_em_fluxo,
+)
+from modelo_questao import Questao
+from simulado.progressivo import obter_ou_iniciar
+
+
+def _texto_normalizado(rng, n):
+    partes = []
+    for q in range(1, n + 1):
+        partes.append(f"Enunciado da questão {q} sobre o ato {rng.randint(1, 99)}.\n")
+        if rng.random() < 0.3:
+            partes.append(f"a) Certo\nb) Errado\nGabarito: {rng.choice('AB')}.\n")
+        else:
+            partes.extend(f"{letra}) alternativa {letra} da questão {q}.\n" for letra in "abcde")
+            partes.append(f"Gabarito: {rng.choice('ABCDE')}.\n")
+    return "".join(partes)
+
+
+def test_questoes_em_fluxo_iguais_as_do_texto_inteiro():
+    rng = random.Random(11)
+    for _ in range(20):
+        texto = _texto_normalizado(rng, 25)
+        cortes = sorted(rng.sample(range(1, len(texto)), 30))
+        pedacos = [texto[i:f] for i, f in zip([0] + cortes, cortes + [len(texto)])]
+        inteiro = armazenar_questoes(texto)
+        assert len(inteiro) == 25
+        assert list(armazenar_questoes_em_fluxo(pedacos)) == inteiro
+
+
+def test_questao_sai_quando_o_gabarito_esta_completo():
+    lidos = []
+
+    def pedacos():
+        for pedaco in ["Enunciado.\na) x.\nb) y.\nGabarito: B", ".\nOutro enunciado", " continua."]:
+            lidos.append(pedaco)
+            yield pedaco
+
+    fluxo = armazenar_questoes_em_fluxo(pedacos())
+    # "Gabarito: B" no fim do pedaço ainda pode ganhar mais texto na linha;
+    # com ".\n" e o começo da linha seguinte, a questão já sai
+    assert next(fluxo).gabarito == "y."
+    assert len(lidos) == 2
+
+
+def _gerar_pdf(caminho, n_questoes):
+    doc = fitz.open()
+    linhas = ["Caderno de Questões", "Gerado em 01/01/2026", "Filtros: Direito Administrativo"]
+    for q in range(1, n_questoes + 1):
+        linhas.append(f"{q}) Considere o ato administrativo {q} e assinale a correta.")
+        linhas += [f"{letra}) alternativa {letra} da questão {q}." for letra in "abcde"]
+        linhas.append(f"Gabarito: {'ABCDE'[q % 5]}")
+    for inicio in range(0, len(linhas), 30):
+        pagina = doc.new_page()
+        for n, linha in enumerate(linhas[inicio:inicio + 30]):
+            pagina.insert_text((40, 60 + 20 * n), linha, fontsize=9)
+    doc.save(caminho)
+    doc.close()
+
+
+def test_pdf_em_fluxo_igual_ao_pdf_inteiro(tmp_path):
+    caminho = str(tmp_path / "caderno.pdf")
+    _gerar_pdf(caminho, 40)
+    andamento = []
+    em_fluxo = list(processar_pdf_em_fluxo(caminho, workers=1, backend="fitz",
+                                           progresso=lambda feito, total: andamento.append((feito, total))))
+    assert len(em_fluxo) == 40
+    assert em_fluxo == processar_pdf(caminho, workers=1, backend="fitz")
+    assert andamento[-1][0] == andamento[-1][1]
+
+
+def test_banco_parcial_cresce_antes_de_concluir():
+    liberar, concluidas = threading.Event(), []
+
+    def gerar(progresso):
+        progresso(1, 2)
+        yield Questao(1, "primeira", ("x", "y"), "x")
+        assert liberar.wait(10)
+        progresso(2, 2)
+        yield Questao(2, "segunda", ("x", "y"), "y")
+
+    banco = obter_ou_iniciar("teste-progressivo", gerar, concluidas.append)
+    try:
+        # Outra sessão com o mesmo conteúdo recebe a mesma tarefa
+        assert obter_ou_iniciar("teste-progressivo", gerar, concluidas.append).tarefa is banco.tarefa
+        for _ in range(200):
+            if len(banco):
+                break
+            threading.Event().wait(0.01)
+        assert len(banco) == 1 and not banco.concluido
+        assert banco[0].enunciado == "primeira"
+        assert banco.paginas_lidas == 1 and banco.total_paginas == 2
+    finally:
+        liberar.set()
+    banco.tarefa.aguardar(timeout=10)
+    assert banco.concluido and banco.erro is None
+    assert len(banco) == 2 and banco.posicao(2) == 1
+    assert banco.acertou(2, "B") and not banco.acertou(1, "B")
+    assert concluidas == [banco.lista()]
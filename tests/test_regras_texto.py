@@ -0,0 +1,82 @@
+"""Conjuntos de regras compilados (regras_texto) contra as regras aplicadas uma a uma."""
+
+import random
+import re
+
+import pytest
+
+import regras_paginas  # noqa: F401 (registra os conjuntos das páginas em CONJUNTOS)
+from regras_texto import CONJUNTOS, ConjuntoRegras, aplicar, cortar_ate_ultimo, remover_linhas_com, substituir, trocar
+
+# Só os das páginas: os criados pelos testes abaixo entram depois da coleta
+CONJUNTOS_PAGINAS = sorted(CONJUNTOS)
+
+_TOKENS = ["\n", "\n", " ", "  ", "\t", " ", ".", "..", ";", ":", "|", "(", ")", "-", "/", "–", "—",
+           "a)", "b)", "E)", "1)", "12.", "7 3", "25m", "2023", "- 2021", "/ 2019", "Certo", "Errado",
+           "Gabarito:", "Gabarito: A", "Gabarito ", "<br>", "<br>|", "Assuntos)", "Caderno de Questões",
+           "www.tecconcursos.com.br", "www.grancursosonline.com.br 3", " (EXCETO", "==a1b2c3==", "@@Q@@",
+           "alternativa. <br>", "questão. <br>", "aB", "Lei", "ato", "Viu algum erro neste material? "
+           "Contate-nos em: degravacoes@grancursosonline.com.br"]
+
+
+def _textos(conjunto, n, seed):
+    # Os literais das próprias regras garantem que cada troca tenha o que trocar
+    tokens = _TOKENS + [r.padrao for r in conjunto.regras if r.tipo == "literal"]
+    rng = random.Random(seed)
+    return ["".join(rng.choice(tokens) for _ in range(rng.randint(0, 40))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("nome", CONJUNTOS_PAGINAS)
+def test_compilado_igual_as_regras_em_ordem(nome):
+    conjunto = CONJUNTOS[nome]
+    for texto in _textos(conjunto, 400, nome):
+        assert conjunto(texto) == conjunto.aplicar_em_ordem(texto), texto
+
+
+def _tipos(conjunto):
+    return [regra.tipo for passo in conjunto.passos for regra in passo.regras]
+
+
+@pytest.mark.parametrize("padrao, literal", [
+    (r'<br>\|', '<br>|'), (r'\n\n', '\n\n'), (r'Certo Errado', 'Certo Errado'), (r'\.\.', '..'), (r'[.]', '.'),
+])
+def test_regex_literal_vira_troca(padrao, literal):
+    conjunto = ConjuntoRegras("teste.literal", "1", [substituir(padrao, 'x')])
+    assert _tipos(conjunto) == ["literal"]
+    assert conjunto.passos[0].regras[0].padrao == literal
+
+
+@pytest.mark.parametrize("regra", [
+    substituir(r'a.b', 'x'),                      # metacaractere
+    substituir(r'^<br>', ''),                     # âncora
+    substituir(r'(Certo)', r'[\1]'),              # referência na troca
+    substituir(r'Certo', r'a\nb'),                # escape na troca
+    substituir(r'Certo', 'x', re.IGNORECASE),     # flag
+    substituir(r'(?i)Certo', 'x'),                # flag no padrão
+    substituir(r'Certo', lambda m: 'x'),          # troca por função
+])
+def test_regex_que_nao_e_literal_continua_regex(regra):
+    assert _tipos(ConjuntoRegras("teste.regex", "1", [regra])) == ["regex"]
+
+
+def test_trocas_vizinhas_viram_um_passo():
+    conjunto = ConjuntoRegras("teste.passos", "1", [
+        trocar("a", "b"), substituir(r'b', 'c'), substituir(r'c+', 'd'), trocar("d", "e"), aplicar(str.strip),
+        trocar("e", "f"),
+    ])
+    assert [len(passo.regras) for passo in conjunto.passos] == [2, 1, 1, 1, 1]
+    assert conjunto(" aabbcc ") == conjunto.aplicar_em_ordem(" aabbcc ") == "f"
+
+
+@pytest.mark.parametrize("regra", [cortar_ate_ultimo("Assuntos)"), remover_linhas_com("Caderno de Questões")])
+def test_regra_linear_igual_a_regex_de_referencia(regra):
+    padrao, troca, flags = regra.referencia
+    rng = random.Random(24)
+    tokens = ["Assuntos)", "Caderno de Questões", "\n", "\n", "x", " ", "Assuntos"]
+    for _ in range(500):
+        texto = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 30)))
+        assert regra.padrao(texto) == re.sub(padrao, troca, texto, flags=flags), texto
+
+
+def test_versao_entra_na_chave():
+    assert ConjuntoRegras("teste.chave", "7", []).chave == "teste.chave@7"
@@ -0,0 +1,9 @@
+"""
+Transformações das páginas de limpeza e de Anki, sem Streamlit.
+
+Um módulo por página: ``texto`` (tratar_texto), ``transformador_tec``
+(transformador_anki), ``alternativas_tec`` (tec_todas_alternativas_anki),
+``edital`` (organizar_conteudo_edital), ``estrategia`` e
+``estrategia_sem_ano``. As páginas só cuidam da tela; ``lote`` roda as
+mesmas transformações em pastas inteiras, pela linha de comando.
+"""
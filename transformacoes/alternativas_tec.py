@@ -0,0 +1,152 @@
+"""Questões do TEC em cards, um por alternativa (pages/tec_todas_alternativas_anki.py)."""
+
+import re
+
+from regras_paginas import TEC_TODAS_ALTERNATIVAS
+
+# Padrões de gerar_cards, compilados uma vez
+_GABARITO = re.compile(r'\|Gabarito\s*([A-Za-zÀ-ÿ0-9]+)', re.IGNORECASE)
+_GABARITO_SOLTO = re.compile(r'Gabarito[:\s]*([A-Za-zÀ-ÿ0-9]+)', re.IGNORECASE)
+_TRECHO_GABARITO = re.compile(r'\|?Gabarito[:\s]*[A-Za-zÀ-ÿ0-9]+', re.IGNORECASE)
+_LINHA_GABARITO = re.compile(r'^\|?Gabarito', re.IGNORECASE)
+_NUMERO_QUESTAO = re.compile(r'^\s*\d+\)\s*')
+_PRIMEIRA_ALTERNATIVA = re.compile(r'<br>\s*a\)', re.IGNORECASE)
+_ALTERNATIVA_BR = re.compile(r'<br>\s*[a-e]\)', re.IGNORECASE)
+_ALTERNATIVA_LINHA = re.compile(r'^[a-e]\)', re.IGNORECASE)
+_CERTO_ERRADO = re.compile(r'<br>\s*(?:Certo|Errado)\s*(?:<br>|$)', re.IGNORECASE)
+_DIVISAO_CERTO_ERRADO = re.compile(r'<br>\s*(?:Certo|Errado)\s*', re.IGNORECASE)
+# Alternativas precedidas de <br>a) ... até o próximo <br>[b-e]) ou o fim; e sem o <br>
+_ALTERNATIVAS = re.compile(r'<br>\s*([a-e])\)\s*(.*?)(?=(?:<br>\s*[a-e]\)|$))', re.IGNORECASE | re.DOTALL)
+_ALTERNATIVAS_SEM_BR = re.compile(r'([a-e])\)\s*(.*?)(?=(?:[a-e]\)|$))', re.IGNORECASE | re.DOTALL)
+
+
+def tratar_texto(texto):
+    """
+    Pré-tratamento:
+    - remove cabeçalho até 'Assuntos)'
+    - remove linhas que começam com www.
+    - marca questões antes de transformar quebras de linha em <br>
+    - converte 'Gabarito:' em '|Gabarito'
+    - limpezas diversas
+    """
+    # Regras em regras_paginas.TEC_TODAS_ALTERNATIVAS
+    return TEC_TODAS_ALTERNATIVAS(texto)
+
+
+def gerar_cards(texto_tratado):
+    """
+    Processa o texto tratado e gera linhas no formato:
+    Frente[TAB]Verso
+    - Para questões com alternativas (a-e): gera 1 card por alternativa.
+    - Para questões do tipo "Certo / Errado" (sem alternativas letra): gera 1 card com frente=enunciado e verso=gabarito.
+    """
+
+    # Cada bloco separado por linha (marcada antes com \n)
+    blocos = [b.strip() for b in texto_tratado.split('\n') if b.strip()]
+    cards = []
+
+    for bloco in blocos:
+        # localizar gabarito (pode ser letra A-E ou palavra Certo/Errado)
+        gabarito_match = _GABARITO.search(bloco)
+        if not gabarito_match:
+            # tenta também caso "Gabarito:" tenha sido escrito de outro jeito ou esteja em linha separada
+            gabarito_match = _GABARITO_SOLTO.search(bloco)
+            if not gabarito_match:
+                continue
+        gabarito_raw = gabarito_match.group(1).strip()
+        gabarito_up = gabarito_raw.upper()
+
+        # remover trecho do gabarito do bloco para não atrapalhar extração de enunciado/alternativas
+        # Remove tanto "|Gabarito" quanto "Gabarito:" seguido de letra/palavra (em qualquer posição)
+        bloco_sem_gab = _TRECHO_GABARITO.sub('', bloco).strip()
+
+        # remover marcador inicial tipo "1)" caso exista
+        bloco_sem_gab = _NUMERO_QUESTAO.sub('', bloco_sem_gab)
+
+        # Extrair enunciado completo: tudo até a primeira alternativa "a)" ou até "Certo/Errado"
+        enunciado = ""
+        
+        # Tentar encontrar onde começa a primeira alternativa ou Certo/Errado
+        match_primeira_alt = _PRIMEIRA_ALTERNATIVA.search(bloco_sem_gab)
+        match_certo_errado = _CERTO_ERRADO.search(bloco_sem_gab)
+        
+        # Determinar onde o enunciado termina
+        if match_primeira_alt:
+            enunciado = bloco_sem_gab[:match_primeira_alt.start()].strip()
+        elif match_certo_errado:
+            enunciado = bloco_sem_gab[:match_certo_errado.start()].strip()
+        else:
+            # Se não encontrou nada, pega tudo
+            enunciado = bloco_sem_gab.strip()
+        
+        # Remover <br> extras no início e fim do enunciado
+        enunciado = enunciado.strip('<br>').strip()
+
+        # Preparar versão em texto "limpo" (substituir <br> por \n) para detectar linhas do tipo "Certo" / "Errado"
+        plain = bloco_sem_gab.replace('<br>', '\n')
+        linhas = [l.strip() for l in plain.splitlines() if l.strip()]
+
+        # Detectar se há alternativas com letras (a) b) c) ...)
+        tem_alternativas_com_letra = bool(_ALTERNATIVA_BR.search(bloco_sem_gab) or
+                                     any(_ALTERNATIVA_LINHA.match(l) for l in linhas))
+
+        # Detectar se é questão do tipo "Certo/Errado"
+        linhas_sem_gab = [l for l in linhas if not _LINHA_GABARITO.match(l)]
+        somente_ce = False
+
+        if not tem_alternativas_com_letra:
+            ce_items = [l.lower() for l in linhas_sem_gab if l.lower() in ('certo', 'errado')]
+            if ce_items:
+                somente_ce = True
+
+        # Se for questão tipo Certo/Errado -> extrair enunciado completo corretamente
+        if somente_ce:
+            # extrair tudo até a primeira ocorrência de "Certo" ou "Errado"
+            partes_ce = _DIVISAO_CERTO_ERRADO.split(bloco_sem_gab, maxsplit=1)
+            enunciado_ce = partes_ce[0].strip()
+            
+            # Limpar tags <br> no início e fim, mas manter <br> internos
+            enunciado_ce = enunciado_ce.strip('<br>').strip()
+
+            frente = enunciado_ce
+
+            # determinar verso pelo gabarito
+            if gabarito_up.startswith('C'):
+                verso = "Certo"
+            elif gabarito_up.startswith('E'):
+                verso = "Errado"
+            else:
+                verso = gabarito_raw
+
+            cards.append(f"{frente}\t{verso}")
+            continue
+
+        # Caso padrão: tem alternativas com letras -> criar 1 card por alternativa
+        # Expressão robusta para capturar alternativas preceded by <br>a) ... until next <br>[b-e]) or end
+        alternativas_matches = _ALTERNATIVAS.findall(bloco_sem_gab)
+
+        # fallback: tentar sem <br> (apenas em caso de variação do formato)
+        if not alternativas_matches:
+            alternativas_matches = _ALTERNATIVAS_SEM_BR.findall(bloco_sem_gab)
+
+        if not alternativas_matches:
+            # se ainda não encontrou alternativas, pular (ou poderia criar card único)
+            continue
+
+        # gerar cards por alternativa
+        for letra, texto_alt in alternativas_matches:
+            letra = letra.upper()
+            # Manter <br> no texto da alternativa, apenas limpar início/fim
+            texto_alt = texto_alt.strip()
+            # Remover qualquer resíduo de gabarito que possa ter ficado
+            texto_alt = _TRECHO_GABARITO.sub('', texto_alt).strip()
+            frente = f"{enunciado} {texto_alt}".strip()
+            verso = "Certo" if letra == gabarito_up else "Errado"
+            cards.append(f"{frente}\t{verso}")
+
+    return "\n".join(cards)
+
+
+def transformar(texto):
+    """O botão "Processar Texto": ``tratar_texto`` e ``gerar_cards``."""
+    return gerar_cards(tratar_texto(texto))
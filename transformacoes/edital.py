@@ -0,0 +1,88 @@
+"""Conteúdo programático do edital em itens numerados (pages/organizar_conteudo_edital.py)."""
+
+import re
+
+from regras_paginas import ORGANIZAR_EDITAL
+
+# Títulos: texto em maiúsculas seguido de ':'
+_TITULO = re.compile(r'([A-ZÀÁÂÃÉÊÍÓÔÕÚÇ][A-ZÀÁÂÃÉÊÍÓÔÕÚÇ\s,:-]+):\s*')
+# Itens numerados (ex: "1 ", "4.1 ", "5.3.2 "), sem números depois de /
+_ITEM_NUMERADO = re.compile(r'(?<![/\d])(\d+(?:\.\d+)*)\s+(?=[A-ZÀÁÂÃÉÊÍÓÔÕÚÇ])')
+_ESPACOS = re.compile(r'\s+')
+
+
+def organizar_texto(texto):
+    # Números de páginas, exceções entre parênteses, quebras de linha fora de
+    # fim de frase e espaços repetidos: ver regras_paginas.ORGANIZAR_EDITAL
+    texto = ORGANIZAR_EDITAL(texto)
+    
+    linhas_formatadas = []
+    
+    # Encontra todos os títulos (texto em maiúsculas seguido de ':')
+    # e divide o texto mantendo os títulos
+    matches = list(_TITULO.finditer(texto))
+    
+    if not matches:
+        # Se não encontrou títulos, processa o texto inteiro
+        conteudo = texto
+        processar_conteudo(conteudo, linhas_formatadas)
+    else:
+        # Processa cada seção (título + conteúdo)
+        for i, match in enumerate(matches):
+            titulo = match.group(1).strip()
+            # Adiciona linha em branco antes do título (exceto no primeiro)
+            if i > 0:
+                linhas_formatadas.append("")
+            linhas_formatadas.append(f"{titulo}:")
+            
+            # Pega o conteúdo entre este título e o próximo (ou fim)
+            start_conteudo = match.end()
+            if i + 1 < len(matches):
+                end_conteudo = matches[i + 1].start()
+            else:
+                end_conteudo = len(texto)
+            
+            conteudo = texto[start_conteudo:end_conteudo].strip()
+            processar_conteudo(conteudo, linhas_formatadas)
+    
+    return "\n".join(linhas_formatadas)
+
+
+def processar_conteudo(conteudo, linhas_formatadas):
+    """Processa o conteúdo identificando e formatando itens numerados"""
+    if not conteudo:
+        return
+    
+    # Padrão para encontrar itens numerados (ex: "1 ", "4.1 ", "5.3.2 ")
+    # Garante que não capture números que fazem parte de códigos com /
+    # Usa lookbehind negativo para ignorar números após /
+    matches = list(_ITEM_NUMERADO.finditer(conteudo))
+    
+    if not matches:
+        # Se não há números, adiciona o conteúdo como está
+        linhas_formatadas.append(conteudo)
+        return
+    
+    # Processa cada item numerado
+    for i, match in enumerate(matches):
+        numero = match.group(1)
+        start_pos = match.end()
+        
+        # Define onde termina este item (começo do próximo ou fim do texto)
+        if i + 1 < len(matches):
+            end_pos = matches[i + 1].start()
+        else:
+            end_pos = len(conteudo)
+        
+        # Extrai o texto do item
+        texto_item = conteudo[start_pos:end_pos].strip()
+        
+        # Remove espaços extras
+        texto_item = _ESPACOS.sub(' ', texto_item)
+        
+        # Calcula a profundidade (quantidade de pontos no número)
+        profundidade = numero.count(".")
+        tab = "\t" * profundidade
+        
+        # Adiciona o item formatado
+        linhas_formatadas.append(f"{tab}{numero} {texto_item}")
@@ -0,0 +1,141 @@
+"""
+Questões comentadas dos PDFs do Estratégia em cards Pergunta|Resposta
+(pages/estrategia_anki.py): ``extrair_texto`` lê o PDF e ``transformar``
+divide o texto nas questões, que são reconhecidas pela data da prova
+("(FGV - ... - 2023)").
+"""
+
+import re
+
+import perfil
+from boilerplate import limpar_paginas
+from extrator_questoes import iterar_paginas_fitz
+from regras_paginas import ESTRATEGIA_MARCAR, ESTRATEGIA_POS, ESTRATEGIA_QUESTAO, ESTRATEGIA_TRACOS
+
+
+class SemDivisaoDeQuestoes(ValueError):
+    """Nenhuma data de prova ("- 2023", "/ 2023") para dividir o texto em questões."""
+
+
+_COMENTARIO = re.compile(r'Comentários?:', re.IGNORECASE)
+# Corte cosmético: "Gabarito: Letra X" ou "Questão Correta" no final da questão
+_CORTE_GABARITO = re.compile(
+    r'\bGabarito\b(?!\s+da)'
+    r'(?=(?:\s*(?:é|:)\s*(?:a\s+)?)?(?:\s*(?:letra|item)?\s*[A-E]\b\.?))'
+    r'(?:\s*(?:é|:)\s*(?:a\s+)?)?(?:\s*(?:letra|item)?\s*[A-E]\b\.?)'
+    r'|Questão\s+(?:correta|certa|incorreta|errada)\.?',
+    re.IGNORECASE,
+)
+
+
+@perfil.medir("estrategia.normalizar_tracos")
+def normalizar_tracos(txt):
+    # Traços, espaços especiais, números soltos e marcas ==xxxxxx==: regras_paginas.ESTRATEGIA_TRACOS
+    return ESTRATEGIA_TRACOS(txt)
+
+
+def validar_bloco_questao(texto):
+    """
+    Verifica se o bloco é válido.
+    Exige apenas:
+    1. Presença de 'Comentários'.
+    2. Conteúdo de pergunta antes do comentário (> 30 chars).
+    """
+    match_comentario = _COMENTARIO.search(texto)
+    
+    if match_comentario:
+        conteudo_antes = texto[:match_comentario.start()].strip()
+        # Exige pelo menos 30 caracteres para considerar uma pergunta válida
+        tem_pergunta = len(conteudo_antes) > 30
+        return tem_pergunta
+    
+    return False
+
+
+def formatar_questao_final(texto_bloco):
+    """
+    Aplica formatações e insere o PIPE.
+    """
+    # 1-3. Numeração inicial, <br> antes das alternativas e quebras de linha:
+    # regras_paginas.ESTRATEGIA_QUESTAO
+    texto_unido = ESTRATEGIA_QUESTAO(texto_bloco)
+
+    # 4. CORTE COSMÉTICO (Gabarito final)
+    # Tenta cortar se achar "Gabarito: Letra X" ou "Questão Correta" no final da string
+    match_corte = _CORTE_GABARITO.search(texto_unido)
+    if match_corte:
+        texto_unido = texto_unido[:match_corte.end()]
+
+    # 5. Inserir o PIPE (|)
+    # Divisor: palavra "Comentários"
+    match_sep = _COMENTARIO.search(texto_unido)
+    
+    if match_sep:
+        idx = match_sep.start()
+        parte_pergunta = texto_unido[:idx].strip()
+        parte_resposta = texto_unido[idx:].strip()
+        
+        if parte_pergunta:
+            final = f"{parte_pergunta}|{parte_resposta}"
+        else:
+            final = texto_unido
+    else:
+        final = texto_unido
+
+    return final
+
+
+@perfil.medir("estrategia.processar_texto")
+def processar_texto(texto_bruto):
+    # 1. Normalização e Limpeza de Rodapé
+    # (cabeçalhos e rodapés já saíram na extração, pelo detector de boilerplate)
+    texto_limpo = normalizar_tracos(texto_bruto)
+
+    # 2. Pré-tratamento do "Gabarito:" (ponto e quebra depois de até 3 palavras)
+    # 3. Padrão agressivo: ";;;" antes de cada "(... - 20XX)"
+    # (regras_paginas.ESTRATEGIA_MARCAR)
+    texto_marcado = ESTRATEGIA_MARCAR(texto_limpo)
+
+    # Verifica se o marcador foi inserido (debugging visual)
+    if ";;;" not in texto_marcado:
+        raise SemDivisaoDeQuestoes("ERRO CRÍTICO: O padrão de data (ex: '- 2023' ou '/ 2023') não foi encontrado no texto. O PDF pode estar com formatação muito irregular.")
+
+    # 4. DIVISÃO
+    blocos = texto_marcado.split(';;;')
+    
+    questoes_finais = []
+    
+    for bloco in blocos:
+        if not bloco.strip():
+            continue
+            
+        # 4. VALIDAÇÃO (Requer apenas Comentários + Pergunta)
+        if validar_bloco_questao(bloco):
+            questao_formatada = formatar_questao_final(bloco)
+            questoes_finais.append(questao_formatada)
+    
+    return "\n".join(questoes_finais)
+
+
+@perfil.medir("estrategia.pos_processar_texto")
+def pos_processar_texto(texto):
+    return ESTRATEGIA_POS(texto)
+
+
+def extrair_texto(fonte, inicio=0, fim=None, progresso=None, pool=None, digest=None, workers=None):
+    """
+    Texto das páginas ``inicio``..``fim - 1`` (fim None: até a última), sem
+    cabeçalhos e rodapés, uma página depois da outra. Os demais parâmetros
+    vão para ``extrator_questoes.iterar_paginas_fitz``.
+    """
+    paginas = iterar_paginas_fitz(fonte, inicio, fim, progresso=progresso, pool=pool, digest=digest, workers=workers)
+    paginas = perfil.medir_fluxo("estrategia.boilerplate", limpar_paginas((p for p in paginas if p), "estrategia"))
+    texto = "".join(texto_pagina + "\n" for texto_pagina in paginas)
+    # Remontado por linhas, como fazia a limpeza de rodapé antiga: o fim fica
+    # com uma quebra só, e o gabarito da última questão ganha o ponto como as outras.
+    return "\n".join(texto.splitlines())
+
+
+def transformar(texto_bruto):
+    """Texto extraído -> um card por linha (``processar_texto`` e ``pos_processar_texto``)."""
+    return pos_processar_texto(processar_texto(texto_bruto))
@@ -0,0 +1,80 @@
+"""
+Variante de ``estrategia`` para questões sem o ano da prova
+(pages/(sem ano) estrategia_anki.py): as questões são divididas pelo
+cabeçalho "1. (BANCA - ÓRGÃO - 202X)". A extração do PDF e a
+normalização do texto são as mesmas.
+"""
+
+import re
+
+from regras_paginas import ESTRATEGIA_SEM_ANO_POS, ESTRATEGIA_SEM_ANO_QUESTAO
+# extrair_texto fica exposto aqui também: a extração é a mesma
+from transformacoes.estrategia import extrair_texto, normalizar_tracos, validar_bloco_questao  # noqa: F401
+
+_COMENTARIO = re.compile(r'Comentários?:', re.IGNORECASE)
+_GABARITO_FINAL = re.compile(r'(Gabarito\s*[:\-]?\s*[A-E]\b\.?)', re.IGNORECASE)
+_INICIO_QUESTAO = re.compile(r'(\d+\.\s+\([A-Z]{3,}\s+-\s+.*?-\s+202\d\))')
+
+
+def formatar_questao_final(texto_bloco):
+    # 1-3. Numeração do início, <br> antes das alternativas e quebras de linha
+    # excessivas: regras_paginas.ESTRATEGIA_SEM_ANO_QUESTAO
+    texto_unido = ESTRATEGIA_SEM_ANO_QUESTAO(texto_bloco)
+
+    # 4. CAPTURA DO GABARITO E CORTE
+    # Procuramos "Gabarito" seguido de qualquer caractere até o ponto final
+    match_gabarito = _GABARITO_FINAL.search(texto_unido)
+    
+    if match_gabarito:
+        # Corta tudo que vier depois do ponto do Gabarito
+        texto_unido = texto_unido[:match_gabarito.end()]
+
+    # 5. Inserir o PIPE (|) no divisor "Comentários"
+    match_sep = _COMENTARIO.search(texto_unido)
+    
+    if match_sep:
+        idx = match_sep.start()
+        parte_pergunta = texto_unido[:idx].strip()
+        parte_resposta = texto_unido[idx:].strip()
+        return f"{parte_pergunta}|{parte_resposta}"
+    
+    return texto_unido
+
+
+def processar_texto(texto_bruto):
+    # 1. Normalização e Limpeza
+    # (cabeçalhos e rodapés já saíram na extração, pelo detector de boilerplate)
+    texto_limpo = normalizar_tracos(texto_bruto)
+
+    # 2. DIVISÃO PELO PADRÃO: 1. (FGV - ... - 202X)
+    # Explicação do Regex:
+    # \d+\.\s+ -> Número seguido de ponto e espaço
+    # \([A-Z]{3,}\s+-\s+ -> Abre parênteses, 3+ letras (banca), hífen
+    # .*? -> Qualquer conteúdo (órgão)
+    # -\s+202\d\) -> Hífen, ano 202x e fecha parênteses
+    # Usamos o split mantendo o delimitador para não perder o cabeçalho da questão
+    partes = _INICIO_QUESTAO.split(texto_limpo)
+    
+    questoes_finais = []
+    
+    # Como o split com grupo de captura retorna [vazio, delimitador, conteúdo, delimitador, conteúdo...]
+    # Vamos iterar de 2 em 2 para remontar Cabeçalho + Corpo
+    for i in range(1, len(partes), 2):
+        cabecalho = partes[i]
+        corpo = partes[i+1] if (i+1) < len(partes) else ""
+        bloco_completo = cabecalho + corpo
+        
+        if validar_bloco_questao(bloco_completo):
+            questao_formatada = formatar_questao_final(bloco_completo)
+            questoes_finais.append(questao_formatada)
+    
+    return "\n".join(questoes_finais)
+
+
+def pos_processar_texto(texto):
+    return ESTRATEGIA_SEM_ANO_POS(texto)
+
+
+def transformar(texto_bruto):
+    """Texto extraído -> um card por linha (``processar_texto`` e ``pos_processar_texto``)."""
+    return pos_processar_texto(processar_texto(texto_bruto))
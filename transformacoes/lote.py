@@ -0,0 +1,139 @@
+"""
+Transformações das páginas em lote, sem navegador: cada arquivo das
+entradas vira a saída do modo escolhido, gravada ao lado dele.
+
+Uso: python -m transformacoes.lote MODO ENTRADA [ENTRADA ...] [--workers N] [--forcar]
+
+ENTRADA é um arquivo ou uma pasta (com as subpastas). Os modos de texto
+leem ``.txt`` e os do Estratégia leem ``.pdf``; no modo ``estrategia``,
+``aula.pdf`` gera ``aula.estrategia.txt`` na mesma pasta. Saídas de
+qualquer modo nunca são tomadas como entrada.
+
+Os arquivos são processados num pool de processos, os maiores primeiro.
+Como na ``simulado.ingestao`` (as duas usam ``simulado.incremental``), uma
+saída só é refeita quando o hash da entrada ou a versão do modo
+(``VERSAO_LOTE`` e as versões dos conjuntos de regras que ele aplica)
+mudaram: ``.cache/transformacoes.json`` guarda o que gerou cada saída. As
+gravações são atômicas e uma saída igual à existente não é regravada. No
+fim sai um relatório com tempo e linhas (cards) por arquivo.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from functools import partial
+
+import regras_paginas as rp
+from extrator_questoes import VERSAO_EXTRATOR
+from simulado import cache_disco, incremental
+from transformacoes import alternativas_tec, edital, estrategia, estrategia_sem_ano, texto, transformador_tec
+
+# Incrementar quando uma mudança fora dos conjuntos de regras (divisão em
+# questões, cards por alternativa...) alterar as saídas: refaz todas.
+VERSAO_LOTE = "1"
+ARQUIVO_MANIFESTO = os.path.join(".cache", "transformacoes.json")
+
+# extensao: da entrada; transformar: texto -> saída; conjuntos: os de regras_paginas que ele aplica
+Modo = namedtuple("Modo", "extensao transformar conjuntos ajuda")
+
+MODOS = {
+    "texto": Modo(".txt", texto.tratar_texto, (rp.TRATAR_TEXTO,),
+                  "Tratar texto: quebras de linha e cabeçalhos de PDF"),
+    "questao": Modo(".txt", texto.tratar_questao, (rp.TRATAR_QUESTAO,), "Tratar questão"),
+    "tec": Modo(".txt", transformador_tec.transformar,
+                (rp.TRANSFORMADOR_INICIO, rp.TRANSFORMADOR_FIM), "caderno do TEC em cards"),
+    "cebraspe": Modo(".txt", partial(transformador_tec.transformar, cebraspe_option=True),
+                     (rp.TRANSFORMADOR_INICIO, rp.TRANSFORMADOR_FIM, rp.CEBRASPE_CARD),
+                     "caderno do TEC só com questões Cebraspe em cards"),
+    "alternativas": Modo(".txt", alternativas_tec.transformar, (rp.TEC_TODAS_ALTERNATIVAS,),
+                         "caderno do TEC em cards, um por alternativa"),
+    "edital": Modo(".txt", edital.organizar_texto, (rp.ORGANIZAR_EDITAL,), "conteúdo do edital em itens"),
+    "estrategia": Modo(".pdf", estrategia.transformar,
+                       (rp.ESTRATEGIA_TRACOS, rp.ESTRATEGIA_MARCAR, rp.ESTRATEGIA_QUESTAO, rp.ESTRATEGIA_POS),
+                       "PDF do Estratégia em cards"),
+    "estrategia-sem-ano": Modo(".pdf", estrategia_sem_ano.transformar,
+                               (rp.ESTRATEGIA_TRACOS, rp.ESTRATEGIA_SEM_ANO_QUESTAO, rp.ESTRATEGIA_SEM_ANO_POS),
+                               "PDF do Estratégia (questões sem ano) em cards"),
+}
+
+
+def _versao(nome_modo):
+    modo = MODOS[nome_modo]
+    versao = f"lote-v{VERSAO_LOTE}-" + "+".join(conjunto.chave for conjunto in modo.conjuntos)
+    return versao + (f"-extrator-v{VERSAO_EXTRATOR}" if modo.extensao == ".pdf" else "")
+
+
+def _transformar(nome_modo, entrada, destino):
+    """Roda num processo do pool: transforma, grava e devolve (linhas, gravou, segundos)."""
+    inicio = time.perf_counter()
+    modo = MODOS[nome_modo]
+    if modo.extensao == ".pdf":
+        # Um processo por arquivo: as páginas são lidas em série
+        conteudo = estrategia.extrair_texto(entrada, workers=1)
+    else:
+        with open(entrada, "r", encoding="utf-8-sig") as f:
+            conteudo = f.read()
+    saida = modo.transformar(conteudo)
+    if not saida.strip():
+        raise ValueError("saída vazia")
+    gravou = cache_disco.gravar_se_mudou(destino, saida.encode("utf-8"))
+    return len(saida.splitlines()), gravou, time.perf_counter() - inicio
+
+
+def _eh_saida(nome):
+    return any(nome.endswith(f".{m}.txt") for m in MODOS)
+
+
+def listar_arquivos(nome_modo, entradas):
+    """Pares (entrada, saída ao lado dela) dos arquivos do modo em ``entradas``."""
+    extensao = MODOS[nome_modo].extensao
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for pasta, subpastas, nomes in os.walk(entrada):
+                subpastas.sort()
+                arquivos.extend(os.path.join(pasta, nome) for nome in sorted(nomes))
+        else:
+            arquivos.append(entrada)
+    pares = []
+    for arquivo in dict.fromkeys(os.path.normpath(a) for a in arquivos):
+        nome = os.path.basename(arquivo)
+        if nome.lower().endswith(extensao) and not _eh_saida(nome):
+            pares.append((arquivo, f"{os.path.splitext(arquivo)[0]}.{nome_modo}.txt"))
+    return pares
+
+
+def transformar_lote(nome_modo, entradas, workers=None, forcar=False):
+    """
+    Aplica o modo aos arquivos de ``entradas`` que mudaram e devolve um
+    resultado por arquivo: dict com entrada, destino, estado ("gerado",
+    "inalterado", "em dia" ou "erro"), linhas, tempo e erro.
+    """
+    return incremental.processar(listar_arquivos(nome_modo, entradas), partial(_transformar, nome_modo),
+                                 _versao(nome_modo), ARQUIVO_MANIFESTO, "linhas", workers, forcar)
+
+
+def main(argv=None):
+    modos = "\n".join(f"  {nome:<19} {modo.extensao}: {modo.ajuda}" for nome, modo in MODOS.items())
+    parser = argparse.ArgumentParser(prog="python -m transformacoes.lote",
+                                     description=__doc__.split("\n\n")[0].strip(),
+                                     epilog=f"modos:\n{modos}", formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modo", choices=MODOS, help="transformação a aplicar")
+    parser.add_argument("entradas", nargs="+", metavar="ENTRADA", help="arquivo ou pasta (com as subpastas)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--forcar", action="store_true", help="refazer mesmo as saídas em dia")
+    args = parser.parse_args(argv)
+    for entrada in args.entradas:
+        if not os.path.exists(entrada):
+            parser.error(f"{entrada} não encontrado")
+
+    inicio = time.perf_counter()
+    resultados = transformar_lote(args.modo, args.entradas, args.workers, args.forcar)
+    incremental.relatorio(resultados, time.perf_counter() - inicio, "linhas", "linhas", "arquivos")
+    return 1 if any(r["estado"] == "erro" for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
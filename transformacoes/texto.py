@@ -0,0 +1,14 @@
+"""Botões "Tratar texto" e "Tratar questão" de pages/tratar_texto.py."""
+
+from regras_paginas import TRATAR_QUESTAO, TRATAR_TEXTO
+
+
+def tratar_texto(texto):
+    # Quebras de linha fora de fim de frase, tempos do tipo 25m, link e aviso
+    # da Gran e espaços repetidos: ver regras_paginas.TRATAR_TEXTO
+    return TRATAR_TEXTO(texto)
+
+
+def tratar_questao(texto):
+    # Letra da alternativa entre parênteses e linhas em branco: regras_paginas.TRATAR_QUESTAO
+    return TRATAR_QUESTAO(texto)
@@ -0,0 +1,72 @@
+"""Caderno do TEC colado em cards Frente|Verso (pages/transformador_anki.py)."""
+
+import re
+
+from regras_paginas import CEBRASPE_CARD, TRANSFORMADOR_FIM, TRANSFORMADOR_INICIO
+
+_GABARITO = re.compile(r'\|Gabarito\s*([A-E])')
+_FIM_ENUNCIADO = re.compile(r'\.<br>')
+_CARDS = re.compile(r'(?=\n)')
+# Linha da alternativa de cada letra do gabarito
+_ALTERNATIVA = {letra: re.compile(rf'{letra}\)\s*(.*)', re.IGNORECASE) for letra in "abcde"}
+
+
+def tratar_texto(texto, cebraspe_option=False):
+    # Limpezas iniciais e gabarito padronizado: regras_paginas.TRANSFORMADOR_INICIO
+    texto = TRANSFORMADOR_INICIO(texto)
+
+    if not cebraspe_option:
+        linhas = texto.splitlines()
+        novas_linhas = []
+
+        for i, linha in enumerate(linhas):
+            match_gab = _GABARITO.search(linha)
+            if match_gab:
+                letra = match_gab.group(1).lower()
+
+                alternativa = None
+                # procura a alternativa acima
+                for j in range(i - 1, -1, -1):
+                    m_alt = _ALTERNATIVA[letra].match(linhas[j])
+                    if m_alt:
+                        alternativa = m_alt.group(1).strip()
+                        break
+
+                if alternativa:
+                    novas_linhas.append(f"| {alternativa}")
+                else:
+                    novas_linhas.append(linha)
+            else:
+                novas_linhas.append(linha)
+
+        texto = "\n".join(novas_linhas)
+
+    # Quebras de linha em <br> e outras limpezas já existentes: regras_paginas.TRANSFORMADOR_FIM
+    return TRANSFORMADOR_FIM(texto)
+
+
+# ➕ CEBRASPE (INALTERADO)
+def tratar_cebraspe(texto):
+    cards = _CARDS.split(texto)
+
+    novos_cards = []
+    for card in cards:
+        c = card.strip()
+        if not c:
+            continue
+
+        match = _FIM_ENUNCIADO.search(c)
+        if match:
+            c = c[match.end():].lstrip()
+
+        novos_cards.append(CEBRASPE_CARD(c))
+
+    return "\n".join(novos_cards)
+
+
+def transformar(texto, cebraspe_option=False):
+    """O botão "Processar Texto": ``tratar_texto`` e, se Cebraspe, ``tratar_cebraspe``."""
+    texto_processado = tratar_texto(texto, cebraspe_option)
+    if cebraspe_option:
+        texto_processado = tratar_cebraspe(texto_processado)
+    return texto_processado